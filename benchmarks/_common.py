@@ -0,0 +1,48 @@
+"""Shared helpers for the standalone benchmark scripts.
+
+Benchmarks are not part of the pytest run; execute them directly, e.g.::
+
+    python -m benchmarks.bench_db_pool
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+from database.db_handler import DB_ENV_KEY, initialize_database, reset_connection_pool
+from utils.activity_log import flush_activity_log
+
+
+@contextmanager
+def temp_database():
+    """Point the app at a fresh, migrated database in a temporary directory."""
+    previous = os.environ.get(DB_ENV_KEY)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ[DB_ENV_KEY] = os.path.join(tmp, "bench.db")
+        try:
+            initialize_database()
+            yield os.environ[DB_ENV_KEY]
+        finally:
+            flush_activity_log()  # queued rows belong to the database about to be deleted
+            reset_connection_pool()
+            if previous is None:
+                os.environ.pop(DB_ENV_KEY, None)
+            else:
+                os.environ[DB_ENV_KEY] = previous
+
+
+def ops_per_second(fn: Callable[[], object], iterations: int) -> float:
+    """Run fn ``iterations`` times and return the achieved rate."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed > 0 else float("inf")
+
+
+def report(label: str, value: float, unit: str = "ops/s"):
+    print(f"{label:<48} {value:>12,.1f} {unit}")
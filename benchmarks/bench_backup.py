@@ -0,0 +1,67 @@
+"""Full copy vs incremental vs compact backup of a ~200 MB database.
+
+The seeded rows are repetitive, so compression ratios here are an upper bound;
+real stock and invoice data compresses less.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+
+from benchmarks._common import report, temp_database
+from database.db_handler import get_db_connection
+from utils.backup import _full_backup
+from utils.compact_backup import CODECS, create_compact_backup
+from utils.incremental_backup import create_incremental_backup
+
+PRODUCTS = 200_000
+CHANGED_ROWS = 50
+
+
+def _seed():
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO products (name, price, stock_quantity) VALUES (?, ?, ?)",
+        [(f"Product {i:07d} " + "x" * 400, 1.0, i) for i in range(PRODUCTS)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _touch_rows():
+    conn = get_db_connection()
+    conn.executemany(
+        "UPDATE products SET price = price + 1 WHERE product_id = ?",
+        [(i * (PRODUCTS // CHANGED_ROWS) + 1,) for i in range(CHANGED_ROWS)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def main():
+    with temp_database() as db_path, tempfile.TemporaryDirectory() as backups:
+        _seed()
+        report("database size", os.path.getsize(db_path) / 1e6, "MB")
+        start = time.perf_counter()
+        full = _full_backup(backups, db_path)
+        report("full backup", (time.perf_counter() - start) * 1000, "ms")
+        report("full backup written", os.path.getsize(full) / 1e6, "MB")
+        first = create_incremental_backup(db_path, backups)
+        report("incremental backup (first)", first.elapsed * 1000, "ms")
+        report("incremental backup (first) written", first.bytes_written / 1e6, "MB")
+        _touch_rows()
+        second = create_incremental_backup(db_path, backups)
+        report(f"incremental backup ({CHANGED_ROWS} rows changed)", second.elapsed * 1000, "ms")
+        report(f"incremental backup ({CHANGED_ROWS} rows changed) written", second.bytes_written / 1e6, "MB")
+        for codec in sorted(CODECS):
+            compact = create_compact_backup(db_path, os.path.join(backups, f"compact_{codec}.db"), codec=codec)
+            report(f"compact backup ({codec})", compact.elapsed * 1000, "ms")
+            report(f"compact backup ({codec}) written", compact.compressed_size / 1e6, "MB")
+            report(f"compact backup ({codec}) ratio", compact.ratio, "x")
+            report(f"compact backup ({codec}) throughput", compact.throughput / 1e6, "MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+""" "Last backup" lookup in a folder of 5,000 backups: directory scan vs catalog."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+
+from benchmarks._common import ops_per_second, report
+from utils import backup_catalog
+from utils.backup_catalog import latest_backup, rebuild_catalog
+
+BACKUPS = 5_000
+
+
+def _scan_latest(folder: str) -> str:
+    # What list_backups did before the catalog: listdir, filter, one stat per file
+    names = [n for n in os.listdir(folder) if n.startswith("backup_") and n.endswith(".db")]
+    paths = sorted((os.path.join(folder, n) for n in names), key=os.path.getmtime)
+    return paths[-1]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        for i in range(BACKUPS):
+            with open(os.path.join(folder, f"backup_20250101_{i:06d}_000000.db"), "wb") as fh:
+                fh.write(b"x" * 64)
+        rebuild_catalog(folder)
+        report("directory scan + stat", ops_per_second(lambda: _scan_latest(folder), 50), "lookups/s")
+
+        def first_read():
+            backup_catalog._cache.clear()  # as in a freshly started app
+            latest_backup(folder)
+
+        report("catalog (first read in a process)", ops_per_second(first_read, 50), "lookups/s")
+        report("catalog (cached)", ops_per_second(lambda: latest_backup(folder), 5_000), "lookups/s")
+
+
+if __name__ == "__main__":
+    main()
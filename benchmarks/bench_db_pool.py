@@ -0,0 +1,51 @@
+"""Single-row lookup throughput with and without connection pooling."""
+
+from __future__ import annotations
+
+from benchmarks._common import ops_per_second, report, temp_database
+from database.db_handler import get_connection_pool, get_db_connection
+
+ITERATIONS = 5_000
+PRODUCTS = 1_000
+
+
+def _seed():
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO products (name, price, stock_quantity) VALUES (?, ?, ?)",
+        [(f"Product {i}", 1.0 + i, 100) for i in range(PRODUCTS)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def main():
+    with temp_database():
+        _seed()
+        pool = get_connection_pool()
+        counter = iter(range(10**9))
+
+        def lookup():
+            # Same shape as the model getters; Product itself is served from the catalog cache now
+            conn = get_db_connection()
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT product_id, name, price, stock_quantity FROM products WHERE product_id = ?",
+                (next(counter) % PRODUCTS + 1,),
+            )
+            cur.fetchone()
+            conn.close()
+
+        results = {}
+        for enabled in (False, True):
+            pool.enabled = enabled
+            pool.reset()
+            results[enabled] = ops_per_second(lookup, ITERATIONS)
+        pool.enabled = True
+        report("lookup (new connection per call)", results[False])
+        report("lookup (pooled)", results[True])
+        report("speed-up", results[True] / results[False], "x")
+
+
+if __name__ == "__main__":
+    main()
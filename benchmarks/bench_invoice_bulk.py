@@ -0,0 +1,66 @@
+"""Throughput of Invoice.create_invoices_bulk vs. repeated Invoice.create_invoice."""
+
+from __future__ import annotations
+
+import random
+import time
+
+from benchmarks._common import report, temp_database
+from database.db_handler import get_db_connection
+from models.invoice import Invoice
+
+INVOICES = 10_000
+LOOP_SAMPLE = 1_000  # create_invoice is timed on a sample to keep the run short
+PRODUCTS = 500
+LINES_PER_INVOICE = 5
+
+
+def _seed() -> int:
+    conn = get_db_connection()
+    conn.execute("INSERT INTO customers (name, phone_number, address) VALUES ('Field', '0550000000', 'Accra')")
+    conn.executemany(
+        "INSERT INTO products (name, price, stock_quantity) VALUES (?, ?, ?)",
+        [(f"Product {i}", 1.0 + i % 50, 10_000_000) for i in range(PRODUCTS)],
+    )
+    conn.commit()
+    customer_id = conn.execute("SELECT customer_id FROM customers").fetchone()[0]
+    conn.close()
+    return customer_id
+
+
+def _batch(customer_id: int, n: int) -> list[dict]:
+    rng = random.Random(42)
+    return [
+        {
+            "customer_id": customer_id,
+            "items": [
+                {"product_id": rng.randint(1, PRODUCTS), "quantity": rng.randint(1, 5), "unit_price": 2.0}
+                for _ in range(LINES_PER_INVOICE)
+            ],
+        }
+        for _ in range(n)
+    ]
+
+
+def main():
+    with temp_database():
+        customer_id = _seed()
+        batch = _batch(customer_id, INVOICES)
+
+        start = time.perf_counter()
+        for inv in batch[:LOOP_SAMPLE]:
+            Invoice.create_invoice(inv["customer_id"], inv["items"])
+        loop_rate = LOOP_SAMPLE / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = Invoice.create_invoices_bulk(batch)
+        bulk_rate = INVOICES / (time.perf_counter() - start)
+        assert result.failed_count == 0, result.errors
+
+        report(f"create_invoice loop ({LOOP_SAMPLE} invoices)", loop_rate, "inv/s")
+        report(f"create_invoices_bulk ({INVOICES} invoices)", bulk_rate, "inv/s")
+        report("speed-up", bulk_rate / loop_rate, "x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Regression benchmark: deleting an invoice with 500 lines."""
+
+from __future__ import annotations
+
+import time
+
+from benchmarks._common import report, temp_database
+from database.db_handler import get_db_connection
+from models.invoice import Invoice
+
+LINES = 500
+PRODUCTS = 250
+ROUNDS = 20
+
+
+def _seed() -> tuple[int, list[dict]]:
+    conn = get_db_connection()
+    conn.execute("INSERT INTO customers (name, phone_number, address) VALUES ('Big', '0550000000', 'Accra')")
+    conn.executemany(
+        "INSERT INTO products (name, price, stock_quantity) VALUES (?, ?, ?)",
+        [(f"Product {i}", 1.0, 1_000_000) for i in range(PRODUCTS)],
+    )
+    conn.commit()
+    customer_id = conn.execute("SELECT customer_id FROM customers").fetchone()[0]
+    conn.close()
+    items = [{"product_id": i % PRODUCTS + 1, "quantity": 1, "unit_price": 1.0} for i in range(LINES)]
+    return customer_id, items
+
+
+def main():
+    with temp_database():
+        customer_id, items = _seed()
+        elapsed = 0.0
+        for _ in range(ROUNDS):
+            invoice_id = Invoice.create_invoice(customer_id, items)
+            start = time.perf_counter()
+            Invoice.delete_invoice(invoice_id)
+            elapsed += time.perf_counter() - start
+        report(f"delete_invoice ({LINES} lines, mean of {ROUNDS})", elapsed / ROUNDS * 1000, "ms")
+
+
+if __name__ == "__main__":
+    main()
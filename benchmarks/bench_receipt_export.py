@@ -0,0 +1,59 @@
+"""Batch receipt export throughput (receipts/s) as the worker process count varies."""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+
+from benchmarks._common import report, temp_database
+from database.db_handler import get_db_connection
+from models.invoice import Invoice
+from utils.receipt_batch import export_receipts, invoice_ids_for_period
+
+INVOICES = 400
+PRODUCTS = 100
+LINES_PER_INVOICE = 8
+
+
+def _seed():
+    conn = get_db_connection()
+    conn.execute("INSERT INTO customers (name, phone_number, address) VALUES ('Field', '0550000000', 'Accra')")
+    conn.executemany(
+        "INSERT INTO products (name, price, stock_quantity) VALUES (?, ?, ?)",
+        [(f"Product {i}", 1.0 + i % 50, 10_000_000) for i in range(PRODUCTS)],
+    )
+    conn.commit()
+    customer_id = conn.execute("SELECT customer_id FROM customers").fetchone()[0]
+    conn.close()
+    rng = random.Random(42)
+    batch = [
+        {
+            "customer_id": customer_id,
+            "items": [
+                {"product_id": rng.randint(1, PRODUCTS), "quantity": rng.randint(1, 5), "unit_price": 2.0}
+                for _ in range(LINES_PER_INVOICE)
+            ],
+        }
+        for _ in range(INVOICES)
+    ]
+    Invoice.create_invoices_bulk(batch)
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cpus})
+    with temp_database():
+        _seed()
+        ids = invoice_ids_for_period()
+        for workers in counts:
+            with tempfile.TemporaryDirectory() as out:
+                result = export_receipts(ids, out, workers=workers)
+            report(f"export_receipts ({len(ids)} receipts, {workers} worker(s))", result.receipts_per_second, "rcpt/s")
+        with tempfile.TemporaryDirectory() as out:
+            result = export_receipts(ids, merged_path=os.path.join(out, "all.pdf"), workers=1)
+        report(f"merged PDF ({len(ids)} receipts)", len(ids) / result.elapsed, "rcpt/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Per-receipt render time: PDF with a shared ReceiptTemplate vs. rebuilding styles, and the thermal backend."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from io import BytesIO
+
+from benchmarks._common import report
+from models.receipt_template import ReceiptTemplate, get_receipt_template
+from models.thermal_receipt import render_escpos, render_text
+
+ROUNDS = 300
+RECEIPT = {
+    "invoice_number": 1042,
+    "invoice_date": "15/01/2025 10:00:00",
+    "customer_name": "Alice Mensah",
+    "customer_number": "0551112222",
+    "wholesale_contact": "0550000000",
+    "wholesale_address": "Accra",
+    "items": [[f"Product {i}", "2", "10.00", "20.00"] for i in range(8)],
+    "total_items": 16,
+    "discount": "0.00",
+    "tax": "0.00",
+    "total": "160.00",
+}
+TEXTS = ("Tradia Wholesale", "Thank you for your business!", "Goods sold are not returnable.")
+
+
+def _ms_per_render(render) -> float:
+    for _ in range(10):
+        render()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        render()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    shared = get_receipt_template(*TEXTS)
+    report("ReceiptTemplate construction (saved per receipt)", _ms_per_render(lambda: ReceiptTemplate(*TEXTS)), "ms")
+    report(
+        "fresh template per receipt (previous behaviour)",
+        _ms_per_render(lambda: ReceiptTemplate(*TEXTS).render(RECEIPT, BytesIO())),
+        "ms",
+    )
+    report("shared template, BytesIO", _ms_per_render(lambda: shared.render(RECEIPT, BytesIO())), "ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "receipt.pdf")
+        report("shared template, file", _ms_per_render(lambda: shared.render(RECEIPT, path)), "ms")
+    thermal = dict(RECEIPT, wholesale_name=TEXTS[0], thank_you=TEXTS[1], notes=TEXTS[2])
+    report("thermal text (80 mm)", _ms_per_render(lambda: render_text(thermal, 80)), "ms")
+    report("thermal ESC/POS (80 mm)", _ms_per_render(lambda: render_escpos(thermal, 80)), "ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time to restore a large database from a full backup, step by step.
+
+Defaults to a 2 GB database; pass a size in MB to try others::
+
+    python -m benchmarks.bench_restore 500
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+
+from benchmarks._common import report, temp_database
+from database.db_handler import get_db_connection
+from utils.backup import _full_backup
+from utils.restore import restore_database
+
+ROW_BYTES = 1_000
+ROW_ON_DISK = 1_400  # row plus its index entries and page overhead
+BATCH = 10_000
+
+
+def _seed(target_mb: int):
+    # Bulk goes into the activity log (typically the largest table); product
+    # names would also be indexed by FTS and blow well past the target size
+    conn = get_db_connection()
+    rows = target_mb * 1_000_000 // ROW_ON_DISK
+    for start in range(0, rows, BATCH):
+        conn.executemany(
+            "INSERT INTO activity_log (timestamp, username, action_type, details) VALUES (?, ?, ?, ?)",
+            [
+                (f"2025-01-01 00:00:{i % 60:02d}", "admin", "bench", os.urandom(ROW_BYTES // 2).hex())
+                for i in range(start, start + BATCH)
+            ],
+        )
+        conn.commit()
+    conn.close()
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    target_mb = int(args[0]) if args else 2048
+    with temp_database() as db_path, tempfile.TemporaryDirectory() as backups:
+        _seed(target_mb)
+        backup = _full_backup(backups, db_path)
+        report("database size", os.path.getsize(db_path) / 1e6, "MB")
+        result = restore_database(backup, keep_previous=True)
+        report("stage (copy backup to temp file)", result.stage_seconds, "s")
+        report("quick_check", result.check_seconds, "s")
+        report("migrations", result.migrate_seconds, "s")
+        report("pre-restore copy", result.previous_seconds, "s")
+        report("swap into live database", result.swap_seconds, "s")
+        report("time to restore", result.elapsed, "s")
+        report("throughput", result.size / result.elapsed / 1e6, "MB/s")
+
+
+if __name__ == "__main__":
+    main()
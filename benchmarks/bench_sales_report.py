@@ -0,0 +1,66 @@
+"""Sales report and graph queries: raw invoices scan vs the sales_daily rollup."""
+
+from __future__ import annotations
+
+import datetime
+import random
+import time
+
+from benchmarks._common import ops_per_second, report, temp_database
+from database.db_handler import get_db_connection
+from database.sales_rollup import sales_by_period, sales_totals
+
+INVOICES = 300_000
+DAYS = 3 * 365
+
+
+def _seed():
+    conn = get_db_connection()
+    conn.execute("INSERT INTO customers (name, phone_number, address) VALUES ('Bench', '0200000000', '')")
+    start = datetime.datetime(2023, 1, 1)
+    rng = random.Random(7)
+    rows = []
+    for _ in range(INVOICES):
+        when = start + datetime.timedelta(seconds=rng.randrange(DAYS * 86400))
+        total = round(rng.uniform(5, 500), 2)
+        rows.append((1, when.strftime("%Y-%m-%d %H:%M:%S"), 0.0, 0.0, total))
+    began = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO invoices (customer_id, invoice_date, discount, tax, total_amount) VALUES (?, ?, ?, ?, ?)", rows
+    )
+    conn.commit()
+    report("insert invoices (rollup triggers on)", INVOICES / (time.perf_counter() - began), "rows/s")
+    conn.close()
+
+
+def main():
+    with temp_database():
+        _seed()
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        def raw_monthly():
+            cur.execute(
+                "SELECT strftime('%Y-%m', invoice_date) AS period, SUM(total_amount) FROM invoices "
+                "GROUP BY period ORDER BY period"
+            ).fetchall()
+
+        def raw_month_total():
+            cur.execute(
+                "SELECT COALESCE(SUM(total_amount), 0.0), COUNT(*) FROM invoices "
+                "WHERE invoice_date >= '2025-06-01 00:00:00' AND invoice_date < '2025-07-01 00:00:00'"
+            ).fetchone()
+
+        report("monthly graph, raw invoices", ops_per_second(raw_monthly, 5), "queries/s")
+        report("monthly graph, sales_daily", ops_per_second(lambda: sales_by_period(cur, "month"), 200), "queries/s")
+        report("monthly report, raw invoices", ops_per_second(raw_month_total, 50), "queries/s")
+        report(
+            "monthly report, sales_daily",
+            ops_per_second(lambda: sales_totals(cur, "2025-06-01", "2025-07-01"), 2000),
+            "queries/s",
+        )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
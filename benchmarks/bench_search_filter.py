@@ -0,0 +1,60 @@
+"""Per-keystroke search latency over 50k rows (products and customers tables).
+
+Replays a typing session (typing forward, backspacing, starting a new term)
+against the filter proxy the views use and reports the slowest keystroke.
+The budget is 50 ms per keystroke.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QTableView  # noqa: E402
+
+from benchmarks._common import report  # noqa: E402
+from ui.customer_table_model import CustomerTableModel  # noqa: E402
+from ui.product_table_model import ProductTableModel  # noqa: E402
+from ui.search_proxy import SearchFilterProxyModel  # noqa: E402
+
+ROWS = 50_000
+BUDGET_MS = 50.0
+KEYSTROKES = ["s", "so", "soa", "soap", "soap ", "soap 1", "soap 12", "soap 1", "soap ", "", "4", "42", "420", ""]
+
+
+def _measure(model) -> list[float]:
+    proxy = SearchFilterProxyModel()
+    proxy.setSourceModel(model)
+    view = QTableView()
+    view.setModel(proxy)
+    view.resize(800, 600)
+    timings = []
+    for text in KEYSTROKES:
+        start = time.perf_counter()
+        proxy.set_search_text(text)
+        proxy.rowCount()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    products = ProductTableModel()
+    products.set_products([(i, f"Soap {i}" if i % 3 else f"Brush {i}", 1.25 * i, i % 97) for i in range(1, ROWS + 1)])
+    customers = CustomerTableModel()
+    customers.set_customers(
+        [(i, f"Customer Soap {i}", f"02{i:08d}", f"Street {i % 400}, Accra") for i in range(1, ROWS + 1)]
+    )
+    worst = 0.0
+    for label, model in (("products", products), ("customers", customers)):
+        timings = _measure(model)
+        worst = max(worst, max(timings))
+        report(f"{label}: mean per keystroke ({ROWS:,} rows)", sum(timings) / len(timings), "ms")
+        report(f"{label}: slowest keystroke", max(timings), "ms")
+    print(f"{'budget':<48} {BUDGET_MS:>12,.1f} ms -> {'OK' if worst < BUDGET_MS else 'OVER BUDGET'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Change detection for in-process caches of database rows.
+
+``PRAGMA data_version`` changes whenever a connection *other than the one
+asking* commits to the database file, so it is read on a dedicated
+connection that never writes: commits from pooled connections in this
+process and from other processes are all seen. The token returned by
+``DataVersionWatch.token()`` also carries the resolved database path and the
+connection-pool generation, so switching databases or resetting the pool
+(e.g. after a restore) changes it as well.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+
+from database.db_handler import get_connection_pool, resolve_db_path
+
+logger = logging.getLogger(__name__)
+
+
+class DataVersionWatch:
+    def __init__(self):
+        self._conn: sqlite3.Connection | None = None
+        self._path: str | None = None
+        self._pool_generation: int | None = None
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def token(self) -> tuple | None:
+        """Comparable snapshot of the database state, or None if changes cannot be watched.
+
+        Not thread-safe; callers hold their own lock.
+        """
+        path = resolve_db_path()
+        if path == ":memory:" or path.startswith("file:"):
+            # Private database per connection; nothing to watch
+            self.close()
+            return None
+        path = os.path.abspath(path)
+        generation = get_connection_pool().generation
+        if path != self._path or generation != self._pool_generation:
+            self.close()
+            self._path = path
+            self._pool_generation = generation
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.debug("data_version check failed: %s", e)
+            self.close()
+            return None
+        return path, generation, data_version
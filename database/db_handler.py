@@ -1,13 +1,23 @@
 import logging
 import os
 import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
 
 from . import migrations
+from .pragmas import CheckpointPolicy, PragmaProfile, apply_persistent, apply_session, checkpoint, wal_size
 
 DB_ENV_KEY = "WMS_DB_NAME"
 DEFAULT_DB_FILENAME = "wholesale.db"
 
+# Connection reuse. Set TRADIA_DB_POOL=0 to fall back to one connection per call.
+POOL_ENV_KEY = "TRADIA_DB_POOL"
+POOL_MAX_IDLE = 4  # idle connections kept per thread
+POOL_HEALTH_CHECK_SECONDS = 30.0  # idle time after which a connection is pinged before reuse
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,18 +41,250 @@ def _default_db_path() -> str:
     return str(base_path / DEFAULT_DB_FILENAME)
 
 
+def resolve_db_path(db_name=None) -> str:
+    """Return the database path a connection would be opened against."""
+    if db_name:
+        return db_name
+    # Environment override takes precedence
+    env_db = os.environ.get(DB_ENV_KEY)
+    return env_db if env_db else _default_db_path()
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to the pool.
+
+    Callers keep the usual ``conn = get_db_connection(); ...; conn.close()``
+    pattern; the handle (and its prepared statement cache) is reused by the
+    next checkout on the same thread instead of being torn down.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._pool: ConnectionPool | None = None
+        self._pool_key: str | None = None
+        self._checked_out = False
+        self._last_used = time.monotonic()
+        self._cursors: weakref.WeakSet = weakref.WeakSet()
+
+    def cursor(self, *args, **kwargs):
+        # Track cursors so a release can finalize statements left half-read.
+        cur = super().cursor(*args, **kwargs)
+        self._cursors.add(cur)
+        return cur
+
+    def close(self):
+        pool = self._pool
+        if pool is not None and pool.release(self):
+            return
+        self._pool = None
+        super().close()
+
+    def discard(self):
+        """Close the underlying handle for real, bypassing the pool."""
+        self._pool = None
+        self._checked_out = False
+        super().close()
+
+
+class ConnectionPool:
+    """Per-thread pool of SQLite connections keyed by database path.
+
+    - Connections are only reused on the thread that created them (sqlite3's
+      same-thread check stays on).
+    - Nested checkouts get distinct connections, matching the old behaviour of
+      opening a fresh connection per call.
+    - On release, open transactions are rolled back and live cursors closed, so
+      a reused connection looks exactly like a freshly opened one.
+    - When a thread asks for a different path (e.g. WMS_DB_NAME changed between
+      tests) its idle connections for the previous path are closed.
+    """
+
+    def __init__(self, max_idle: int = POOL_MAX_IDLE, health_check_seconds: float = POOL_HEALTH_CHECK_SECONDS):
+        self.max_idle = max_idle
+        self.health_check_seconds = health_check_seconds
+        self.enabled = os.environ.get(POOL_ENV_KEY, "1") != "0"
+        self.profile = PragmaProfile()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._configured: set[str] = set()  # paths whose persistent PRAGMAs were applied
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    def _bump(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _thread_state(self) -> tuple[str | None, list[PooledConnection]]:
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            self._close_idle(getattr(local, "idle", []))
+            local.generation = self._generation
+            local.key = None
+            local.idle = []
+        return local.key, local.idle
+
+    def _close_idle(self, idle: list[PooledConnection]):
+        for conn in idle:
+            try:
+                conn.discard()
+            except Exception:
+                pass
+        if idle:
+            self._bump("discarded", len(idle))
+        idle.clear()
+
+    def _open(self, db_name: str, key: str | None) -> PooledConnection:
+        conn = sqlite3.connect(db_name, timeout=10, factory=PooledConnection)
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._configure(conn, db_name)
+        except Exception:
+            conn.close()
+            raise
+        self._bump("created")
+        if key is not None:
+            conn._pool = self
+            conn._pool_key = key
+            conn._checked_out = True
+        return conn
+
+    def _configure(self, conn: sqlite3.Connection, db_name: str):
+        profile = self.profile.for_path(db_name)
+        path = os.path.abspath(db_name)
+        if path not in self._configured:
+            mode = apply_persistent(conn, profile)
+            logger.debug("Database %s journal_mode=%s", db_name, mode)
+            with self._lock:
+                self._configured.add(path)
+        apply_session(conn, profile)
+
+    @staticmethod
+    def _healthy(conn: PooledConnection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self, db_name: str) -> PooledConnection:
+        if not self.enabled or db_name == ":memory:" or db_name.startswith("file:"):
+            return self._open(db_name, None)
+        key = os.path.abspath(db_name)
+        current, idle = self._thread_state()
+        if current != key:
+            # Database path changed for this thread: drop connections to the old file.
+            self._close_idle(idle)
+            self._local.key = key
+        while idle:
+            conn = idle.pop()
+            if time.monotonic() - conn._last_used > self.health_check_seconds and not self._healthy(conn):
+                conn.discard()
+                self._bump("discarded")
+                continue
+            conn._checked_out = True
+            self._bump("reused")
+            return conn
+        return self._open(db_name, key)
+
+    def release(self, conn: PooledConnection) -> bool:
+        """Return a connection to the idle list. False means the caller should really close it."""
+        if not conn._checked_out:
+            # Double close: already idle (or discarded); nothing to do.
+            return conn._pool is not None
+        conn._checked_out = False
+        try:
+            for cur in list(conn._cursors):
+                cur.close()
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._bump("discarded")
+            return False
+        key, idle = self._thread_state()
+        if conn._pool_key != key or len(idle) >= self.max_idle:
+            self._bump("discarded")
+            return False
+        conn._last_used = time.monotonic()
+        idle.append(conn)
+        return True
+
+    def reset(self):
+        """Drop idle connections on every thread (lazily for threads other than the caller)."""
+        with self._lock:
+            self._generation += 1
+            self._configured.clear()
+        self._thread_state()
+
+    @property
+    def generation(self) -> int:
+        """Incremented by reset(); caches tied to the database file can compare it to drop stale state."""
+        return self._generation
+
+    def idle_count(self) -> int:
+        return len(self._thread_state()[1])
+
+
+_POOL = ConnectionPool()
+_CHECKPOINT_POLICY = CheckpointPolicy()
+
+
+def get_connection_pool() -> ConnectionPool:
+    return _POOL
+
+
+def reset_connection_pool():
+    """Close pooled connections, e.g. before replacing the database file."""
+    _POOL.reset()
+
+
+def set_pragma_profile(profile: PragmaProfile):
+    """Replace the PRAGMA profile; existing pooled connections are dropped so it takes effect."""
+    _POOL.profile = profile
+    _POOL.reset()
+
+
+def set_checkpoint_policy(policy: CheckpointPolicy):
+    global _CHECKPOINT_POLICY
+    _CHECKPOINT_POLICY = policy
+
+
+def run_checkpoint_policy(db_name=None) -> bool:
+    """Checkpoint the WAL if the active policy says it has grown too large.
+
+    Intended for quiet points (after a backup, on application exit). Returns
+    True if a checkpoint was run.
+    """
+    path = resolve_db_path(db_name)
+    policy = _CHECKPOINT_POLICY
+    if not policy.should_checkpoint(wal_size(path)):
+        return False
+    conn = get_db_connection(db_name)
+    try:
+        busy, log_frames, done = checkpoint(conn, policy.mode)
+        logger.info("WAL checkpoint (%s): busy=%s frames=%s checkpointed=%s", policy.mode, busy, log_frames, done)
+        return True
+    except sqlite3.Error as e:
+        logger.warning("WAL checkpoint failed: %s", e)
+        return False
+    finally:
+        conn.close()
+
+
 def get_db_connection(db_name=None):
-    if not db_name:
-        # Environment override takes precedence
-        env_db = os.environ.get(DB_ENV_KEY)
-        db_name = env_db if env_db else _default_db_path()
-    conn = sqlite3.connect(db_name, timeout=10)
+    return _POOL.acquire(resolve_db_path(db_name))
+
+
+@contextmanager
+def pooled_connection(db_name=None):
+    """Check out a connection for the duration of a ``with`` block.
+
+    The connection is returned to the pool on exit; uncommitted work is rolled back.
+    """
+    conn = get_db_connection(db_name)
     try:
-        conn.execute("PRAGMA foreign_keys = ON")
-    except Exception:
+        yield conn
+    finally:
         conn.close()
-        raise
-    return conn
 
 
 def initialize_database():
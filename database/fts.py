@@ -0,0 +1,31 @@
+"""Helpers for the FTS5 search indexes created by migration 2.
+
+User input is never passed to MATCH verbatim: it is split into word tokens and
+each token becomes a quoted prefix term, so "soa 12" searches for documents
+containing a word starting with "soa" AND a word starting with "12".
+"""
+
+from __future__ import annotations
+
+import re
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def prefix_match_query(text: str) -> str | None:
+    """Build a safe FTS5 MATCH expression from free text, or None if it has no tokens."""
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{tok}"*' for tok in tokens)
+
+
+def like_pattern(text: str) -> str:
+    """Substring LIKE pattern used when FTS5 is unavailable."""
+    escaped = (text or "").strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def fts_table_exists(cursor, table: str) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,))
+    return cursor.fetchone() is not None
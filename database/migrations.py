@@ -14,17 +14,23 @@ Tables created:
 
 License / activation tables and columns were removed for the FREE edition.
 
-If future changes are needed, add new forward-only migrations starting at
-_migration_2 and bump CURRENT_SCHEMA_VERSION accordingly.
+Forward-only migrations since the baseline:
+  2. FTS5 indexes (products_fts, customers_fts) kept in sync by triggers
+  3. sales_daily rollup kept in sync with invoices by triggers
+  4. table_changes counters bumped by triggers on every products write
+
+If future changes are needed, add the next _migration_N, register it in
+MIGRATIONS and bump CURRENT_SCHEMA_VERSION accordingly.
 """
 
 from __future__ import annotations
 
 import logging
+import sqlite3
 
 logger = logging.getLogger(__name__)
 
-CURRENT_SCHEMA_VERSION = 1
+CURRENT_SCHEMA_VERSION = 4
 
 
 def _migration_1(cursor):
@@ -152,7 +158,180 @@ def _migration_1(cursor):
         pass
 
 
-MIGRATIONS = {1: _migration_1}
+def _migration_2(cursor):
+    logger.info("Applying migration 2: full-text search indexes for products and customers")
+    # External-content FTS5 tables: the index stores tokens only, rows stay in the base tables.
+    # Prefix indexes keep "so*"-style lookups fast while the user types.
+    try:
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                name,
+                content='products', content_rowid='product_id',
+                tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+                name, phone_number, address,
+                content='customers', content_rowid='customer_id',
+                tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+            )
+            """
+        )
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5: searches fall back to LIKE queries
+        logger.warning("FTS5 unavailable, skipping search indexes: %s", e)
+        return
+    # Only changes to indexed columns touch the index (stock updates do not)
+    triggers = (
+        """
+        CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+            INSERT INTO products_fts(rowid, name) VALUES (new.product_id, new.name);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.product_id, old.name);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.product_id, old.name);
+            INSERT INTO products_fts(rowid, name) VALUES (new.product_id, new.name);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS customers_fts_ai AFTER INSERT ON customers BEGIN
+            INSERT INTO customers_fts(rowid, name, phone_number, address)
+            VALUES (new.customer_id, new.name, new.phone_number, new.address);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS customers_fts_ad AFTER DELETE ON customers BEGIN
+            INSERT INTO customers_fts(customers_fts, rowid, name, phone_number, address)
+            VALUES ('delete', old.customer_id, old.name, old.phone_number, old.address);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS customers_fts_au AFTER UPDATE OF name, phone_number, address ON customers BEGIN
+            INSERT INTO customers_fts(customers_fts, rowid, name, phone_number, address)
+            VALUES ('delete', old.customer_id, old.name, old.phone_number, old.address);
+            INSERT INTO customers_fts(rowid, name, phone_number, address)
+            VALUES (new.customer_id, new.name, new.phone_number, new.address);
+        END
+        """,
+    )
+    for trigger in triggers:
+        cursor.execute(trigger)
+    # Index rows that existed before the migration
+    cursor.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+    cursor.execute("INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')")
+
+
+def _migration_3(cursor):
+    logger.info("Applying migration 3: sales_daily rollup")
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sales_daily (
+            day TEXT PRIMARY KEY,
+            invoice_count INTEGER NOT NULL DEFAULT 0,
+            gross REAL NOT NULL DEFAULT 0,
+            discount REAL NOT NULL DEFAULT 0,
+            tax REAL NOT NULL DEFAULT 0,
+            total REAL NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    # Written out here rather than imported from database.sales_rollup, so later
+    # changes to the runtime module cannot alter what this migration does.
+    # Day of an invoice row; substr keeps non-ISO legacy dates from becoming NULL keys
+    def day_of(col: str) -> str:
+        return f"COALESCE(date({col}), substr({col}, 1, 10))"
+
+    # Add (+1) or remove (-1) one invoice row from its day's bucket
+    def add(row: str, sign: int) -> str:
+        day = day_of(f"{row}.invoice_date")
+        discount, tax = f"COALESCE({row}.discount, 0)", f"COALESCE({row}.tax, 0)"
+        return f"""
+            INSERT INTO sales_daily (day, invoice_count, gross, discount, tax, total)
+            VALUES ({day}, {sign}, {sign} * ({row}.total_amount - {tax} + {discount}),
+                    {sign} * {discount}, {sign} * {tax}, {sign} * {row}.total_amount)
+            ON CONFLICT(day) DO UPDATE SET
+                invoice_count = invoice_count + excluded.invoice_count,
+                gross = gross + excluded.gross,
+                discount = discount + excluded.discount,
+                tax = tax + excluded.tax,
+                total = total + excluded.total;
+        """
+
+    def prune(row: str) -> str:
+        return f"DELETE FROM sales_daily WHERE day = {day_of(f'{row}.invoice_date')} AND invoice_count = 0;"
+
+    triggers = (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS sales_daily_ai AFTER INSERT ON invoices BEGIN
+            {add("new", 1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS sales_daily_ad AFTER DELETE ON invoices BEGIN
+            {add("old", -1)} {prune("old")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS sales_daily_au AFTER UPDATE OF invoice_date, discount, tax, total_amount
+        ON invoices BEGIN
+            {add("old", -1)} {prune("old")} {add("new", 1)}
+        END
+        """,
+    )
+    for trigger in triggers:
+        cursor.execute(trigger)
+    # Back-fill from invoices that existed before the migration
+    cursor.execute("DELETE FROM sales_daily")
+    cursor.execute(
+        f"""
+        INSERT INTO sales_daily (day, invoice_count, gross, discount, tax, total)
+        SELECT {day_of("invoice_date")} AS day,
+               COUNT(*),
+               COALESCE(SUM(total_amount - COALESCE(tax, 0) + COALESCE(discount, 0)), 0),
+               COALESCE(SUM(COALESCE(discount, 0)), 0),
+               COALESCE(SUM(COALESCE(tax, 0)), 0),
+               COALESCE(SUM(total_amount), 0)
+        FROM invoices
+        GROUP BY day
+        """
+    )
+
+
+def _migration_4(cursor):
+    logger.info("Applying migration 4: products change counter")
+    # data_version moves on every commit to any table; caches of one table
+    # (models.product.ProductCatalog) compare this counter before reloading
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS table_changes (
+            name TEXT PRIMARY KEY,
+            changes INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    cursor.execute("INSERT OR IGNORE INTO table_changes (name, changes) VALUES ('products', 0)")
+    bump = "UPDATE table_changes SET changes = changes + 1 WHERE name = 'products';"
+    for name, event in (("ai", "INSERT"), ("ad", "DELETE"), ("au", "UPDATE")):
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS products_changes_{name} AFTER {event} ON products BEGIN
+                {bump}
+            END
+            """
+        )
+
+
+MIGRATIONS = {1: _migration_1, 2: _migration_2, 3: _migration_3, 4: _migration_4}
 
 # --- schema_version helpers --- #
 
@@ -185,10 +364,11 @@ def run_migrations(cursor):
             f"Database schema version {current} is newer than supported {target}. Upgrade application."
         )
     if current < target:
-        # Apply only migration_1 (squashed) if fresh or outdated
-        _migration_1(cursor)
-        _set_schema_version(cursor, 1)
-        logger.info("Schema initialized (squashed) at version 1")
+        # Fresh databases start from the squashed baseline, then apply each forward migration
+        for version in range(current + 1, target + 1):
+            MIGRATIONS[version](cursor)
+            _set_schema_version(cursor, version)
+        logger.info("Schema migrated from version %s to %s", current, target)
     else:
         logger.info("Schema already at current version %s", target)
 
@@ -0,0 +1,161 @@
+"""SQLite PRAGMA profile applied when connections are opened.
+
+Two kinds of settings:
+  - persistent: stored in the database file itself (journal_mode=WAL). Applied
+    once per database path per process.
+  - session: per-connection knobs (synchronous, cache_size, mmap_size,
+    temp_store, busy_timeout, wal_autocheckpoint, journal_size_limit). Applied
+    every time a connection is opened; pooled connections keep them for life.
+
+WAL relies on shared memory and does not work reliably on network shares, so
+UNC paths / mapped network drives (and TRADIA_DB_JOURNAL_MODE overrides) fall
+back to the rollback journal with memory-mapped I/O disabled.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import sys
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_MODE_ENV_KEY = "TRADIA_DB_JOURNAL_MODE"  # e.g. DELETE to opt out of WAL
+NETWORK_SAFE_JOURNAL_MODE = "DELETE"
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+
+def is_network_path(path: str) -> bool:
+    """Best-effort detection of databases living on a network share."""
+    if not path or path == ":memory:":
+        return False
+    if path.startswith("\\\\") or path.startswith("//"):
+        return True
+    if sys.platform.startswith("win"):
+        try:
+            import ctypes
+
+            drive = os.path.splitdrive(os.path.abspath(path))[0]
+            if drive:
+                DRIVE_REMOTE = 4
+                return ctypes.windll.kernel32.GetDriveTypeW(f"{drive}\\") == DRIVE_REMOTE
+        except Exception:
+            return False
+    return False
+
+
+class PragmaProfile:
+    """Tuned PRAGMA values for the application database."""
+
+    def __init__(
+        self,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size_kib: int = 16 * 1024,
+        mmap_size: int = 64 * 1024 * 1024,
+        temp_store: str = "MEMORY",
+        busy_timeout_ms: int = 10_000,
+        wal_autocheckpoint: int = 1000,
+        journal_size_limit: int = 64 * 1024 * 1024,
+    ):
+        self.journal_mode = journal_mode.upper()
+        self.synchronous = synchronous.upper()
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.temp_store = temp_store.upper()
+        self.busy_timeout_ms = busy_timeout_ms
+        self.wal_autocheckpoint = wal_autocheckpoint
+        self.journal_size_limit = journal_size_limit
+
+    def for_path(self, path: str) -> PragmaProfile:
+        """Return the profile to use for a given database path (network-safe if needed)."""
+        override = (os.environ.get(JOURNAL_MODE_ENV_KEY) or "").strip().upper()
+        if override and override not in JOURNAL_MODES:
+            logger.warning("Ignoring unsupported %s=%s", JOURNAL_MODE_ENV_KEY, override)
+            override = ""
+        if override or is_network_path(path):
+            mode = override or NETWORK_SAFE_JOURNAL_MODE
+            return PragmaProfile(
+                journal_mode=mode,
+                # Without WAL, NORMAL is not crash-safe; go back to the SQLite default.
+                synchronous=self.synchronous if mode == "WAL" else "FULL",
+                cache_size_kib=self.cache_size_kib,
+                mmap_size=self.mmap_size if mode == "WAL" else 0,
+                temp_store=self.temp_store,
+                busy_timeout_ms=self.busy_timeout_ms,
+                wal_autocheckpoint=self.wal_autocheckpoint,
+                journal_size_limit=self.journal_size_limit,
+            )
+        return self
+
+    def persistent_statements(self) -> list[str]:
+        return [f"PRAGMA journal_mode = {self.journal_mode}"]
+
+    def session_statements(self) -> list[str]:
+        return [
+            f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA cache_size = {-int(self.cache_size_kib)}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA temp_store = {self.temp_store}",
+            f"PRAGMA wal_autocheckpoint = {int(self.wal_autocheckpoint)}",
+            f"PRAGMA journal_size_limit = {int(self.journal_size_limit)}",
+        ]
+
+
+def apply_persistent(conn: sqlite3.Connection, profile: PragmaProfile) -> str | None:
+    """Apply database-level settings. Returns the resulting journal mode."""
+    mode = None
+    for stmt in profile.persistent_statements():
+        try:
+            row = conn.execute(stmt).fetchone()
+            mode = row[0] if row else mode
+        except sqlite3.Error as e:
+            logger.warning("Could not apply '%s': %s", stmt, e)
+    return mode
+
+
+def apply_session(conn: sqlite3.Connection, profile: PragmaProfile):
+    for stmt in profile.session_statements():
+        try:
+            conn.execute(stmt).fetchall()
+        except sqlite3.Error as e:
+            logger.debug("Could not apply '%s': %s", stmt, e)
+
+
+class CheckpointPolicy:
+    """Decides when a WAL file is large enough to force a truncating checkpoint.
+
+    SQLite's wal_autocheckpoint runs PASSIVE checkpoints as pages accumulate, but
+    those cannot reset the WAL while readers are active, so a busy session can
+    leave it growing. The policy is consulted at quiet points (after backups,
+    on application exit) and forces a checkpoint once the WAL passes the limit.
+    """
+
+    def __init__(self, max_wal_bytes: int = 32 * 1024 * 1024, mode: str = "TRUNCATE"):
+        mode = mode.upper()
+        if mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Unsupported checkpoint mode '{mode}'")
+        self.max_wal_bytes = max_wal_bytes
+        self.mode = mode
+
+    def should_checkpoint(self, wal_bytes: int) -> bool:
+        return wal_bytes > self.max_wal_bytes
+
+
+def wal_size(db_path: str) -> int:
+    try:
+        return os.path.getsize(f"{db_path}-wal")
+    except OSError:
+        return 0
+
+
+def checkpoint(conn: sqlite3.Connection, mode: str = "PASSIVE") -> tuple[int, int, int]:
+    """Run a WAL checkpoint; returns SQLite's (busy, log_frames, checkpointed_frames)."""
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Unsupported checkpoint mode '{mode}'")
+    row = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    return (row[0], row[1], row[2]) if row else (0, 0, 0)
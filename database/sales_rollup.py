@@ -0,0 +1,118 @@
+"""Daily sales rollup (sales_daily), created by migration 3.
+
+One row per calendar day with invoices::
+
+    day            'YYYY-MM-DD' (primary key)
+    invoice_count  number of invoices dated that day
+    gross          sum of subtotals before discount and tax
+    discount, tax  sums of the invoice discount / tax
+    total          sum of total_amount
+
+Triggers on invoices keep it in step with every INSERT, DELETE and UPDATE of
+invoice_date / discount / tax / total_amount, whatever code path makes the
+change, inside the same transaction. Sales reports and graphs read the
+rollup (a few hundred rows per year) instead of scanning invoices.
+
+Day/month/year buckets come from the leading characters of the stored
+``YYYY-MM-DD HH:MM:SS`` invoice date. rebuild_sales_daily() recomputes the
+table from invoices (back-fill, or repair after editing the file by hand);
+``python -m database.sales_rollup --check`` reports days that disagree.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+PERIOD_PREFIX = {"day": 10, "month": 7, "year": 4}  # characters of 'YYYY-MM-DD'
+_TOLERANCE = 1e-6  # REAL sums may differ in the last bits depending on summation order
+
+# Day of an invoice row; substr keeps non-ISO legacy dates from becoming NULL keys.
+# Must match the expression frozen into migration 3's triggers.
+DAY_OF = "COALESCE(date({col}), substr({col}, 1, 10))"
+
+_REBUILD_SELECT = f"""
+    SELECT {DAY_OF.format(col="invoice_date")} AS day,
+           COUNT(*),
+           COALESCE(SUM(total_amount - COALESCE(tax, 0) + COALESCE(discount, 0)), 0),
+           COALESCE(SUM(COALESCE(discount, 0)), 0),
+           COALESCE(SUM(COALESCE(tax, 0)), 0),
+           COALESCE(SUM(total_amount), 0)
+    FROM invoices
+    GROUP BY day
+"""
+
+
+def rebuild_sales_daily(cursor) -> int:
+    """Recompute sales_daily from invoices; returns the number of days."""
+    cursor.execute("DELETE FROM sales_daily")
+    cursor.execute(f"INSERT INTO sales_daily (day, invoice_count, gross, discount, tax, total) {_REBUILD_SELECT}")
+    cursor.execute("SELECT COUNT(*) FROM sales_daily")
+    return cursor.fetchone()[0]
+
+
+def mismatched_days(cursor) -> list[str]:
+    """Days where sales_daily disagrees with invoices (empty when the rollup is exact)."""
+    cursor.execute(_REBUILD_SELECT)
+    expected = {row[0]: row[1:] for row in cursor.fetchall()}
+    cursor.execute("SELECT day, invoice_count, gross, discount, tax, total FROM sales_daily")
+    actual = {row[0]: row[1:] for row in cursor.fetchall()}
+    bad = []
+    for day in sorted(set(expected) | set(actual)):
+        want, have = expected.get(day), actual.get(day)
+        if want is None or have is None or want[0] != have[0]:
+            bad.append(day)
+        elif any(abs(a - b) > _TOLERANCE for a, b in zip(want[1:], have[1:], strict=True)):
+            bad.append(day)
+    return bad
+
+
+def sales_totals(cursor, start_day: str, end_day: str) -> tuple[float, int]:
+    """(total sales, invoice count) for start_day <= day < end_day (ISO dates)."""
+    cursor.execute(
+        "SELECT COALESCE(SUM(total), 0.0), COALESCE(SUM(invoice_count), 0) FROM sales_daily WHERE day >= ? AND day < ?",
+        (start_day, end_day),
+    )
+    total, count = cursor.fetchone()
+    return float(total), int(count)
+
+
+def sales_by_period(cursor, period: str) -> list[tuple[str, float]]:
+    """[(period label, total sales)] oldest first; period is day, month or year."""
+    if period not in PERIOD_PREFIX:
+        raise ValueError(f"Unsupported period '{period}'")
+    width = PERIOD_PREFIX[period]
+    cursor.execute(
+        f"SELECT substr(day, 1, {width}) AS period, SUM(total) FROM sales_daily GROUP BY period ORDER BY period"
+    )
+    return [(row[0], float(row[1])) for row in cursor.fetchall()]
+
+
+def main(argv=None) -> int:
+    from database.db_handler import get_db_connection, initialize_database
+
+    parser = argparse.ArgumentParser(
+        prog="python -m database.sales_rollup", description="Rebuild or check the daily sales rollup."
+    )
+    parser.add_argument("--check", action="store_true", help="only report days that disagree with invoices")
+    args = parser.parse_args(argv)
+
+    initialize_database()
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        if args.check:
+            bad = mismatched_days(cur)
+            for day in bad:
+                print(f"  {day}")
+            print(f"{len(bad)} day(s) out of step")
+            return 1 if bad else 0
+        days = rebuild_sales_daily(cur)
+        conn.commit()
+        print(f"Rebuilt sales_daily: {days} day(s)")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 """Application entry point (FREE edition) - initializes DB, ensures default admin, shows login."""
 import logging
+import multiprocessing
 import sys
 from typing import Any
 
@@ -128,4 +129,12 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    # Batch receipt export renders in spawned worker processes; required for frozen builds
+    multiprocessing.freeze_support()
+    if "--backup" in sys.argv[1:]:
+        # Detached backup started on exit (frozen builds have no "python -m utils.backup")
+        from utils.backup import main as backup_main
+
+        configure_logging()
+        sys.exit(backup_main([a for a in sys.argv[1:] if a != "--backup"]))
     sys.exit(main())
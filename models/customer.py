@@ -1,4 +1,5 @@
 from database.db_handler import get_db_connection
+from database.fts import fts_table_exists, like_pattern, prefix_match_query
 
 
 # Customer Class
@@ -121,6 +122,110 @@ class Customer:
         connection.close()
         return Customer(*row) if row else None
 
+    # Get a customer by exact name (case-insensitive) and phone; served by the unique NOCASE index
+    @staticmethod
+    def find_by_name_and_phone(name, phone_number):
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            SELECT customer_id, name, phone_number, address FROM customers
+            WHERE name = ? COLLATE NOCASE AND phone_number = ?
+            LIMIT 1
+        """,
+            (name, phone_number),
+        )
+        row = cursor.fetchone()
+        connection.close()
+        return Customer(*row) if row else None
+
+    # First customers whose name starts with the prefix (index range scan, A-Z)
+    @staticmethod
+    def find_by_name_prefix(prefix, limit=1):
+        prefix = (prefix or "").strip()
+        if not prefix:
+            return []
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        # A range instead of LIKE so the NOCASE index is used whatever case_sensitive_like says
+        cursor.execute(
+            """
+            SELECT customer_id, name, phone_number, address FROM customers
+            WHERE name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE
+            ORDER BY name COLLATE NOCASE
+            LIMIT ?
+        """,
+            (prefix, prefix + "\U0010ffff", limit),
+        )
+        rows = cursor.fetchall()
+        connection.close()
+        return [Customer(*row) for row in rows]
+
+    # Resolve text typed into a customer dropdown ("Name - phone", a name, or part of one)
+    @staticmethod
+    def find_by_display_text(text):
+        text = (text or "").strip()
+        if not text:
+            return None
+        name, sep, phone = text.rpartition(" - ")
+        if sep:
+            customer = Customer.find_by_name_and_phone(name.strip(), phone.strip())
+            if customer:
+                return customer
+        else:
+            name = text
+        matches = Customer.find_by_name_prefix(name, limit=1)
+        if matches:
+            return matches[0]
+        matches = Customer.search(text, limit=1)
+        return matches[0] if matches else None
+
+    # Ranked prefix search over name, phone and address (FTS5 index; LIKE fallback without FTS5)
+    @staticmethod
+    def search(query, limit=20):
+        text = (query or "").strip()
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            match = prefix_match_query(text)
+            if not text:
+                cursor.execute(
+                    """
+                    SELECT customer_id, name, phone_number, address FROM customers
+                    ORDER BY name COLLATE NOCASE
+                    LIMIT ?
+                """,
+                    (limit,),
+                )
+            elif match and fts_table_exists(cursor, "customers_fts"):
+                # Name hits outrank phone hits, which outrank address hits
+                cursor.execute(
+                    """
+                    SELECT c.customer_id, c.name, c.phone_number, c.address
+                    FROM customers_fts
+                    JOIN customers c ON c.customer_id = customers_fts.rowid
+                    WHERE customers_fts MATCH ?
+                    ORDER BY bm25(customers_fts, 10.0, 5.0, 1.0), c.name COLLATE NOCASE
+                    LIMIT ?
+                """,
+                    (match, limit),
+                )
+            else:
+                pattern = like_pattern(text)
+                cursor.execute(
+                    """
+                    SELECT customer_id, name, phone_number, address FROM customers
+                    WHERE name LIKE ? ESCAPE '\\' OR phone_number LIKE ? ESCAPE '\\' OR address LIKE ? ESCAPE '\\'
+                    ORDER BY name COLLATE NOCASE
+                    LIMIT ?
+                """,
+                    (pattern, pattern, pattern, limit),
+                )
+            rows = cursor.fetchall()
+        finally:
+            connection.close()
+        return [Customer(*row) for row in rows]
+
     # Customer's purchase history
     @staticmethod
     def get_customer_purchase_history(customer_id):
@@ -1,7 +1,229 @@
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+from database.data_version import DataVersionWatch
 from database.db_handler import get_db_connection
-from models.product import Product
+from utils.activity_log import log_action
+from utils.app_settings import DEFAULT_THANK_YOU, DEFAULT_WHOLESALE_NAME, get_settings
+from utils.session import get_current_username
+
+# Host parameters per IN (...) list; stays under SQLite's limit on older builds.
+_IN_CHUNK_SIZE = 500
+# Rows per multi-row INSERT into invoice_items (4 parameters each).
+_ITEM_ROWS_PER_INSERT = 200
+# Rows fetched per query by Invoice.iter_invoices.
+_INVOICE_PAGE_SIZE = 200
+
+
+def _aggregate_quantities(items) -> dict[int, int]:
+    """Sum requested quantities per product_id."""
+    requested: dict[int, int] = {}
+    for it in items:
+        pid = it["product_id"]
+        requested[pid] = requested.get(pid, 0) + int(it["quantity"])
+    return requested
+
+
+def _fetch_stock(cursor, product_ids) -> dict[int, int]:
+    """Return {product_id: stock_quantity} for the given ids using chunked IN queries."""
+    ids = list(product_ids)
+    stock: dict[int, int] = {}
+    for start in range(0, len(ids), _IN_CHUNK_SIZE):
+        chunk = ids[start : start + _IN_CHUNK_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(
+            f"SELECT product_id, stock_quantity FROM products WHERE product_id IN ({placeholders})",
+            chunk,
+        )
+        stock.update(cursor.fetchall())
+    return stock
+
+
+def _reserve_stock(cursor, requested: dict[int, int], held: dict[int, int] | None = None):
+    """Decrement stock for each product, raising ValueError if any would go negative.
+
+    The guarded UPDATE validates and decrements in a single statement; current
+    stock is only fetched to build the error message. ``held`` is stock the
+    invoice already owns (when editing), reported as part of what is available.
+    """
+    held = held or {}
+    for pid, req_qty in requested.items():
+        cursor.execute(
+            "UPDATE products SET stock_quantity = stock_quantity - ? WHERE product_id = ? AND stock_quantity >= ?",
+            (req_qty, pid, req_qty),
+        )
+        if cursor.rowcount == 1:
+            continue
+        stock = _fetch_stock(cursor, [pid])
+        if pid not in stock:
+            raise ValueError(f"Product ID {pid} not found.")
+        own = held.get(pid, 0)
+        raise ValueError(
+            f"Insufficient stock for product ID {pid}. Available: {stock[pid] + own}, requested: {req_qty + own}."
+        )
+
+
+def _diff_items(old_rows, items):
+    """Match existing invoice_items rows to the new lines, per product in order.
+
+    old_rows are (item_id, product_id, quantity, unit_price). Returns
+    (updates, deletes, inserts): updates as (quantity, unit_price, item_id)
+    for paired rows whose values changed, deletes as item_ids, inserts as
+    the unmatched new item dicts.
+    """
+    by_product: dict[int, list] = {}
+    for row in old_rows:
+        by_product.setdefault(row[1], []).append(row)
+    updates = []
+    inserts = []
+    for it in items:
+        candidates = by_product.get(it["product_id"])
+        if not candidates:
+            inserts.append(it)
+            continue
+        item_id, _, quantity, unit_price = candidates.pop(0)
+        new_qty, new_price = int(it["quantity"]), float(it["unit_price"])
+        if quantity != new_qty or unit_price != new_price:
+            updates.append((new_qty, new_price, item_id))
+    deletes = [row[0] for rows in by_product.values() for row in rows]
+    return updates, deletes, inserts
+
+
+def _insert_items(cursor, invoice_id: int, items):
+    """Insert invoice lines using multi-row INSERTs (one statement per chunk)."""
+    rows = [(invoice_id, it["product_id"], int(it["quantity"]), float(it["unit_price"])) for it in items]
+    for start in range(0, len(rows), _ITEM_ROWS_PER_INSERT):
+        chunk = rows[start : start + _ITEM_ROWS_PER_INSERT]
+        values = ",".join(["(?, ?, ?, ?)"] * len(chunk))
+        cursor.execute(
+            f"INSERT INTO invoice_items (invoice_id, product_id, quantity, unit_price) VALUES {values}",
+            [v for row in chunk for v in row],
+        )
+
+
+def _fetch_existing_customers(cursor, customer_ids) -> set[int]:
+    ids = list(customer_ids)
+    found: set[int] = set()
+    for start in range(0, len(ids), _IN_CHUNK_SIZE):
+        chunk = ids[start : start + _IN_CHUNK_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"SELECT customer_id FROM customers WHERE customer_id IN ({placeholders})", chunk)
+        found.update(row[0] for row in cursor.fetchall())
+    return found
+
+
+class InvoiceRecord:
+    """Lightweight invoice summary row returned by Invoice.iter_invoices."""
+
+    __slots__ = ("invoice_id", "customer_name", "total_amount", "invoice_date", "customer_id")
+
+    def __init__(self, invoice_id, customer_name, total_amount, invoice_date=None, customer_id=None):
+        self.invoice_id = invoice_id
+        self.customer_name = customer_name
+        self.total_amount = total_amount
+        self.invoice_date = invoice_date
+        self.customer_id = customer_id
+
+    def __repr__(self):
+        return f"InvoiceRecord(invoice_id={self.invoice_id!r}, customer_name={self.customer_name!r})"
+
+
+_INVOICE_FILTER_KEYS = {"invoice_id", "customer_id", "customer", "date_from", "date_to"}
+
+
+def _invoice_filter_sql(filters) -> tuple[list[str], list]:
+    """WHERE clauses and parameters for Invoice.iter_invoices filters."""
+    unknown = set(filters) - _INVOICE_FILTER_KEYS
+    if unknown:
+        raise ValueError(f"Unsupported invoice filter(s): {', '.join(sorted(unknown))}")
+    clauses: list[str] = []
+    params: list = []
+    if filters.get("invoice_id") is not None:
+        clauses.append("i.invoice_id = ?")
+        params.append(int(filters["invoice_id"]))
+    if filters.get("customer_id") is not None:
+        clauses.append("i.customer_id = ?")
+        params.append(int(filters["customer_id"]))
+    name = (filters.get("customer") or "").strip()
+    if name:
+        # Range on the NOCASE customers index rather than LIKE on the joined rows
+        clauses.append("c.name >= ? COLLATE NOCASE AND c.name < ? COLLATE NOCASE")
+        params.extend((name, name + "\U0010ffff"))
+    if filters.get("date_from"):
+        clauses.append("i.invoice_date >= ?")
+        params.append(str(filters["date_from"]))
+    if filters.get("date_to"):
+        # Dates are stored as "YYYY-MM-DD HH:MM:SS"; include the whole end day
+        clauses.append("i.invoice_date < date(?, '+1 day')")
+        params.append(str(filters["date_to"]))
+    return clauses, params
+
+
+class BulkInvoiceResult:
+    """Outcome of Invoice.create_invoices_bulk.
+
+    invoice_ids is aligned with the input list (None where the invoice was
+    rejected); errors maps input index -> reason.
+    """
+
+    def __init__(self, size: int):
+        self.invoice_ids: list[int | None] = [None] * size
+        self.errors: dict[int, str] = {}
+
+    @property
+    def created_count(self) -> int:
+        return sum(1 for inv_id in self.invoice_ids if inv_id is not None)
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.errors)
+
+
+class ReceiptCache:
+    """Bounded LRU of formatted receipt dicts.
+
+    Keys are (invoice_id, data version token, settings version): any commit to
+    the database or any settings change makes older entries unreachable, and
+    they age out of the LRU. Returned dicts are shared and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, dict] = OrderedDict()
+        self._watch = DataVersionWatch()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        with self._lock:
+            self._entries.clear()
+            self._watch.close()
+
+    def get(self, invoice_id) -> dict | None:
+        with self._lock:
+            settings = get_settings()
+            token = self._watch.token()
+            key = (int(invoice_id), token, settings.version)
+            cached = self._entries.get(key) if token is not None else None
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return cached
+            self.stats["misses"] += 1
+            invoice = Invoice.get_invoice_by_id(invoice_id)
+            if invoice is None:
+                return None
+            formatted = Invoice.format_receipt_data(invoice, settings.display_number, settings.display_address)
+            if token is not None:
+                self._entries[key] = formatted
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            return formatted
 
 
 # Invoice Class
@@ -24,23 +246,8 @@ class Invoice:
             # Acquire a write lock to prevent concurrent stock changes
             cursor.execute("BEGIN IMMEDIATE")
 
-            # Aggregate requested quantities per product_id
-            requested = {}
-            for it in items:
-                pid = it["product_id"]
-                requested[pid] = requested.get(pid, 0) + int(it["quantity"])
-
-            # Validate stock for each product against current DB value
-            for pid, req_qty in requested.items():
-                cursor.execute("SELECT stock_quantity FROM products WHERE product_id = ?", (pid,))
-                row = cursor.fetchone()
-                if not row:
-                    raise ValueError(f"Product ID {pid} not found.")
-                stock = row[0]
-                if req_qty > stock:
-                    raise ValueError(
-                        f"Insufficient stock for product ID {pid}. Available: {stock}, requested: {req_qty}."
-                    )
+            # Validate and decrement stock: one guarded UPDATE per distinct product
+            _reserve_stock(cursor, _aggregate_quantities(items))
 
             # All validations passed; insert invoice
             subtotal = sum(int(item["quantity"]) * float(item["unit_price"]) for item in items)
@@ -56,72 +263,162 @@ class Invoice:
             )
             invoice_id = cursor.lastrowid
 
-            # Insert invoice_items and decrement stock in the same transaction
-            for item in items:
-                product_id = item["product_id"]
-                quantity = int(item["quantity"])
-                unit_price = float(item["unit_price"])
+            # Insert invoice_items in the same transaction
+            _insert_items(cursor, invoice_id, items)
 
+            connection.commit()
+            return invoice_id
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    # Create many invoices in one transaction
+    @staticmethod
+    def create_invoices_bulk(invoices) -> BulkInvoiceResult:
+        """Create many invoices at once (e.g. end-of-day import).
+
+        Each entry is a dict with customer_id, items (same shape as create_invoice),
+        and optional discount/tax. Stock and customers for the whole batch are
+        validated with set-based queries; invoices are accepted in input order
+        against the remaining stock, so a rejected invoice does not abort the
+        rest. Accepted invoices are written in a single transaction, with items
+        and stock decrements sent through executemany.
+        """
+        result = BulkInvoiceResult(len(invoices))
+        prepared = []
+        for idx, inv in enumerate(invoices):
+            try:
+                items = [(int(it["product_id"]), int(it["quantity"]), float(it["unit_price"])) for it in inv["items"]]
+                if not items:
+                    raise ValueError("Invoice has no items.")
+                if any(qty <= 0 for _, qty, _ in items):
+                    raise ValueError("Item quantities must be positive.")
+                if any(price < 0 for _, _, price in items):
+                    raise ValueError("Unit prices cannot be negative.")
+                discount = float(inv.get("discount", 0) or 0)
+                tax = float(inv.get("tax", 0) or 0)
+                prepared.append((idx, int(inv["customer_id"]), items, discount, tax))
+            except (KeyError, TypeError) as e:
+                result.errors[idx] = f"Invalid invoice data: {e}"
+            except ValueError as e:
+                result.errors[idx] = str(e)
+        if not prepared:
+            return result
+
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            remaining = _fetch_stock(cursor, {pid for _, _, items, _, _ in prepared for pid, _, _ in items})
+            customers = _fetch_existing_customers(cursor, {cid for _, cid, _, _, _ in prepared})
+
+            accepted = []
+            for idx, customer_id, items, discount, tax in prepared:
+                if customer_id not in customers:
+                    result.errors[idx] = f"Customer ID {customer_id} not found."
+                    continue
+                requested = _aggregate_quantities({"product_id": pid, "quantity": qty} for pid, qty, _ in items)
+                error = None
+                for pid, req_qty in requested.items():
+                    if pid not in remaining:
+                        error = f"Product ID {pid} not found."
+                        break
+                    if req_qty > remaining[pid]:
+                        error = (
+                            f"Insufficient stock for product ID {pid}. "
+                            f"Available: {remaining[pid]}, requested: {req_qty}."
+                        )
+                        break
+                if error:
+                    result.errors[idx] = error
+                    continue
+                for pid, req_qty in requested.items():
+                    remaining[pid] -= req_qty
+                accepted.append((idx, customer_id, items, discount, tax))
+
+            invoice_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            item_rows = []
+            decrements: dict[int, int] = {}
+            for idx, customer_id, items, discount, tax in accepted:
+                subtotal = sum(qty * price for _, qty, price in items)
                 cursor.execute(
                     """
-                    INSERT INTO invoice_items (invoice_id, product_id, quantity, unit_price)
-                    VALUES (?, ?, ?, ?)
+                    INSERT INTO invoices (customer_id, invoice_date, discount, tax, total_amount)
+                    VALUES (?, ?, ?, ?, ?)
                 """,
-                    (invoice_id, product_id, quantity, unit_price),
-                )
-
-                cursor.execute(
-                    "UPDATE products SET stock_quantity = stock_quantity - ? WHERE product_id = ?",
-                    (quantity, product_id),
+                    (customer_id, invoice_date, discount, tax, subtotal - discount + tax),
                 )
-
+                invoice_id = cursor.lastrowid
+                result.invoice_ids[idx] = invoice_id
+                for pid, qty, price in items:
+                    item_rows.append((invoice_id, pid, qty, price))
+                    decrements[pid] = decrements.get(pid, 0) + qty
+
+            cursor.executemany(
+                "INSERT INTO invoice_items (invoice_id, product_id, quantity, unit_price) VALUES (?, ?, ?, ?)",
+                item_rows,
+            )
+            cursor.executemany(
+                "UPDATE products SET stock_quantity = stock_quantity - ? WHERE product_id = ?",
+                [(qty, pid) for pid, qty in decrements.items()],
+            )
             connection.commit()
-            return invoice_id
         except Exception:
             connection.rollback()
             raise
         finally:
             connection.close()
 
+        try:
+            log_action(
+                get_current_username(),
+                "INVOICE_BULK_CREATE",
+                f"created={result.created_count} failed={result.failed_count}",
+            )
+        except Exception:
+            pass
+        return result
+
     # Update Invoice
     @staticmethod
     def update_invoice(invoice_id, customer_id, items, discount=0.0, tax=0.0):
+        """Apply an edited item list by diffing it against the stored lines.
+
+        Only invoice_items rows whose product/quantity/price changed are
+        updated, deleted or inserted, and stock moves by the net per-product
+        delta, so fixing one line of a large invoice writes one line.
+        """
         connection = get_db_connection()
         cursor = connection.cursor()
         try:
             cursor.execute("BEGIN IMMEDIATE")
 
-            # Restore stock from existing invoice items
-            cursor.execute("SELECT product_id, quantity FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
-            old_items = cursor.fetchall()
-            for product_id, quantity in old_items:
-                cursor.execute(
-                    "UPDATE products SET stock_quantity = stock_quantity + ? WHERE product_id = ?",
-                    (quantity, product_id),
-                )
+            cursor.execute(
+                "SELECT item_id, product_id, quantity, unit_price FROM invoice_items WHERE invoice_id = ? "
+                "ORDER BY item_id",
+                (invoice_id,),
+            )
+            old_rows = cursor.fetchall()
+            old_qty = _aggregate_quantities({"product_id": r[1], "quantity": r[2]} for r in old_rows)
+            new_qty = _aggregate_quantities(items)
+
+            # Net stock movement per product: give back first, then guarded takes
+            deltas = {pid: new_qty.get(pid, 0) - old_qty.get(pid, 0) for pid in old_qty.keys() | new_qty.keys()}
+            cursor.executemany(
+                "UPDATE products SET stock_quantity = stock_quantity + ? WHERE product_id = ?",
+                [(-delta, pid) for pid, delta in deltas.items() if delta < 0],
+            )
+            _reserve_stock(cursor, {pid: delta for pid, delta in deltas.items() if delta > 0}, held=old_qty)
 
-            # Remove old invoice items
-            cursor.execute("DELETE FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
+            # Touch only the invoice_items rows that changed
+            updates, deletes, inserts = _diff_items(old_rows, items)
+            cursor.executemany("UPDATE invoice_items SET quantity = ?, unit_price = ? WHERE item_id = ?", updates)
+            cursor.executemany("DELETE FROM invoice_items WHERE item_id = ?", [(item_id,) for item_id in deletes])
+            _insert_items(cursor, invoice_id, inserts)
 
-            # Aggregate requested quantities for the new items
-            requested = {}
-            for it in items:
-                pid = it["product_id"]
-                requested[pid] = requested.get(pid, 0) + int(it["quantity"])
-
-            # Validate stock availability for each product
-            for pid, req_qty in requested.items():
-                cursor.execute("SELECT stock_quantity FROM products WHERE product_id = ?", (pid,))
-                row = cursor.fetchone()
-                if not row:
-                    raise ValueError(f"Product ID {pid} not found.")
-                stock = row[0]
-                if req_qty > stock:
-                    raise ValueError(
-                        f"Insufficient stock for product ID {pid}. Available: {stock}, requested: {req_qty}."
-                    )
-
-            # Update invoice header
+            # Update invoice header (skipped by SQLite's WHERE when nothing changed)
             subtotal = sum(int(item["quantity"]) * float(item["unit_price"]) for item in items)
             total_after_discount = subtotal - float(discount) + float(tax)
             cursor.execute(
@@ -129,27 +426,21 @@ class Invoice:
                 UPDATE invoices
                 SET customer_id = ?, discount = ?, tax = ?, total_amount = ?
                 WHERE invoice_id = ?
+                  AND (customer_id IS NOT ? OR discount IS NOT ? OR tax IS NOT ? OR total_amount IS NOT ?)
             """,
-                (customer_id, discount, tax, total_after_discount, invoice_id),
+                (
+                    customer_id,
+                    discount,
+                    tax,
+                    total_after_discount,
+                    invoice_id,
+                    customer_id,
+                    discount,
+                    tax,
+                    total_after_discount,
+                ),
             )
 
-            # Insert new invoice_items and decrement stock
-            for item in items:
-                product_id = item["product_id"]
-                quantity = int(item["quantity"])
-                unit_price = float(item["unit_price"])
-                cursor.execute(
-                    """
-                    INSERT INTO invoice_items (invoice_id, product_id, quantity, unit_price)
-                    VALUES (?, ?, ?, ?)
-                """,
-                    (invoice_id, product_id, quantity, unit_price),
-                )
-                cursor.execute(
-                    "UPDATE products SET stock_quantity = stock_quantity - ? WHERE product_id = ?",
-                    (quantity, product_id),
-                )
-
             connection.commit()
         except Exception:
             connection.rollback()
@@ -159,129 +450,194 @@ class Invoice:
 
     # Delete Invoice
     @staticmethod
-    def delete_invoice(invoice_id):
+    def delete_invoice(invoice_id) -> dict[int, int]:
+        """Delete an invoice and put its items back into stock.
+
+        Runs as one BEGIN IMMEDIATE transaction on a single connection, restoring
+        stock with one relative UPDATE per product. Returns {product_id: quantity_restored}.
+        """
         connection = get_db_connection()
         cursor = connection.cursor()
-
-        cursor.execute("SELECT product_id, quantity FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
-        items = cursor.fetchall()
-        for product_id, quantity in items:
-            product = Product.get_product_by_id(product_id)
-            if product:
-                Product.update_stock(product_id, product.stock_quantity + quantity, connection)
-
-        cursor.execute("DELETE FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
-        cursor.execute("DELETE FROM invoices WHERE invoice_id = ?", (invoice_id,))
-
-        connection.commit()
-        connection.close()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                "SELECT product_id, SUM(quantity) FROM invoice_items WHERE invoice_id = ? GROUP BY product_id",
+                (invoice_id,),
+            )
+            restored = {product_id: quantity for product_id, quantity in cursor.fetchall()}
+            cursor.executemany(
+                "UPDATE products SET stock_quantity = stock_quantity + ? WHERE product_id = ?",
+                [(quantity, product_id) for product_id, quantity in restored.items()],
+            )
+            cursor.execute("DELETE FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
+            cursor.execute("DELETE FROM invoices WHERE invoice_id = ?", (invoice_id,))
+            connection.commit()
+            return restored
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
 
     # Get all Invoice
     @staticmethod
     def get_all_invoices():
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("""
-            SELECT invoices.invoice_id, customers.name, invoices.total_amount
-            FROM invoices
-            JOIN customers ON invoices.customer_id = customers.customer_id
-        """)
-        rows = cursor.fetchall()
-        connection.close()
-
-        # Return list of simple objects or named tuples for attribute access
-        invoices = []
-        for row in rows:
-            invoice = type("InvoiceRecord", (object,), {})()
-            invoice.invoice_id = row[0]
-            invoice.customer_name = row[1]
-            invoice.total_amount = row[2]
-            invoices.append(invoice)
-        return invoices
+        return list(Invoice.iter_invoices())
+
+    # Newest-first invoice listing, paged by invoice_id (keyset) instead of OFFSET
+    @staticmethod
+    def iter_invoices(after_id=None, limit=None, filters=None, page_size=_INVOICE_PAGE_SIZE):
+        """Yield InvoiceRecord rows with invoice_id < after_id, newest first.
+
+        filters may contain invoice_id, customer_id, customer (name prefix),
+        date_from and date_to ("YYYY-MM-DD", inclusive). Each page is one
+        indexed query on its own connection, so callers can stop early.
+        """
+        where, params = _invoice_filter_sql(filters or {})
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page = page_size if remaining is None else min(page_size, remaining)
+            clauses = list(where)
+            args = list(params)
+            if after_id is not None:
+                clauses.append("i.invoice_id < ?")
+                args.append(after_id)
+            sql = (
+                "SELECT i.invoice_id, c.name, i.total_amount, i.invoice_date, i.customer_id "
+                "FROM invoices i JOIN customers c ON c.customer_id = i.customer_id"
+            )
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += " ORDER BY i.invoice_id DESC LIMIT ?"
+            connection = get_db_connection()
+            try:
+                rows = connection.execute(sql, (*args, page)).fetchall()
+            finally:
+                connection.close()
+            for row in rows:
+                yield InvoiceRecord(*row)
+            if len(rows) < page:
+                return
+            after_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
 
     # Get to Invoice by ID
     @staticmethod
     def get_invoice_by_id(invoice_id):
+        # Header and lines in one round trip; the header repeats on each line
         connection = get_db_connection()
-        cursor = connection.cursor()
-
-        cursor.execute(
-            """
-            SELECT i.invoice_id,
-                   c.name,
-                   i.invoice_date,
-                   i.discount,
-                   i.tax,
-                   i.total_amount,
-                   i.customer_id,
-                   c.phone_number
-            FROM invoices i
-            JOIN customers c ON i.customer_id = c.customer_id
-            WHERE i.invoice_id = ?
-            """,
-            (invoice_id,),
-        )
-        row = cursor.fetchone()
-
-        if not row:
+        try:
+            rows = connection.execute(
+                """
+                SELECT i.invoice_id,
+                       c.name,
+                       i.invoice_date,
+                       i.discount,
+                       i.tax,
+                       i.total_amount,
+                       i.customer_id,
+                       c.phone_number,
+                       p.name,
+                       ii.quantity,
+                       ii.unit_price
+                FROM invoices i
+                JOIN customers c ON i.customer_id = c.customer_id
+                LEFT JOIN invoice_items ii ON ii.invoice_id = i.invoice_id
+                LEFT JOIN products p ON ii.product_id = p.product_id
+                WHERE i.invoice_id = ?
+                ORDER BY ii.item_id
+                """,
+                (invoice_id,),
+            ).fetchall()
+        finally:
             connection.close()
+
+        if not rows:
             return None
 
-        # Defensive: handle missing columns in mock/fetchone
-        invoice = {
-            "invoice_id": row[0] if len(row) > 0 else None,
-            "customer_name": row[1] if len(row) > 1 else None,
-            "invoice_date": row[2] if len(row) > 2 else None,
-            "discount": row[3] if len(row) > 3 else None,
-            "tax": row[4] if len(row) > 4 else None,
-            "total_amount": row[5] if len(row) > 5 else None,
-            "customer_id": row[6] if len(row) > 6 else None,
-            "customer_number": row[7] if len(row) > 7 else None,
-            "items": [],
+        row = rows[0]
+        return {
+            "invoice_id": row[0],
+            "customer_name": row[1],
+            "invoice_date": row[2],
+            "discount": row[3],
+            "tax": row[4],
+            "total_amount": row[5],
+            "customer_id": row[6],
+            "customer_number": row[7],
+            # Lines whose product no longer exists are skipped, as before
+            "items": [{"product_name": r[8], "quantity": r[9], "unit_price": r[10]} for r in rows if r[8] is not None],
         }
 
-        cursor.execute(
-            """
-            SELECT p.name, ii.quantity, ii.unit_price
-            FROM invoice_items ii
-            JOIN products p ON ii.product_id = p.product_id
-            WHERE ii.invoice_id = ?
-        """,
-            (invoice_id,),
-        )
-        items = cursor.fetchall()
-
-        connection.close()
-
-        invoice["items"] = [{"product_name": item[0], "quantity": item[1], "unit_price": item[2]} for item in items]
+    # Invoice details for many ids: one chunked query for headers, one for lines
+    @staticmethod
+    def get_invoices_by_ids(invoice_ids):
+        """Return {invoice_id: invoice dict} (same shape as get_invoice_by_id); unknown ids are omitted."""
+        ids = list(dict.fromkeys(int(i) for i in invoice_ids))
+        invoices: dict[int, dict] = {}
+        connection = get_db_connection()
+        try:
+            cursor = connection.cursor()
+            for start in range(0, len(ids), _IN_CHUNK_SIZE):
+                chunk = ids[start : start + _IN_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"""
+                    SELECT i.invoice_id, c.name, i.invoice_date, i.discount, i.tax, i.total_amount,
+                           i.customer_id, c.phone_number
+                    FROM invoices i
+                    JOIN customers c ON i.customer_id = c.customer_id
+                    WHERE i.invoice_id IN ({placeholders})
+                    """,
+                    chunk,
+                )
+                for row in cursor.fetchall():
+                    invoices[row[0]] = {
+                        "invoice_id": row[0],
+                        "customer_name": row[1],
+                        "invoice_date": row[2],
+                        "discount": row[3],
+                        "tax": row[4],
+                        "total_amount": row[5],
+                        "customer_id": row[6],
+                        "customer_number": row[7],
+                        "items": [],
+                    }
+                cursor.execute(
+                    f"""
+                    SELECT ii.invoice_id, p.name, ii.quantity, ii.unit_price
+                    FROM invoice_items ii
+                    JOIN products p ON ii.product_id = p.product_id
+                    WHERE ii.invoice_id IN ({placeholders})
+                    ORDER BY ii.invoice_id, ii.item_id
+                    """,
+                    chunk,
+                )
+                for invoice_id, name, quantity, unit_price in cursor.fetchall():
+                    invoices[invoice_id]["items"].append(
+                        {"product_name": name, "quantity": quantity, "unit_price": unit_price}
+                    )
+        finally:
+            connection.close()
+        return invoices
 
-        return invoice
+    # Formatted receipt for an invoice, served from the receipt cache
+    @staticmethod
+    def get_formatted_receipt(invoice_id):
+        return _RECEIPTS.get(invoice_id)
 
     @staticmethod
     def get_wholesale_name():
         try:
-            conn = get_db_connection()
-            cur = conn.cursor()
-            cur.execute("SELECT wholesale_name FROM settings WHERE id=1")
-            result = cur.fetchone()
-            conn.close()
-            if result and result[0]:
-                return result[0]
-            return "Wholesale Name Here"
+            return get_settings().display_name
         except Exception:
-            return "Wholesale Name Here"
+            return DEFAULT_WHOLESALE_NAME
 
     @staticmethod
     def get_wholesale_address():
         try:
-            conn = get_db_connection()
-            cur = conn.cursor()
-            cur.execute("SELECT wholesale_address FROM settings WHERE id=1")
-            result = cur.fetchone()
-            conn.close()
-            if result and result[0]:
-                return result[0]
-            return ""
+            return get_settings().display_address
         except Exception:
             return ""
 
@@ -289,16 +645,10 @@ class Invoice:
     def get_receipt_texts():
         """Return (thank_you, notes) from settings with safe defaults."""
         try:
-            conn = get_db_connection()
-            cur = conn.cursor()
-            cur.execute("SELECT receipt_thank_you, receipt_notes FROM settings WHERE id=1")
-            row = cur.fetchone()
-            conn.close()
-            thank = row[0] if row and row[0] else "Thank you for buying from us!"
-            notes = row[1] if row and row[1] else ""
-            return thank, notes
+            settings = get_settings()
+            return settings.thank_you, settings.notes
         except Exception:
-            return "Thank you for buying from us!", ""
+            return DEFAULT_THANK_YOU, ""
 
     @staticmethod
     def format_receipt_data(invoice, wholesale_number=None, wholesale_address=None):
@@ -344,6 +694,7 @@ class Invoice:
         discount = f"{invoice.get('discount', 0):,.2f}"
         tax = f"{invoice.get('tax', 0):,.2f}"
         total = f"{invoice.get('total_amount', 0):,.2f}"
+        thank_you, notes = Invoice.get_receipt_texts()
         return {
             "invoice_number": invoice_number,
             "invoice_date": invoice_date,
@@ -356,128 +707,42 @@ class Invoice:
             "discount": discount,
             "tax": tax,
             "total": total,
+            "wholesale_name": Invoice.get_wholesale_name(),
+            "thank_you": thank_you,
+            "notes": notes,
         }
 
     @staticmethod
     def export_receipt_to_pdf(formatted_data, file_path):
-        from reportlab.lib import colors
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-        from reportlab.lib.units import mm
-        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
-
-        doc = SimpleDocTemplate(file_path, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
-        styles = getSampleStyleSheet()
-        elements = []
-        title_style = ParagraphStyle(
-            name="Title",
-            parent=styles["Title"],
-            alignment=1,
-            fontSize=18,
-            leading=22,
-            spaceAfter=10,
-            fontName="Helvetica-Bold",
-        )
-        elements.append(Paragraph(Invoice.get_wholesale_name(), title_style))
-        # Minimal font for contact and address
-        contact_address_style = ParagraphStyle(
-            name="ContactAddress",
-            parent=styles["Normal"],
-            alignment=1,
-            fontSize=10,
-            textColor=colors.darkgray,
-            spaceAfter=8,
-        )
-        contact_line = (
-            "Contact: "
-            f"{formatted_data.get('wholesale_contact', '')} | Location: "
-            f"{formatted_data.get('wholesale_address', '')}"
-        )
-        elements.append(Paragraph(contact_line, contact_address_style))
-        # Details
-        elements.append(
-            Paragraph(
-                f"<b>Invoice Number:</b> <font name='Helvetica'>{formatted_data['invoice_number']}</font>",
-                styles["Normal"],
-            )
-        )
-        elements.append(
-            Paragraph(
-                f"<b>Date:</b> <font name='Helvetica'>{formatted_data['invoice_date']}</font>",
-                styles["Normal"],
-            )
-        )
-        elements.append(
-            Paragraph(
-                f"<b>Customer Name:</b> <font name='Helvetica'>{formatted_data['customer_name']}</font>",
-                styles["Normal"],
-            )
-        )
-        elements.append(Spacer(1, 12))
-        # Items table
-        table_data = [["Product", "Quantity", "Unit Price (GH¢)", "Subtotal (GH¢)"]] + formatted_data["items"]
-        table_data.append(["", f"Total Items: {formatted_data['total_items']}", "", ""])
-        table = Table(table_data, colWidths=[60 * mm, 30 * mm, 40 * mm, 40 * mm])
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightblue),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("ALIGN", (1, 1), (-1, -1), "CENTER"),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
-                    ("TOPPADDING", (0, 0), (-1, 0), 8),
-                    ("BOTTOMPADDING", (0, 1), (-1, -2), 6),
-                    ("TOPPADDING", (0, 1), (-1, -2), 6),
-                    ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
-                    ("BACKGROUND", (0, -1), (-1, -1), colors.whitesmoke),
-                ]
-            )
-        )
-        elements.append(table)
-        elements.append(Spacer(1, 16))
+        """Render one receipt to a file path or a binary file-like object."""
+        Invoice._receipt_template(formatted_data).render(formatted_data, file_path)
 
-        # Summary (right) and Notes (left) side by side
-        summary_right = ParagraphStyle(name="SummaryRight", parent=styles["Normal"], alignment=2)
-        notes_style = ParagraphStyle(name="NotesLeft", parent=styles["Normal"], fontSize=10, textColor=colors.grey)
+    # Several receipts in one PDF, each starting on a new page
+    @staticmethod
+    def export_receipts_to_pdf(formatted_list, file_path):
+        if formatted_list:
+            Invoice._receipt_template(formatted_list[0]).render_many(formatted_list, file_path)
 
-        discount = formatted_data["discount"]
-        tax = formatted_data["tax"]
-        total = formatted_data["total"]
-        summary_text = f"Discount: GH¢ {discount}<br/>" f"Tax: GH¢ {tax}<br/>" f"<b>Total: GH¢ {total}</b>"
-        thank_you, notes = Invoice.get_receipt_texts()
-        notes_para = Paragraph(notes or "", notes_style)
-        summary_para = Paragraph(summary_text, summary_right)
+    # Receipt PDF in memory (no temp file)
+    @staticmethod
+    def render_receipt_pdf(formatted_data) -> bytes:
+        return Invoice._receipt_template(formatted_data).render_bytes(formatted_data)
+
+    @staticmethod
+    def _receipt_template(formatted_data):
+        # Imported on first render: reportlab adds ~0.2 s to start-up otherwise
+        from models.receipt_template import get_receipt_template
+
+        if "thank_you" in formatted_data:
+            thank_you, notes = formatted_data["thank_you"], formatted_data.get("notes", "")
+        else:
+            thank_you, notes = Invoice.get_receipt_texts()
+        wholesale_name = formatted_data.get("wholesale_name") or Invoice.get_wholesale_name()
+        return get_receipt_template(wholesale_name, thank_you, notes)
+
+
+_RECEIPTS = ReceiptCache()
 
-        summary_notes_table = Table(
-            [[notes_para, summary_para]],
-            colWidths=[100 * mm, 70 * mm],
-            hAlign="LEFT",
-        )
-        summary_notes_table.setStyle(
-            TableStyle(
-                [
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("LEFTPADDING", (0, 0), (0, 0), 0),
-                    ("RIGHTPADDING", (-1, 0), (-1, 0), 0),
-                    ("TOPPADDING", (0, 0), (-1, -1), 0),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                ]
-            )
-        )
-        elements.append(summary_notes_table)
-        elements.append(Spacer(1, 30))
-
-        # Footer thank-you centered
-        footer_style = ParagraphStyle(
-            name="Footer",
-            parent=styles["Normal"],
-            alignment=1,
-            fontSize=11,
-            textColor=colors.grey,
-            spaceBefore=20,
-        )
-        elements.append(Paragraph(thank_you, footer_style))
 
-        doc.build(elements)
+def get_receipt_cache() -> ReceiptCache:
+    return _RECEIPTS
@@ -1,8 +1,157 @@
-from database.db_handler import get_db_connection
+import os
+import sqlite3
+import threading
+
+from database.data_version import DataVersionWatch
+from database.db_handler import get_connection_pool, get_db_connection, resolve_db_path
+from database.fts import fts_table_exists, like_pattern, prefix_match_query
 from utils.activity_log import log_action
 from utils.session import get_current_username
 
 
+class ProductCatalog:
+    """In-process snapshot of the products table keyed by product_id.
+
+    Freshness is checked on every read in two steps. A DataVersionWatch token
+    changes whenever any other connection commits (pooled connections in this
+    process, other processes), so an unchanged token means nothing changed.
+    Any commit moves it, though (activity log batches, settings, customers),
+    so a changed token is followed by one read of the products change counter
+    (table_changes, bumped by triggers since migration 4); only a changed
+    counter reloads the table, and ``version`` only moves when the reloaded
+    rows differ. While the snapshot is stale, get() answers with a keyed
+    single-row query instead of reloading everything.
+
+    Product's own write methods also invalidate explicitly. A changed database
+    path or a connection-pool reset drops the snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows: dict[int, tuple] = {}
+        self._order: list[int] = []  # product_ids, A-Z by name
+        self._watch = DataVersionWatch()
+        self._token: tuple | None = None
+        self._signature: tuple | None = None  # (db path, pool generation, products change counter)
+        self._loaded = False
+        self.version = 0  # bumped when a reload finds different rows; views compare it to skip rebuilding
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "revalidations": 0}
+
+    def invalidate(self):
+        with self._lock:
+            if self._loaded:
+                self.stats["invalidations"] += 1
+            self._loaded = False
+
+    def close(self):
+        with self._lock:
+            self._watch.close()
+            self._loaded = False
+
+    @staticmethod
+    def _read_signature(connection) -> tuple | None:
+        try:
+            row = connection.execute("SELECT changes FROM table_changes WHERE name = 'products'").fetchone()
+        except sqlite3.Error:
+            return None  # schema before migration 4: every check reloads
+        if row is None:
+            return None
+        return os.path.abspath(resolve_db_path()), get_connection_pool().generation, row[0]
+
+    def _check(self) -> tuple[bool, tuple | None]:
+        """(snapshot is current, data_version token); a changed token costs one counter read."""
+        token = self._watch.token()
+        if not self._loaded:
+            return False, token
+        if token is not None and token == self._token:
+            self.stats["hits"] += 1
+            return True, token
+        connection = get_db_connection()
+        try:
+            signature = self._read_signature(connection)
+        finally:
+            connection.close()
+        if signature is None or signature != self._signature:
+            return False, token
+        # Only other tables were written; the snapshot still holds
+        self._token = token
+        self.stats["revalidations"] += 1
+        return True, token
+
+    def _ensure_fresh(self):
+        fresh, token = self._check()
+        if fresh:
+            return
+        self.stats["misses"] += 1
+        # The token was read before the rows: a commit in between only causes one extra reload.
+        self._reload()
+        self._token = token
+        self._loaded = self._signature is not None
+
+    def _reload(self):
+        connection = get_db_connection()
+        try:
+            signature = self._read_signature(connection)
+            rows = connection.execute("""
+                SELECT product_id, name, price, stock_quantity
+                FROM products
+                ORDER BY name COLLATE NOCASE
+            """).fetchall()
+        finally:
+            connection.close()
+        order = [row[0] for row in rows]
+        by_id = {row[0]: row for row in rows}
+        if order != self._order or by_id != self._rows:
+            self.version += 1
+        self._rows = by_id
+        self._order = order
+        self._signature = signature
+
+    def current_version(self) -> int:
+        """Revalidate and return the snapshot version."""
+        with self._lock:
+            self._ensure_fresh()
+            return self.version
+
+    def rows(self, limit: int | None = None) -> list[tuple]:
+        """All products (or the first ``limit``) as (product_id, name, price, stock_quantity), A-Z by name."""
+        with self._lock:
+            self._ensure_fresh()
+            rows = self._rows
+            order = self._order if limit is None else self._order[:limit]
+            return [rows[pid] for pid in order]
+
+    def get(self, product_id) -> tuple | None:
+        try:
+            product_id = int(product_id)
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            if self._check()[0]:
+                return self._rows.get(product_id)
+            self.stats["misses"] += 1
+        # Stale: one keyed row now; the next rows()/below_stock() reloads the snapshot
+        connection = get_db_connection()
+        try:
+            return connection.execute(
+                "SELECT product_id, name, price, stock_quantity FROM products WHERE product_id = ?", (product_id,)
+            ).fetchone()
+        finally:
+            connection.close()
+
+    def below_stock(self, threshold) -> list[tuple]:
+        with self._lock:
+            self._ensure_fresh()
+            return [row for pid, row in sorted(self._rows.items()) if row[3] <= threshold]
+
+
+_CATALOG = ProductCatalog()
+
+
+def get_product_catalog() -> ProductCatalog:
+    return _CATALOG
+
+
 # The product class
 class Product:
     def __init__(self, product_id, name, price, stock_quantity):
@@ -58,6 +207,7 @@ class Product:
         new_id = cursor.lastrowid
         connection.commit()
         connection.close()
+        _CATALOG.invalidate()
         try:
             log_action(get_current_username(), "PRODUCT_ADD", f"{name} qty={stock_quantity} price={price}")
         except Exception:
@@ -79,6 +229,7 @@ class Product:
         )
         connection.commit()
         connection.close()
+        _CATALOG.invalidate()
         try:
             log_action(
                 get_current_username(),
@@ -102,42 +253,78 @@ class Product:
         )
         connection.commit()
         connection.close()
+        _CATALOG.invalidate()
         try:
             log_action(get_current_username(), "PRODUCT_DELETE", f"id={product_id}")
         except Exception:
             pass
 
-    # Get all existing products
+    # Get all existing products (A-Z by name), served from the catalog cache
     @staticmethod
     def get_all_products():
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        # Return products ordered A-Z by name (case-insensitive)
-        cursor.execute("""
-            SELECT product_id, name, price, stock_quantity
-            FROM products
-            ORDER BY name COLLATE NOCASE
-        """)
-        rows = cursor.fetchall()
-        connection.close()
-        return [Product(*row) for row in rows]
+        return [Product(*row) for row in _CATALOG.rows()]
 
     # Get product using product ID
     @staticmethod
     def get_product_by_id(product_id):
+        row = _CATALOG.get(product_id)
+        return Product(*row) if row else None
+
+    # Resolve free-typed dropdown text: "<id> - name (price)" or a bare id, else the best search hit
+    @staticmethod
+    def find_by_display_text(text):
+        text = (text or "").strip()
+        if not text:
+            return None
+        head = text.partition(" - ")[0].strip()
+        if head.isdigit():
+            product = Product.get_product_by_id(int(head))
+            if product:
+                return product
+        matches = Product.search(text, limit=1)
+        return matches[0] if matches else None
+
+    # Ranked prefix search over product names (FTS5 index; LIKE fallback without FTS5)
+    @staticmethod
+    def search(query, limit=20):
+        text = (query or "").strip()
+        if not text:
+            return [Product(*row) for row in _CATALOG.rows(limit)]
         connection = get_db_connection()
         cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT product_id, name, price, stock_quantity
-            FROM products
-            WHERE product_id = ?
-        """,
-            (product_id,),
-        )
-        row = cursor.fetchone()
-        connection.close()
-        return Product(*row) if row else None
+        try:
+            match = prefix_match_query(text)
+            if match and fts_table_exists(cursor, "products_fts"):
+                cursor.execute(
+                    """
+                    SELECT p.product_id, p.name, p.price, p.stock_quantity
+                    FROM products_fts
+                    JOIN products p ON p.product_id = products_fts.rowid
+                    WHERE products_fts MATCH ?
+                    ORDER BY rank, p.name COLLATE NOCASE
+                    LIMIT ?
+                """,
+                    (match, limit),
+                )
+            else:
+                cursor.execute(
+                    """
+                    SELECT product_id, name, price, stock_quantity FROM products
+                    WHERE name LIKE ? ESCAPE '\\'
+                    ORDER BY name COLLATE NOCASE
+                    LIMIT ?
+                """,
+                    (like_pattern(text), limit),
+                )
+            rows = cursor.fetchall()
+        finally:
+            connection.close()
+        # A product ID typed directly ranks first
+        if text.isdigit():
+            exact = _CATALOG.get(int(text))
+            if exact:
+                rows = [exact] + [r for r in rows if r[0] != exact[0]][: limit - 1]
+        return [Product(*row) for row in rows]
 
     # Update stock quantity upon adding/deleting product
     @staticmethod
@@ -160,19 +347,9 @@ class Product:
         if own_connection:
             connection.commit()
             connection.close()
+        _CATALOG.invalidate()
 
     # Check for low stock quantity
     @staticmethod
     def get_products_below_stock(threshold):
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT product_id, name, price, stock_quantity FROM products
-            WHERE stock_quantity <= ?
-        """,
-            (threshold,),
-        )
-        rows = cursor.fetchall()
-        connection.close()
-        return [Product(*row) for row in rows]
+        return [Product(*row) for row in _CATALOG.below_stock(threshold)]
@@ -0,0 +1,177 @@
+"""Prebuilt ReportLab layout for PDF receipts.
+
+A ReceiptTemplate holds everything that does not change from one receipt to
+the next: the stylesheet and paragraph styles, table styles and column
+widths, and the flowables built from settings (shop name, notes, thank-you
+line). Only the per-invoice paragraphs and tables are created per render.
+
+Templates are cached by the settings-derived texts they were built from, so a
+template is rebuilt exactly when those settings change; keying on the texts
+rather than the settings version also lets batch-export worker processes,
+which never read settings, reuse one template for their whole chunk.
+"""
+
+from __future__ import annotations
+
+import threading
+from io import BytesIO
+
+from reportlab import platypus
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import mm
+
+_PAGE_MARGINS = {"rightMargin": 30, "leftMargin": 30, "topMargin": 30, "bottomMargin": 30}
+ITEM_HEADER = ["Product", "Quantity", "Unit Price (GH¢)", "Subtotal (GH¢)"]
+
+
+class ReceiptTemplate:
+    def __init__(self, wholesale_name: str, thank_you: str, notes: str):
+        self.key = (wholesale_name, thank_you, notes)
+        # Flowables are re-wrapped on every build; renders sharing them are serialised
+        self._lock = threading.Lock()
+        styles = getSampleStyleSheet()
+        self.normal = styles["Normal"]
+        self.contact_style = ParagraphStyle(
+            name="ContactAddress",
+            parent=styles["Normal"],
+            alignment=1,
+            fontSize=10,
+            textColor=colors.darkgray,
+            spaceAfter=8,
+        )
+        self.summary_style = ParagraphStyle(name="SummaryRight", parent=styles["Normal"], alignment=2)
+        self.item_col_widths = [60 * mm, 30 * mm, 40 * mm, 40 * mm]
+        self.summary_col_widths = [100 * mm, 70 * mm]
+        self.items_style = platypus.TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.lightblue),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("ALIGN", (1, 1), (-1, -1), "CENTER"),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
+                ("TOPPADDING", (0, 0), (-1, 0), 8),
+                ("BOTTOMPADDING", (0, 1), (-1, -2), 6),
+                ("TOPPADDING", (0, 1), (-1, -2), 6),
+                ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+                ("BACKGROUND", (0, -1), (-1, -1), colors.whitesmoke),
+            ]
+        )
+        self.summary_table_style = platypus.TableStyle(
+            [
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("LEFTPADDING", (0, 0), (0, 0), 0),
+                ("RIGHTPADDING", (-1, 0), (-1, 0), 0),
+                ("TOPPADDING", (0, 0), (-1, -1), 0),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+            ]
+        )
+
+        # Settings-derived flowables, shared by every receipt
+        title_style = ParagraphStyle(
+            name="Title",
+            parent=styles["Title"],
+            alignment=1,
+            fontSize=18,
+            leading=22,
+            spaceAfter=10,
+            fontName="Helvetica-Bold",
+        )
+        notes_style = ParagraphStyle(name="NotesLeft", parent=styles["Normal"], fontSize=10, textColor=colors.grey)
+        footer_style = ParagraphStyle(
+            name="Footer",
+            parent=styles["Normal"],
+            alignment=1,
+            fontSize=11,
+            textColor=colors.grey,
+            spaceBefore=20,
+        )
+        self.title = platypus.Paragraph(wholesale_name, title_style)
+        self.notes = platypus.Paragraph(notes or "", notes_style)
+        self.footer = platypus.Paragraph(thank_you, footer_style)
+        self.gap_small = platypus.Spacer(1, 12)
+        self.gap_medium = platypus.Spacer(1, 16)
+        self.gap_large = platypus.Spacer(1, 30)
+
+    def elements(self, formatted_data) -> list:
+        """Flowables for one receipt."""
+        contact_line = (
+            "Contact: "
+            f"{formatted_data.get('wholesale_contact', '')} | Location: "
+            f"{formatted_data.get('wholesale_address', '')}"
+        )
+        details = (
+            ("Invoice Number", formatted_data["invoice_number"]),
+            ("Date", formatted_data["invoice_date"]),
+            ("Customer Name", formatted_data["customer_name"]),
+        )
+        table_data = [ITEM_HEADER] + formatted_data["items"]
+        table_data.append(["", f"Total Items: {formatted_data['total_items']}", "", ""])
+        items = platypus.Table(table_data, colWidths=self.item_col_widths)
+        items.setStyle(self.items_style)
+
+        summary_text = (
+            f"Discount: GH¢ {formatted_data['discount']}<br/>"
+            f"Tax: GH¢ {formatted_data['tax']}<br/>"
+            f"<b>Total: GH¢ {formatted_data['total']}</b>"
+        )
+        summary = platypus.Table(
+            [[self.notes, platypus.Paragraph(summary_text, self.summary_style)]],
+            colWidths=self.summary_col_widths,
+            hAlign="LEFT",
+        )
+        summary.setStyle(self.summary_table_style)
+
+        return [
+            self.title,
+            platypus.Paragraph(contact_line, self.contact_style),
+            *(
+                platypus.Paragraph(f"<b>{label}:</b> <font name='Helvetica'>{value}</font>", self.normal)
+                for label, value in details
+            ),
+            self.gap_small,
+            items,
+            self.gap_medium,
+            summary,
+            self.gap_large,
+            self.footer,
+        ]
+
+    def render(self, formatted_data, target):
+        """Write one receipt to a file path or a binary file-like object."""
+        self.render_many([formatted_data], target)
+        return target
+
+    def render_many(self, formatted_list, target):
+        """Write several receipts into one PDF, each starting on a new page."""
+        elements: list = []
+        for i, formatted_data in enumerate(formatted_list):
+            if i:
+                elements.append(platypus.PageBreak())
+            elements.extend(self.elements(formatted_data))
+        doc = platypus.SimpleDocTemplate(target, pagesize=A4, **_PAGE_MARGINS)
+        with self._lock:
+            doc.build(elements)
+        return target
+
+    def render_bytes(self, formatted_data) -> bytes:
+        """Render one receipt in memory and return the PDF bytes."""
+        buffer = BytesIO()
+        self.render(formatted_data, buffer)
+        return buffer.getvalue()
+
+
+_cache_lock = threading.Lock()
+_template: ReceiptTemplate | None = None
+
+
+def get_receipt_template(wholesale_name: str, thank_you: str, notes: str) -> ReceiptTemplate:
+    """The shared template for these texts, rebuilt only when they change."""
+    global _template
+    key = (wholesale_name, thank_you, notes)
+    with _cache_lock:
+        if _template is None or _template.key != key:
+            _template = ReceiptTemplate(wholesale_name, thank_you, notes)
+        return _template
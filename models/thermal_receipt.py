@@ -0,0 +1,134 @@
+"""Thermal (58/80 mm) receipt backend: fixed-width text and raw ESC/POS bytes.
+
+Works from the dict produced by Invoice.format_receipt_data, like the PDF
+backend, but builds a few dozen short lines instead of a document, so a
+receipt is ready in well under a millisecond. The output is written straight
+to the printer's device path (e.g. /dev/usb/lp0, COM3, LPT1 or a
+\\\\host\\share printer share); any writable file works too, which is how tests
+stand in for a printer.
+
+The till printer is configured with TRADIA_RECEIPT_PRINTER (device path) and
+TRADIA_RECEIPT_PAPER (58 or 80, default 80).
+"""
+
+from __future__ import annotations
+
+import os
+import textwrap
+
+PRINTER_ENV_KEY = "TRADIA_RECEIPT_PRINTER"
+PAPER_ENV_KEY = "TRADIA_RECEIPT_PAPER"
+# Characters per line in the printer's default font (Font A, 12x24)
+PAPER_COLUMNS = {58: 32, 80: 48}
+DEFAULT_PAPER_MM = 80
+
+# ESC/POS commands
+_ESC = b"\x1b"
+_GS = b"\x1d"
+_INIT = _ESC + b"@"
+_CODEPAGE_PC437 = _ESC + b"t\x00"
+_ALIGN = {"left": _ESC + b"a\x00", "center": _ESC + b"a\x01"}
+_BOLD_ON, _BOLD_OFF = _ESC + b"E\x01", _ESC + b"E\x00"
+_DOUBLE_HEIGHT_ON, _NORMAL_SIZE = _GS + b"!\x01", _GS + b"!\x00"
+_FEED_AND_CUT = _GS + b"V\x42\x03"  # feed 3 lines, then partial cut
+
+
+def paper_columns(paper_mm: int) -> int:
+    try:
+        return PAPER_COLUMNS[int(paper_mm)]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Unsupported paper width {paper_mm!r} mm (use 58 or 80)") from None
+
+
+def configured_printer() -> tuple[str | None, int]:
+    """(device path or None, paper width in mm) from the environment."""
+    path = (os.environ.get(PRINTER_ENV_KEY) or "").strip() or None
+    paper = (os.environ.get(PAPER_ENV_KEY) or "").strip()
+    return path, int(paper) if paper in ("58", "80") else DEFAULT_PAPER_MM
+
+
+def _pair(label: str, value: str, width: int) -> str:
+    gap = width - len(label) - len(value)
+    if gap < 1:
+        return f"{label} {value}"[:width]
+    return label + " " * gap + value
+
+
+def _receipt_lines(formatted_data, width: int) -> list[tuple[str, str]]:
+    """(style, text) lines; style is one of title, center, bold, left."""
+    rule = "-" * width
+    lines: list[tuple[str, str]] = []
+    for part in textwrap.wrap(str(formatted_data.get("wholesale_name") or ""), width) or [""]:
+        lines.append(("title", part))
+    contact = formatted_data.get("wholesale_contact") or ""
+    address = formatted_data.get("wholesale_address") or ""
+    if contact:
+        lines.append(("center", f"Contact: {contact}"[:width]))
+    for part in textwrap.wrap(str(address), width):
+        lines.append(("center", part))
+    lines.append(("left", rule))
+    lines.append(("left", _pair("Invoice #", str(formatted_data.get("invoice_number", "")), width)))
+    lines.append(("left", _pair("Date", str(formatted_data.get("invoice_date", "")), width)))
+    lines.append(("left", _pair("Customer", str(formatted_data.get("customer_name", "")), width)))
+    lines.append(("left", rule))
+    for name, qty, unit_price, subtotal in formatted_data.get("items", []):
+        for part in textwrap.wrap(str(name), width) or [""]:
+            lines.append(("left", part))
+        lines.append(("left", _pair(f"  {qty} x {unit_price}", subtotal, width)))
+    lines.append(("left", rule))
+    lines.append(("left", _pair("Items", str(formatted_data.get("total_items", "")), width)))
+    lines.append(("left", _pair("Discount (GH¢)", str(formatted_data.get("discount", "")), width)))
+    lines.append(("left", _pair("Tax (GH¢)", str(formatted_data.get("tax", "")), width)))
+    lines.append(("bold", _pair("TOTAL (GH¢)", str(formatted_data.get("total", "")), width)))
+    notes = formatted_data.get("notes") or ""
+    if notes:
+        lines.append(("left", ""))
+        for part in textwrap.wrap(str(notes), width):
+            lines.append(("left", part))
+    thank_you = formatted_data.get("thank_you") or ""
+    if thank_you:
+        lines.append(("left", ""))
+        for part in textwrap.wrap(str(thank_you), width):
+            lines.append(("center", part))
+    return lines
+
+
+def render_text(formatted_data, paper_mm: int = DEFAULT_PAPER_MM) -> str:
+    """Receipt as fixed-width text for the given paper width."""
+    width = paper_columns(paper_mm)
+    out = []
+    for style, text in _receipt_lines(formatted_data, width):
+        out.append(text.center(width).rstrip() if style in ("title", "center") else text)
+    return "\n".join(out) + "\n"
+
+
+def render_escpos(formatted_data, paper_mm: int = DEFAULT_PAPER_MM, cut: bool = True, encoding: str = "cp437") -> bytes:
+    """Receipt as a raw ESC/POS byte stream (code page PC437 by default)."""
+    width = paper_columns(paper_mm)
+    out = bytearray(_INIT + _CODEPAGE_PC437)
+    align = None
+    for style, text in _receipt_lines(formatted_data, width):
+        wanted = "center" if style in ("title", "center") else "left"
+        if wanted != align:
+            out += _ALIGN[wanted]
+            align = wanted
+        data = text.encode(encoding, errors="replace") + b"\n"
+        if style == "title":
+            out += _BOLD_ON + _DOUBLE_HEIGHT_ON + data + _NORMAL_SIZE + _BOLD_OFF
+        elif style == "bold":
+            out += _BOLD_ON + data + _BOLD_OFF
+        else:
+            out += data
+    if align != "left":
+        out += _ALIGN["left"]
+    if cut:
+        out += _FEED_AND_CUT
+    return bytes(out)
+
+
+def send_to_printer(data: bytes | str, target: str) -> int:
+    """Write a receipt to a printer device path (or a file). Returns the number of bytes written."""
+    payload = data.encode("utf-8") if isinstance(data, str) else data
+    with open(target, "wb", buffering=0) as fh:
+        fh.write(payload)
+    return len(payload)
@@ -1,10 +1,21 @@
 import os
+import threading
+import time
 
 import pytest
 
-from database.db_handler import get_db_connection
+from database.db_handler import get_db_connection, resolve_db_path
 from models.product import Product
-from utils.activity_log import fetch_recent, log_action
+from utils.activity_archive import apply_retention, list_archives, read_archive
+from utils.activity_log import (
+    ACTIVITY_PAGE_SIZE,
+    ActivityLogWriter,
+    activity_log_stats,
+    fetch_recent,
+    flush_activity_log,
+    iter_activity,
+    log_action,
+)
 from utils.session import set_current_user
 
 # Ensure test DB variable (db fixture will override path each test)
@@ -14,6 +25,7 @@ pytestmark = [pytest.mark.usefixtures("qapp")]
 
 
 def _count_activity(action_type: str) -> int:
+    flush_activity_log()
     conn = get_db_connection()
     cur = conn.cursor()
     cur.execute("SELECT COUNT(*) FROM activity_log WHERE action_type=?", (action_type,))
@@ -66,3 +78,124 @@ class TestActivityLog:
         md = MoreDropdown(user_role="Manager")
         items = [md.dropdown.itemText(i) for i in range(md.dropdown.count())]
         assert "Activity Log" not in items
+
+
+class TestActivityLogWriter:
+    def _row(self, n: int) -> tuple:
+        return ("2025-01-01 00:00:00", "tester", "BATCH_TEST", f"event {n}")
+
+    def test_writes_in_batches_and_flushes(self):
+        writer = ActivityLogWriter(batch_size=50, flush_interval=30)
+        path = resolve_db_path()
+        for n in range(120):
+            writer.submit(path, self._row(n))
+        assert writer.flush(timeout=10)
+        writer.shutdown()
+        assert _count_activity("BATCH_TEST") == 120
+        assert writer.stats["written"] == 120
+        assert writer.stats["batches"] <= 4
+        assert writer.stats["dropped"] == 0
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        writer = ActivityLogWriter(max_queue=5)
+        # Thread not started, so nothing drains the queue
+        writer._thread = threading.current_thread()
+        for n in range(8):
+            writer.submit(resolve_db_path(), self._row(n))
+        assert writer.queue_depth == 5
+        assert writer.stats["dropped"] == 3
+
+    def test_flush_and_shutdown_respect_timeout_on_full_queue(self):
+        writer = ActivityLogWriter(max_queue=2)
+        # A live thread that never drains: the writer stuck on a locked database
+        stuck = threading.current_thread()
+        writer._thread = stuck
+        for n in range(2):
+            writer.submit(resolve_db_path(), self._row(n))
+        start = time.monotonic()
+        assert writer.flush(timeout=0.2) is False
+        writer.shutdown(timeout=0.2)
+        assert time.monotonic() - start < 2
+        assert writer._thread is stuck  # still running; a later event must not start a second writer
+
+    def test_write_failure_is_counted_and_writer_survives(self, tmp_path):
+        writer = ActivityLogWriter(flush_interval=0.01)
+        writer.submit(str(tmp_path / "missing" / "nowhere.db"), self._row(0))
+        writer.submit(resolve_db_path(), self._row(1))
+        assert writer.flush(timeout=10)
+        writer.shutdown()
+        assert writer.stats["failed"] == 1
+        assert writer.stats["written"] == 1
+
+    def test_stats_report_queue_depth(self):
+        log_action("tester", "STATS_TEST")
+        assert flush_activity_log()
+        stats = activity_log_stats()
+        assert stats["queue_depth"] == 0
+        assert stats["written"] >= 1
+
+
+def _insert_rows(rows):
+    conn = get_db_connection()
+    conn.executemany("INSERT INTO activity_log(timestamp, username, action_type, details) VALUES(?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+class TestActivityBrowsing:
+    def test_iter_activity_pages_newest_first_with_filters(self):
+        _insert_rows(
+            [(f"2025-01-{day:02d} 10:00:00", "alice" if day % 2 else "bob", "BROWSE", str(day)) for day in range(1, 21)]
+        )
+        _insert_rows([("2025-01-05 12:00:00", None, "BROWSE", "system")])
+        rows = list(iter_activity(filters={"action_type": "BROWSE"}, page_size=3))
+        assert len(rows) == 21
+        assert [r[0] for r in rows] == sorted((r[0] for r in rows), reverse=True)
+
+        alice = list(iter_activity(filters={"username": "alice", "date_from": "2025-01-05", "date_to": "2025-01-10"}))
+        assert [r[4] for r in alice] == ["9", "7", "5"]
+        system = list(iter_activity(filters={"username": "(system)", "action_type": "BROWSE"}))
+        assert [r[2] for r in system] == ["(system)"]
+        assert list(iter_activity(filters={"date_from": "2030-01-01"})) == []
+
+        first = list(iter_activity(limit=2, filters={"action_type": "BROWSE"}))
+        rest = list(iter_activity(before_id=first[-1][0], filters={"action_type": "BROWSE"}))
+        assert len(first) + len(rest) == 21
+
+        with pytest.raises(ValueError):
+            list(iter_activity(filters={"details": "x"}))
+
+    def test_widget_fetches_more_rows_on_scroll(self):
+        from ui.more import ActivityLogWidget
+
+        _insert_rows([("2025-02-01 10:00:00", "carol", "SCROLL", str(n)) for n in range(ACTIVITY_PAGE_SIZE + 50)])
+        widget = ActivityLogWidget()
+        widget.action_filter.setText("scroll")
+        widget.load_logs()
+        assert widget.table.rowCount() == ACTIVITY_PAGE_SIZE
+        bar = widget.table.verticalScrollBar()
+        widget._on_scrolled(bar.maximum())
+        assert widget.table.rowCount() == ACTIVITY_PAGE_SIZE + 50
+        assert widget.table.item(0, 3).text() == str(ACTIVITY_PAGE_SIZE + 49)
+
+
+class TestActivityRetention:
+    def test_archives_old_rows_by_month_and_deletes_them(self, tmp_path):
+        _insert_rows([("2023-03-15 09:00:00", "dave", "OLD", "march"), ("2023-04-02 09:00:00", None, "OLD", "april")])
+        log_action("dave", "NEW", "recent")
+        result = apply_retention(max_age_days=365, max_rows=0, archive_dir=str(tmp_path), batch_size=1)
+        assert result.archived == 2
+        assert _count_activity("OLD") == 0
+        assert _count_activity("NEW") == 1
+        archives = list_archives(str(tmp_path))
+        assert [os.path.basename(p) for p in archives] == ["activity_2023-03.jsonl.gz", "activity_2023-04.jsonl.gz"]
+        rows = list(read_archive(archives[1]))
+        assert rows[0]["details"] == "april" and rows[0]["username"] is None
+
+    def test_row_limit_keeps_newest_rows(self, tmp_path):
+        before = [r[0] for r in iter_activity()]
+        _insert_rows([("2099-01-01 00:00:00", "erin", "LIMIT", str(n)) for n in range(10)])
+        result = apply_retention(max_age_days=0, max_rows=4, archive_dir=str(tmp_path))
+        assert result.archived == len(before) + 6
+        assert [r[4] for r in iter_activity()] == ["9", "8", "7", "6"]
+        assert apply_retention(max_age_days=0, max_rows=4, archive_dir=str(tmp_path)).archived == 0
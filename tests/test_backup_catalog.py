@@ -0,0 +1,99 @@
+import json
+import os
+from unittest.mock import patch
+
+from utils.backup import (
+    get_last_backup_time,
+    list_backups,
+    needs_backup,
+    perform_backup,
+    update_backup_directory,
+    update_retention_count,
+)
+from utils.backup_catalog import catalog_path, fill_missing_checksums, load_catalog, rebuild_catalog
+from utils.compact_backup import file_sha256, read_sidecar
+
+
+def _backups_dir(tmp_path):
+    folder = tmp_path / "backups"
+    folder.mkdir()
+    update_backup_directory(str(folder))
+    return str(folder)
+
+
+def test_backups_are_recorded_with_checksum(tmp_path):
+    folder = _backups_dir(tmp_path)
+    full = perform_backup(mode="full")
+    manifest = perform_backup(mode="incremental")
+    entries = load_catalog(folder)
+    assert [e.kind for e in entries] == ["full", "incremental"]
+    assert [e.path(folder) for e in entries] == [full, manifest]
+    assert entries[0].sha256 == file_sha256(full)
+    assert entries[0].size == os.path.getsize(full)
+    assert entries[1].name.startswith("incremental/manifests/")
+
+
+def test_queries_do_not_scan_the_folder(tmp_path):
+    folder = _backups_dir(tmp_path)
+    paths = [perform_backup(mode="full") for _ in range(3)]
+    with patch("os.listdir", side_effect=AssertionError("directory scanned")), patch("os.scandir") as scandir:
+        assert list_backups(folder) == paths
+        assert get_last_backup_time(folder) is not None
+        assert needs_backup(hours=24) is False
+        perform_backup(mode="full")
+    scandir.assert_not_called()
+
+
+def test_retention_uses_catalog_and_tolerates_missing_files(tmp_path):
+    folder = _backups_dir(tmp_path)
+    update_retention_count(2)
+    first, second = perform_backup(), perform_backup()
+    os.remove(first)  # deleted by hand; the catalog still lists it
+    third = perform_backup()
+    assert list_backups(folder) == [second, third]
+    assert len(load_catalog(folder)) == 2
+
+
+def test_invalid_catalog_is_rebuilt(tmp_path):
+    folder = _backups_dir(tmp_path)
+    first = perform_backup(mode="full")
+    with open(catalog_path(folder), "w", encoding="utf-8") as fh:
+        fh.write("{not json")
+    assert list_backups(folder) == [first]
+
+    # The newest entry vanishing (folder swapped or emptied) also forces a rescan
+    second = perform_backup(mode="full")
+    os.remove(second)
+    assert list_backups(folder) == [first]
+    with open(catalog_path(folder), encoding="utf-8") as fh:
+        assert len(json.load(fh)["entries"]) == 1
+
+
+def test_rebuild_picks_up_files_added_by_hand(tmp_path):
+    folder = _backups_dir(tmp_path)
+    first = perform_backup(mode="full")
+    copied = os.path.join(folder, "backup_19990101_000000_000000.db")
+    with open(first, "rb") as src, open(copied, "wb") as dst:
+        dst.write(src.read())
+    os.utime(copied, (946684800, 946684800))
+    assert list_backups(folder) == [first]
+    entries = rebuild_catalog(folder)
+    assert [e.path(folder) for e in entries] == [copied, first]
+    assert get_last_backup_time(folder) is not None
+
+
+def test_rebuild_does_not_hash_and_backup_fills_checksums(tmp_path, monkeypatch):
+    folder = _backups_dir(tmp_path)
+    full = perform_backup(mode="full")
+    monkeypatch.setenv("TRADIA_BACKUP_COMPRESSION", "gzip")
+    compact = perform_backup(mode="compact")
+    os.remove(catalog_path(folder))  # first run after upgrading: no catalog yet
+    with patch("utils.backup_catalog.file_sha256", side_effect=AssertionError("hashed during rebuild")):
+        entries = load_catalog(folder)
+    assert [e.path(folder) for e in entries] == [full, compact]
+    assert entries[0].sha256 is None
+    assert entries[1].sha256 == read_sidecar(compact)["compressed_sha256"]
+
+    assert fill_missing_checksums(folder) == 1
+    assert load_catalog(folder)[0].sha256 == file_sha256(full)
+    assert fill_missing_checksums(folder) == 0
@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from database.db_handler import get_db_connection, resolve_db_path
+from utils.app_settings import subscribe_settings
+from utils.backup import BackupCancelled, list_backups, perform_backup, update_backup_directory
+from utils.incremental_backup import copy_database, list_manifests, restore_incremental_backup
+
+
+def _fill(rows: int):
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO products(name, price, stock_quantity) VALUES(?, ?, ?)",
+        [(f"Item {n:06d} " + "y" * 300, 2.0, n) for n in range(rows)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_copy_reports_progress_and_cancels_between_steps(tmp_path):
+    _fill(500)
+    seen = []
+    cancel = threading.Event()
+
+    def progress(done, total):
+        seen.append((done, total))
+        if len(seen) == 3:
+            cancel.set()
+
+    with pytest.raises(BackupCancelled):
+        copy_database(resolve_db_path(), str(tmp_path / "copy.db"), pages=5, progress=progress, cancel_event=cancel)
+    assert len(seen) == 3
+    assert seen[0][0] < seen[1][0] < seen[2][0] < seen[2][1]
+
+
+def test_cancelled_full_backup_leaves_no_file(tmp_path):
+    update_backup_directory(str(tmp_path))
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(BackupCancelled):
+        perform_backup(mode="full", cancel_event=cancel)
+    assert list_backups(str(tmp_path)) == []
+
+
+def test_incremental_backup_keeps_database_writable(tmp_path):
+    _fill(2000)
+    update_backup_directory(str(tmp_path))
+    writes = []
+
+    def progress(done, total):
+        # Another connection commits while the snapshot is being read
+        if not writes:
+            conn = sqlite3.connect(resolve_db_path(), timeout=1)
+            try:
+                conn.execute(
+                    "INSERT INTO customers(name, phone_number, address) VALUES('Mid Backup', '0200000000', '')"
+                )
+                conn.commit()
+            finally:
+                conn.close()
+            writes.append(done)
+
+    manifest = perform_backup(mode="incremental", progress=progress)
+    assert writes
+    restored = str(tmp_path / "restored.db")
+    restore_incremental_backup(manifest, restored)
+    conn = sqlite3.connect(restored)
+    try:
+        # The snapshot predates the write made during the backup
+        assert conn.execute("SELECT COUNT(*) FROM customers WHERE name = 'Mid Backup'").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 2000
+    finally:
+        conn.close()
+    conn = get_db_connection()
+    assert conn.execute("SELECT COUNT(*) FROM customers WHERE name = 'Mid Backup'").fetchone()[0] == 1
+    conn.close()
+    assert list_manifests(str(tmp_path)) == [manifest]
+
+
+@pytest.mark.usefixtures("qapp")
+def test_backup_job_runs_off_the_gui_thread(tmp_path):
+    from ui.backup_job import BackupJob
+
+    update_backup_directory(str(tmp_path))
+    job = BackupJob(throttle=0.0)
+    finished, progress = [], []
+    job.finished.connect(finished.append)
+    job.progress.connect(lambda done, total: progress.append((done, total)))
+    job.start()
+    assert job.is_running()
+    assert job.wait(10)
+    assert finished == [job.result_path]
+    assert os.path.exists(job.result_path)
+    assert progress and progress[-1][0] == progress[-1][1]
+
+
+@pytest.mark.usefixtures("qapp")
+class TestBackupOnExit:
+    def _window(self):
+        from PyQt6.QtWidgets import QWidget
+
+        with (
+            patch("ui.main_window.ProductView", side_effect=lambda *a, **k: QWidget()),
+            patch("ui.main_window.CustomerView", side_effect=lambda *a, **k: QWidget()),
+            patch("ui.main_window.InvoiceView", side_effect=lambda *a, **k: QWidget()),
+            patch("ui.main_window.ReceiptView", side_effect=lambda *a, **k: QWidget()),
+        ):
+            from ui.main_window import MainWindow
+
+            return MainWindow("testuser", "Admin")
+
+    def test_small_backup_finishes_before_exit(self, tmp_path):
+        update_backup_directory(str(tmp_path))
+        window = self._window()
+        with patch("ui.main_window.launch_detached_backup") as launch:
+            window._backup_on_exit()
+        launch.assert_not_called()
+        assert len(list_backups(str(tmp_path))) == 1
+
+    def test_slow_backup_is_handed_off(self, tmp_path, monkeypatch):
+        update_backup_directory(str(tmp_path))
+        monkeypatch.setattr("ui.main_window.CLOSE_BACKUP_WAIT_S", 0)
+        window = self._window()
+        with patch("ui.main_window.launch_detached_backup") as launch:
+            window._backup_on_exit()
+            assert window._exit_backup_job.wait(10)
+        launch.assert_called_once()
+
+    def test_backup_still_running_after_cancel_is_not_handed_off(self, tmp_path, monkeypatch):
+        update_backup_directory(str(tmp_path))
+        monkeypatch.setattr("ui.main_window.CLOSE_BACKUP_WAIT_S", 0)
+        monkeypatch.setattr("ui.main_window.CLOSE_BACKUP_CANCEL_WAIT_S", 0)
+        window = self._window()
+        with patch("ui.main_window.launch_detached_backup") as launch:
+            window._backup_on_exit()
+        launch.assert_not_called()
+        assert not window._exit_backup_job.is_running()
+
+    def test_activity_retention_runs_off_the_gui_thread(self):
+        window = self._window()
+        threads = []
+        with patch("ui.main_window.apply_retention", side_effect=lambda: threads.append(threading.current_thread())):
+            window._start_activity_retention()
+            window._retention_thread.join(10)
+        assert len(threads) == 1 and threads[0] is not threading.main_thread()
+
+
+@pytest.mark.usefixtures("qapp")
+def test_restore_job_notifies_settings_on_the_gui_thread(tmp_path):
+    from ui.backup_job import RestoreJob
+
+    update_backup_directory(str(tmp_path))
+    backup = perform_backup(mode="full")
+    threads = []
+    unsubscribe = subscribe_settings(lambda _settings: threads.append(threading.current_thread()))
+    try:
+        job = RestoreJob()
+        finished = []
+        job.finished.connect(finished.append)
+        job.start(backup)
+        assert job.is_running()
+        assert job.wait(30)
+    finally:
+        unsubscribe()
+    assert finished == [job.result] and job.error is None
+    assert threads == [threading.main_thread()]
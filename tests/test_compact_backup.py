@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from database.db_handler import get_db_connection, resolve_db_path
+from utils.backup import (
+    BackupCancelled,
+    get_last_backup_time,
+    list_backups,
+    perform_backup,
+    restore_backup,
+    update_backup_directory,
+)
+from utils.compact_backup import (
+    CODECS,
+    create_compact_backup,
+    read_sidecar,
+    sidecar_path,
+    verify_compact_backup,
+)
+
+
+def _fill_products(count: int):
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO products(name, price, stock_quantity) VALUES(?, ?, ?)",
+        [(f"Product {n:06d} " + "z" * 200, 3.0, n) for n in range(count)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _product_count(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_compact_backup_round_trip(tmp_path, codec):
+    _fill_products(2000)
+    backups = tmp_path / "backups"
+    backups.mkdir()
+    result = create_compact_backup(resolve_db_path(), str(backups / "backup_x.db"), codec=codec)
+    assert result.path.endswith(CODECS[codec][0])
+    # Only the backup and its sidecar are left behind
+    assert sorted(os.listdir(backups)) == sorted(os.path.basename(p) for p in (result.path, sidecar_path(result.path)))
+    assert result.ratio > 2
+    sidecar = read_sidecar(result.path)
+    assert sidecar["codec"] == codec
+    assert sidecar["check_result"] == "ok"
+    assert sidecar["compressed_size"] == os.path.getsize(result.path)
+    assert verify_compact_backup(result.path) == sidecar
+
+    restored = str(tmp_path / "restored.db")
+    restore_backup(result.path, restored)
+    assert _product_count(restored) == 2000
+    with pytest.raises(FileExistsError):
+        restore_backup(result.path, restored)
+
+
+def test_corrupt_backup_is_refused(tmp_path):
+    _fill_products(200)
+    backups = tmp_path / "backups"
+    backups.mkdir()
+    result = create_compact_backup(resolve_db_path(), str(backups / "backup_x.db"), codec="gzip")
+    with open(result.path, "r+b") as fh:
+        fh.seek(os.path.getsize(result.path) // 2)
+        fh.write(b"\x00\xff\x00\xff")
+    target = str(tmp_path / "restored.db")
+    with pytest.raises(ValueError):
+        restore_backup(result.path, target)
+    assert not os.path.exists(target)
+
+
+def test_cancelled_compact_backup_leaves_nothing(tmp_path):
+    cancel = threading.Event()
+    cancel.set()
+    backups = tmp_path / "backups"
+    backups.mkdir()
+    with pytest.raises(BackupCancelled):
+        create_compact_backup(resolve_db_path(), str(backups / "backup_x.db"), cancel_event=cancel)
+    assert os.listdir(backups) == []
+
+
+def test_perform_backup_compact_mode_and_retention(tmp_path, monkeypatch):
+    update_backup_directory(str(tmp_path))
+    monkeypatch.setenv("TRADIA_BACKUP_MODE", "compact")
+    monkeypatch.setenv("TRADIA_BACKUP_COMPRESSION", "gzip")
+    paths = [perform_backup(retention=2) for _ in range(3)]
+    assert all(p.endswith(".db.gz") for p in paths)
+    assert list_backups(str(tmp_path)) == paths[1:]
+    assert not os.path.exists(sidecar_path(paths[0]))
+    assert all(os.path.exists(sidecar_path(p)) for p in paths[1:])
+    assert get_last_backup_time(str(tmp_path)) is not None
+
+
+def test_restore_plain_backup(tmp_path):
+    _fill_products(50)
+    update_backup_directory(str(tmp_path))
+    path = perform_backup(mode="full")
+    restored = str(tmp_path / "restored.db")
+    assert restore_backup(path, restored) == restored
+    assert _product_count(restored) == 50
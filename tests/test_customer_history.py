@@ -39,12 +39,12 @@ def test_view_history_opens_dialog(qapp):
 
     # Select the customer row in the table
     selected_row = None
-    for r in range(view.customer_table.rowCount()):
-        if view.customer_table.item(r, 1).text() == "Alice":
+    for r in range(view.customer_proxy.rowCount()):
+        if view.customer_proxy.index(r, 1).data() == "Alice":
             selected_row = r
             break
     assert selected_row is not None
-    view.customer_table.setCurrentCell(selected_row, 0)
+    view.customer_table.selectRow(selected_row)
 
     # Patch the dialog to verify it is invoked
     opened = {"called": False, "cid": None, "cname": None}
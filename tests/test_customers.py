@@ -1,3 +1,5 @@
+import pytest
+
 from models.customer import Customer
 
 
@@ -28,3 +30,37 @@ class TestCustomerModel:
         Customer.delete_customer(customer_id)
         remaining_customers = Customer.get_all_customers()
         assert len(remaining_customers) == 0
+
+    def test_indexed_lookups(self):
+        alice = Customer.add_customer("Alice Mensah", "0123456789", "Accra")
+        Customer.add_customer("Alice", "0555555555", "Tema")
+        Customer.add_customer("Bob", "9876543210", "Kumasi")
+        assert Customer.find_by_name_and_phone("alice mensah", "0123456789").customer_id == alice
+        assert Customer.find_by_name_and_phone("Alice Mensah", "0555555555") is None
+        assert [c.name for c in Customer.find_by_name_prefix("ali", limit=5)] == ["Alice", "Alice Mensah"]
+        assert Customer.find_by_name_prefix("  ") == []
+        # Display text: composite, then name prefix, then the search index (phone here)
+        assert Customer.find_by_display_text("Alice Mensah - 0123456789").customer_id == alice
+        assert Customer.find_by_display_text("ali").name == "Alice"
+        assert Customer.find_by_display_text("98765").name == "Bob"
+        assert Customer.find_by_display_text("Zed") is None
+
+
+@pytest.mark.usefixtures("qapp")
+def test_save_invoice_uses_selected_customer_id(monkeypatch):
+    from ui import invoice_view
+    from ui.invoice_view import InvoiceView
+
+    Customer.add_customer("Ama", "0240000000", "Tema")
+    ama_id = Customer.add_customer("Ama", "0241111111", "Accra")
+    view = InvoiceView()
+    view.customer_dropdown.setCurrentIndex(view.customer_dropdown.findData(ama_id))
+    view.items = [{"product_id": 1, "quantity": 1, "unit_price": 1.0}]
+
+    created = []
+    monkeypatch.setattr(invoice_view.Customer, "get_all_customers", lambda: pytest.fail("full customer scan"))
+    monkeypatch.setattr(invoice_view.Invoice, "create_invoice", lambda cid, *a: created.append(cid) or 1)
+    for name in ("information", "warning", "critical"):
+        monkeypatch.setattr(invoice_view.QMessageBox, name, lambda *a, **k: None)
+    view.save_invoice()
+    assert created == [ama_id]
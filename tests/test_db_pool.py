@@ -0,0 +1,65 @@
+import os
+
+from database.db_handler import get_connection_pool, get_db_connection, pooled_connection
+
+
+def test_closed_connection_is_reused():
+    conn = get_db_connection()
+    conn.close()
+    again = get_db_connection()
+    assert again is conn
+    # Still usable and foreign keys remain enforced
+    assert again.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    again.close()
+
+
+def test_nested_checkouts_get_distinct_connections():
+    outer = get_db_connection()
+    inner = get_db_connection()
+    assert outer is not inner
+    inner.close()
+    outer.close()
+
+
+def test_uncommitted_work_is_rolled_back_on_release():
+    conn = get_db_connection()
+    conn.execute("INSERT INTO products (name, price, stock_quantity) VALUES ('Tmp', 1.0, 1)")
+    assert conn.in_transaction
+    conn.close()
+    with pooled_connection() as conn2:
+        assert not conn2.in_transaction
+        assert conn2.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 0
+
+
+def test_double_close_does_not_duplicate_idle_entries():
+    pool = get_connection_pool()
+    conn = get_db_connection()
+    conn.close()
+    idle = pool.idle_count()
+    conn.close()
+    assert pool.idle_count() == idle
+
+
+def test_path_change_drops_old_connections(tmp_path, monkeypatch):
+    conn = get_db_connection()
+    conn.close()
+    old = conn
+    monkeypatch.setenv("WMS_DB_NAME", str(tmp_path / "other.db"))
+    new = get_db_connection()
+    assert new is not old
+    path = new.execute("PRAGMA database_list").fetchone()[2]
+    assert os.path.basename(path) == "other.db"
+    new.close()
+
+
+def test_pool_can_be_disabled():
+    pool = get_connection_pool()
+    pool.enabled = False
+    try:
+        conn = get_db_connection()
+        conn.close()
+        again = get_db_connection()
+        assert again is not conn
+        again.close()
+    finally:
+        pool.enabled = True
@@ -0,0 +1,60 @@
+from database.db_handler import (
+    get_db_connection,
+    initialize_database,
+    run_checkpoint_policy,
+    set_checkpoint_policy,
+)
+from database.pragmas import CheckpointPolicy, PragmaProfile, is_network_path, wal_size
+
+
+def _pragma(name):
+    conn = get_db_connection()
+    try:
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_default_profile_enables_wal_and_session_settings():
+    assert _pragma("journal_mode") == "wal"
+    assert _pragma("synchronous") == 1  # NORMAL
+    assert _pragma("temp_store") == 2  # MEMORY
+    assert _pragma("busy_timeout") == 10_000
+    assert _pragma("foreign_keys") == 1
+
+
+def test_journal_mode_env_opt_out(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADIA_DB_JOURNAL_MODE", "DELETE")
+    monkeypatch.setenv("WMS_DB_NAME", str(tmp_path / "share.db"))
+    initialize_database()
+    assert _pragma("journal_mode") == "delete"
+    assert _pragma("synchronous") == 2  # FULL without WAL
+    assert _pragma("mmap_size") == 0
+
+
+def test_network_paths_get_safe_profile():
+    assert is_network_path(r"\\server\share\wholesale.db")
+    assert not is_network_path(":memory:")
+    safe = PragmaProfile().for_path("//server/share/wholesale.db")
+    assert safe.journal_mode == "DELETE"
+    assert safe.mmap_size == 0
+
+
+def test_checkpoint_policy_truncates_wal(db):
+    conn = get_db_connection()
+    path = conn.execute("PRAGMA database_list").fetchone()[2]
+    conn.executemany(
+        "INSERT INTO products (name, price, stock_quantity) VALUES (?, ?, ?)",
+        [(f"P{i}", 1.0, 1) for i in range(200)],
+    )
+    conn.commit()
+    conn.close()
+    assert wal_size(path) > 0
+    set_checkpoint_policy(CheckpointPolicy(max_wal_bytes=0))
+    try:
+        assert run_checkpoint_policy() is True
+    finally:
+        set_checkpoint_policy(CheckpointPolicy())
+    assert wal_size(path) == 0
+    # Below the limit nothing happens
+    assert run_checkpoint_policy() is False
@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import zlib
+
+import pytest
+
+from database.db_handler import get_db_connection, resolve_db_path
+from utils.backup import _enforce_retention, get_last_backup_time, perform_backup, update_backup_directory
+from utils.incremental_backup import (
+    ChunkStore,
+    create_incremental_backup,
+    incremental_root,
+    list_manifests,
+    load_manifest,
+    restore_incremental_backup,
+)
+
+
+def _fill_products(count: int, start: int = 0):
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO products(name, price, stock_quantity) VALUES(?, ?, ?)",
+        [(f"Product {n:06d} " + "x" * 200, 1.5, n) for n in range(start, start + count)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _product_names(db_path: str) -> list[str]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return [r[0] for r in conn.execute("SELECT name FROM products ORDER BY product_id")]
+    finally:
+        conn.close()
+
+
+def test_second_backup_stores_only_changed_chunks(tmp_path):
+    _fill_products(3000)
+    backups = str(tmp_path / "backups")
+    first = create_incremental_backup(resolve_db_path(), backups)
+    assert first.chunks_new == len(set(load_manifest(first.manifest_path)["chunks"]))
+    assert first.chunks_total > 4
+
+    conn = get_db_connection()
+    conn.execute("UPDATE products SET price = 99.0 WHERE product_id = 1")
+    conn.commit()
+    conn.close()
+    second = create_incremental_backup(resolve_db_path(), backups)
+    assert 0 < second.chunks_new < first.chunks_total // 2
+    assert second.bytes_written < first.bytes_written
+
+    old_copy = str(tmp_path / "old.db")
+    new_copy = str(tmp_path / "new.db")
+    restore_incremental_backup(first.manifest_path, old_copy)
+    restore_incremental_backup(second.manifest_path, new_copy)
+    for path, price in ((old_copy, 1.5), (new_copy, 99.0)):
+        conn = sqlite3.connect(path)
+        try:
+            assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+            assert conn.execute("SELECT price FROM products WHERE product_id = 1").fetchone()[0] == price
+        finally:
+            conn.close()
+    assert _product_names(new_copy) == _product_names(resolve_db_path())
+    with pytest.raises(FileExistsError):
+        restore_incremental_backup(first.manifest_path, new_copy)
+
+
+def test_retention_garbage_collects_unreferenced_chunks(tmp_path):
+    backups = str(tmp_path / "backups")
+    _fill_products(500)
+    create_incremental_backup(resolve_db_path(), backups)
+    _fill_products(500, start=500)
+    create_incremental_backup(resolve_db_path(), backups)
+    _fill_products(500, start=1000)
+    latest = create_incremental_backup(resolve_db_path(), backups)
+    store = ChunkStore(incremental_root(backups))
+    before = set(store.digests())
+
+    _enforce_retention(backups, 1, incremental=True)
+    assert list_manifests(backups) == [latest.manifest_path]
+    assert set(store.digests()) == set(load_manifest(latest.manifest_path)["chunks"])
+    assert len(set(store.digests())) < len(before)
+
+    restored = str(tmp_path / "restored.db")
+    restore_incremental_backup(latest.manifest_path, restored)
+    assert len(_product_names(restored)) == 1500
+
+
+def test_restore_rejects_corrupt_chunk(tmp_path):
+    backups = str(tmp_path / "backups")
+    result = create_incremental_backup(resolve_db_path(), backups)
+    store = ChunkStore(incremental_root(backups))
+    digest = load_manifest(result.manifest_path)["chunks"][0]
+    with open(store.path_for(digest), "wb") as fh:
+        fh.write(zlib.compress(b"not the page you stored"))
+    target = str(tmp_path / "restored.db")
+    with pytest.raises(ValueError):
+        restore_incremental_backup(result.manifest_path, target)
+    assert not os.path.exists(target)
+
+
+def test_perform_backup_incremental_mode(tmp_path, monkeypatch):
+    update_backup_directory(str(tmp_path))
+    monkeypatch.setenv("TRADIA_BACKUP_MODE", "incremental")
+    assert get_last_backup_time(str(tmp_path)) is None
+    path = perform_backup()
+    assert path.endswith(".json") and list_manifests(str(tmp_path)) == [path]
+    assert get_last_backup_time(str(tmp_path)) is not None
+    with pytest.raises(ValueError):
+        perform_backup(mode="differential")
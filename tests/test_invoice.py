@@ -137,3 +137,175 @@ def test_create_invoice_duplicate_lines_insufficient_stock(seed_invoice_env):
     remaining = cur.fetchone()[0]
     conn.close()
     assert remaining == 100
+
+
+def test_create_invoices_bulk_reports_failures_without_aborting(seed_invoice_env):
+    customer_id, product_ids = seed_invoice_env
+    soap, brush = product_ids
+    batch = [
+        {"customer_id": customer_id, "items": [{"product_id": soap, "quantity": 60, "unit_price": 2.5}]},
+        # Would exceed remaining Soap stock after the first invoice (100 - 60 = 40)
+        {"customer_id": customer_id, "items": [{"product_id": soap, "quantity": 50, "unit_price": 2.5}]},
+        {"customer_id": 999999, "items": [{"product_id": brush, "quantity": 1, "unit_price": 1.0}]},
+        {"customer_id": customer_id, "items": [{"product_id": 999999, "quantity": 1, "unit_price": 1.0}]},
+        {"customer_id": customer_id, "items": []},
+        {
+            "customer_id": customer_id,
+            "items": [
+                {"product_id": soap, "quantity": 40, "unit_price": 2.5},
+                {"product_id": brush, "quantity": 5, "unit_price": 1.0},
+            ],
+            "discount": 1.0,
+            "tax": 0.5,
+        },
+    ]
+    result = Invoice.create_invoices_bulk(batch)
+    assert result.created_count == 2
+    assert sorted(result.errors) == [1, 2, 3, 4]
+    assert "Insufficient stock" in result.errors[1]
+    assert result.invoice_ids[1] is None
+    assert isinstance(result.invoice_ids[0], int) and isinstance(result.invoice_ids[5], int)
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT stock_quantity FROM products WHERE product_id=?", (soap,))
+    assert cur.fetchone()[0] == 0
+    cur.execute("SELECT stock_quantity FROM products WHERE product_id=?", (brush,))
+    assert cur.fetchone()[0] == 45
+    cur.execute("SELECT total_amount FROM invoices WHERE invoice_id=?", (result.invoice_ids[5],))
+    assert cur.fetchone()[0] == 40 * 2.5 + 5 * 1.0 - 1.0 + 0.5
+    conn.close()
+    invoice = Invoice.get_invoice_by_id(result.invoice_ids[5])
+    assert len(invoice["items"]) == 2
+
+
+def test_create_invoice_statement_count_is_set_based(monkeypatch):
+    Customer.add_customer("Bulk", "0123456789", "Town")
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO products (name, price, stock_quantity) VALUES (?, ?, ?)",
+        [(f"P{i}", 1.0, 100) for i in range(50)],
+    )
+    conn.commit()
+    customer_id = conn.execute("SELECT customer_id FROM customers").fetchone()[0]
+    product_ids = [r[0] for r in conn.execute("SELECT product_id FROM products")]
+    conn.close()
+    # 100 lines, every product appears twice
+    items = [{"product_id": pid, "quantity": 1, "unit_price": 1.0} for pid in product_ids * 2]
+
+    statements = []
+    traced = get_db_connection()
+    traced.set_trace_callback(statements.append)
+    monkeypatch.setattr("models.invoice.get_db_connection", lambda: traced)
+    try:
+        Invoice.create_invoice(customer_id, items)
+    finally:
+        traced.set_trace_callback(None)
+    # Previously: one SELECT per product plus an INSERT and an UPDATE per line (~250 statements).
+    # Each trigger a statement fires is traced again with that statement's text; count it once.
+    issued = [sql for i, sql in enumerate(statements) if i == 0 or sql != statements[i - 1]]
+    assert len(issued) < 125
+    conn = get_db_connection()
+    assert conn.execute("SELECT MIN(stock_quantity), MAX(stock_quantity) FROM products").fetchone() == (98, 98)
+    assert conn.execute("SELECT COUNT(*) FROM invoice_items").fetchone()[0] == 100
+    conn.close()
+
+
+def test_update_invoice_insufficient_stock_rolls_back(seed_invoice_env):
+    customer_id, product_ids = seed_invoice_env
+    pid = product_ids[0]
+    invoice_id = Invoice.create_invoice(customer_id, [{"product_id": pid, "quantity": 10, "unit_price": 2.5}])
+    with pytest.raises(ValueError, match="Available: 100, requested: 150"):
+        Invoice.update_invoice(invoice_id, customer_id, [{"product_id": pid, "quantity": 150, "unit_price": 2.5}])
+    conn = get_db_connection()
+    assert conn.execute("SELECT stock_quantity FROM products WHERE product_id=?", (pid,)).fetchone()[0] == 90
+    assert conn.execute("SELECT SUM(quantity) FROM invoice_items WHERE invoice_id=?", (invoice_id,)).fetchone()[0] == 10
+    conn.close()
+
+
+def test_delete_invoice_returns_restored_quantities(seed_invoice_env):
+    customer_id, product_ids = seed_invoice_env
+    soap, brush = product_ids
+    items = [
+        {"product_id": soap, "quantity": 3, "unit_price": 2.5},
+        {"product_id": brush, "quantity": 2, "unit_price": 1.0},
+        {"product_id": soap, "quantity": 4, "unit_price": 2.5},
+    ]
+    invoice_id = Invoice.create_invoice(customer_id, items)
+    restored = Invoice.delete_invoice(invoice_id)
+    assert restored == {soap: 7, brush: 2}
+    assert Invoice.get_invoice_by_id(invoice_id) is None
+    conn = get_db_connection()
+    rows = dict(conn.execute("SELECT product_id, stock_quantity FROM products").fetchall())
+    conn.close()
+    assert rows == {soap: 100, brush: 50}
+
+
+def test_update_invoice_only_touches_changed_rows(seed_invoice_env):
+    customer_id, product_ids = seed_invoice_env
+    soap, brush = product_ids
+    items = [
+        {"product_id": soap, "quantity": 5, "unit_price": 2.5},
+        {"product_id": brush, "quantity": 4, "unit_price": 1.0},
+    ]
+    invoice_id = Invoice.create_invoice(customer_id, items)
+    conn = get_db_connection()
+    before = conn.execute(
+        "SELECT item_id, product_id FROM invoice_items WHERE invoice_id=? ORDER BY item_id", (invoice_id,)
+    ).fetchall()
+    conn.close()
+
+    # Fix one line: Brush 4 -> 6
+    Invoice.update_invoice(
+        invoice_id,
+        customer_id,
+        [
+            {"product_id": soap, "quantity": 5, "unit_price": 2.5},
+            {"product_id": brush, "quantity": 6, "unit_price": 1.0},
+        ],
+    )
+    conn = get_db_connection()
+    after = conn.execute(
+        "SELECT item_id, product_id, quantity FROM invoice_items WHERE invoice_id=? ORDER BY item_id", (invoice_id,)
+    ).fetchall()
+    stock = dict(conn.execute("SELECT product_id, stock_quantity FROM products").fetchall())
+    total = conn.execute("SELECT total_amount FROM invoices WHERE invoice_id=?", (invoice_id,)).fetchone()[0]
+    conn.close()
+    # Same rows kept (no delete/reinsert), only the quantity changed
+    assert [(r[0], r[1]) for r in after] == before
+    assert [r[2] for r in after] == [5, 6]
+    # Lines keep their entry order on screen and on the receipt
+    assert [it["product_name"] for it in Invoice.get_invoice_by_id(invoice_id)["items"]] == ["Soap", "Brush"]
+    assert stock == {soap: 95, brush: 44}
+    assert total == 5 * 2.5 + 6 * 1.0
+
+    # Drop Soap entirely: stock comes back, its row is deleted
+    Invoice.update_invoice(invoice_id, customer_id, [{"product_id": brush, "quantity": 6, "unit_price": 1.0}])
+    conn = get_db_connection()
+    stock = dict(conn.execute("SELECT product_id, stock_quantity FROM products").fetchall())
+    rows = conn.execute("SELECT item_id FROM invoice_items WHERE invoice_id=?", (invoice_id,)).fetchall()
+    conn.close()
+    assert stock == {soap: 100, brush: 44}
+    assert rows == [(before[1][0],)]
+
+
+def test_iter_invoices_keyset_pages_and_filters(seed_invoice_env):
+    customer_id, product_ids = seed_invoice_env
+    bob_id = Customer.add_customer("Bob", "0987654321", "Kumasi")
+    item = [{"product_id": product_ids[0], "quantity": 1, "unit_price": 2.5}]
+    ids = [Invoice.create_invoice(bob_id if i % 2 else customer_id, item) for i in range(7)]
+
+    # Newest first, paged by id; small page_size exercises the keyset continuation
+    assert [r.invoice_id for r in Invoice.iter_invoices(page_size=3)] == ids[::-1]
+    assert [r.invoice_id for r in Invoice.iter_invoices(after_id=ids[4], limit=2, page_size=1)] == [ids[3], ids[2]]
+    first = next(Invoice.iter_invoices())
+    assert (first.customer_name, first.customer_id, first.total_amount) == ("Alice", customer_id, 2.5)
+
+    assert [r.invoice_id for r in Invoice.iter_invoices(filters={"customer": "bo"})] == [ids[5], ids[3], ids[1]]
+    assert [r.invoice_id for r in Invoice.iter_invoices(filters={"customer_id": customer_id}, limit=1)] == [ids[6]]
+    assert [r.invoice_id for r in Invoice.iter_invoices(filters={"invoice_id": ids[2]})] == [ids[2]]
+    today = first.invoice_date[:10]
+    assert len(list(Invoice.iter_invoices(filters={"date_from": today, "date_to": today}))) == 7
+    assert list(Invoice.iter_invoices(filters={"date_to": "2000-01-01"})) == []
+    with pytest.raises(ValueError):
+        list(Invoice.iter_invoices(filters={"colour": "red"}))
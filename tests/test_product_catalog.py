@@ -0,0 +1,93 @@
+from database.db_handler import get_db_connection
+from models.customer import Customer
+from models.invoice import Invoice
+from models.product import Product, get_product_catalog
+from utils.activity_log import flush_activity_log, log_action
+
+
+def _stats():
+    return dict(get_product_catalog().stats)
+
+
+def test_repeated_reads_are_served_from_cache():
+    pid = Product.add_product("Soap", 2.5, 100)
+    Product.get_all_products()
+    before = _stats()
+    assert Product.get_product_by_id(pid).name == "Soap"
+    assert [p.name for p in Product.get_all_products()] == ["Soap"]
+    after = _stats()
+    assert after["hits"] - before["hits"] == 2
+    assert after["misses"] == before["misses"]
+
+
+def test_product_writes_invalidate():
+    pid = Product.add_product("Soap", 2.5, 100)
+    assert Product.get_product_by_id(pid).price == 2.5
+    Product.update_product(pid, "Soap", 3.0, 90)
+    updated = Product.get_product_by_id(pid)
+    assert (updated.price, updated.stock_quantity) == (3.0, 90)
+    Product.delete_product(pid)
+    assert Product.get_product_by_id(pid) is None
+
+
+def test_writes_from_other_code_paths_are_detected():
+    pid = Product.add_product("Soap", 2.5, 100)
+    version = get_product_catalog().current_version()
+    assert get_product_catalog().current_version() == version
+
+    # Invoices move stock without going through Product
+    Customer.add_customer("Alice", "0241234567", "Accra")
+    cid = Customer.get_all_customers()[0].customer_id
+    Invoice.create_invoice(cid, [{"product_id": pid, "quantity": 4, "unit_price": 2.5}])
+    assert Product.get_product_by_id(pid).stock_quantity == 96
+
+    # Raw SQL on a separate connection
+    conn = get_db_connection()
+    conn.execute("UPDATE products SET stock_quantity = 5 WHERE product_id = ?", (pid,))
+    conn.commit()
+    conn.close()
+    assert [p.product_id for p in Product.get_products_below_stock(5)] == [pid]
+    assert get_product_catalog().current_version() > version
+
+
+def test_commits_to_other_tables_do_not_reload():
+    Product.add_product("Soap", 2.5, 100)
+    catalog = get_product_catalog()
+    version = catalog.current_version()
+    before = _stats()
+    # Settings, customers, activity log batches: data_version moves, products do not
+    Customer.add_customer("Alice", "0241234567", "Accra")
+    log_action("admin", "LOGIN", "")
+    flush_activity_log()
+    assert catalog.current_version() == version
+    after = _stats()
+    assert after["misses"] == before["misses"]
+    assert after["revalidations"] > before["revalidations"]
+
+
+def test_stale_get_is_a_single_row_query(monkeypatch):
+    pid = Product.add_product("Soap", 2.5, 100)
+    Product.add_product("Brush", 1.0, 50)
+    catalog = get_product_catalog()
+    version = catalog.current_version()
+    conn = get_db_connection()
+    conn.execute("UPDATE products SET stock_quantity = 7 WHERE product_id = ?", (pid,))
+    conn.commit()
+    conn.close()
+
+    reloads = []
+    monkeypatch.setattr(catalog, "_reload", lambda: reloads.append(1))
+    assert Product.get_product_by_id(pid).stock_quantity == 7
+    assert reloads == []
+    monkeypatch.undo()
+
+    # The next full read picks the change up; rewriting a row with its current
+    # values reloads but keeps the version, so views skip rebuilding
+    assert catalog.current_version() == version + 1
+    conn = get_db_connection()
+    conn.execute("UPDATE products SET stock_quantity = 7 WHERE product_id = ?", (pid,))
+    conn.commit()
+    conn.close()
+    misses = _stats()["misses"]
+    assert catalog.current_version() == version + 1
+    assert _stats()["misses"] == misses + 1
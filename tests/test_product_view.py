@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import pytest
+
+from models.product import Product
+from ui.product_table_model import FETCH_CHUNK, ProductTableModel
+from ui.product_view import ProductView
+
+pytestmark = [pytest.mark.usefixtures("qapp")]
+
+
+def _rows(n):
+    return [(i, f"Item {i:05d}", 1.5 * i, i % 7) for i in range(1, n + 1)]
+
+
+class TestProductTableModel:
+    def test_rows_are_fetched_in_chunks(self):
+        model = ProductTableModel()
+        model.set_products(_rows(FETCH_CHUNK * 3 + 5))
+        assert model.total_count() == FETCH_CHUNK * 3 + 5
+        assert model.rowCount() == FETCH_CHUNK
+        assert model.canFetchMore()
+        model.fetchMore()
+        assert model.rowCount() == FETCH_CHUNK * 2
+        # Looking up a row beyond the fetched range exposes it
+        assert model.row_for_id(FETCH_CHUNK * 3 + 5) == FETCH_CHUNK * 3 + 4
+        assert not model.canFetchMore()
+
+    def test_incremental_updates_keep_index_consistent(self):
+        model = ProductTableModel()
+        model.set_products(_rows(10))
+        assert model.data(model.index(2, 2)) == "4.50"
+        model.update_product(3, "Renamed", 1234.5, 9)
+        assert model.data(model.index(2, 1)) == "Renamed"
+        assert model.data(model.index(2, 2)) == "1,234.50"
+        model.remove_product(3)
+        assert model.rowCount() == 9
+        assert model.row_for_id(3) == -1
+        assert model.row_for_id(4) == 2
+        row = model.add_product(99, "New", 2.0, 1)
+        assert model.row_for_id(99) == row == 9
+        assert model.product_at(row) == (99, "New", 2.0, 1)
+
+
+class TestProductView:
+    @patch("ui.product_view.QMessageBox")
+    def test_add_update_delete_through_model(self, mock_msg):
+        Product.add_product("Soap", 2.5, 100)
+        view = ProductView()
+        assert view.product_model.rowCount() == 1
+
+        view.name_input.setText("Brush")
+        view.price_input.setText("1.25")
+        view.stock_input.setText("40")
+        view.add_product()
+        brush_row = view._find_product_row(Product.get_all_products()[0].product_id)
+        assert view.product_model.product_at(brush_row)[1] == "Brush"
+
+        view.product_table.selectRow(brush_row)
+        assert view.name_input.text() == "Brush"
+        assert view.price_input.text() == "1.25"
+        view.stock_input.setText("35")
+        view.update_product()
+        assert view.product_model.product_at(brush_row)[3] == 35
+
+        mock_msg.question.return_value = mock_msg.StandardButton.Yes
+        view.product_table.selectRow(brush_row)
+        view.delete_product()
+        assert view.product_model.rowCount() == 1
+        assert [p.name for p in Product.get_all_products()] == ["Soap"]
+
+    def test_filter_hides_non_matching_rows(self):
+        Product.add_product("Soap", 2.5, 100)
+        Product.add_product("Brush", 1.0, 50)
+        view = ProductView()
+        view.filter_products("bru")
+        assert view.product_proxy.rowCount() == 1
+        assert view.product_proxy.index(0, 1).data() == "Brush"
+        view.filter_products("")
+        assert view.product_proxy.rowCount() == 2
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from models.customer import Customer
+from models.invoice import Invoice
+from models.product import Product
+from utils.receipt_batch import export_receipts, invoice_ids_for_period, load_receipts
+
+
+@pytest.fixture()
+def invoice_ids():
+    cid = Customer.add_customer("Alice", "0123456789", "Accra")
+    soap = Product.add_product("Soap", 2.5, 1000)
+    brush = Product.add_product("Brush", 1.0, 1000)
+    items = [
+        {"product_id": soap, "quantity": 2, "unit_price": 2.5},
+        {"product_id": brush, "quantity": 1, "unit_price": 1},
+    ]
+    return [Invoice.create_invoice(cid, items) for _ in range(5)]
+
+
+def test_bulk_load_matches_single_invoice_loader(invoice_ids):
+    bulk = Invoice.get_invoices_by_ids(invoice_ids + [999999])
+    assert sorted(bulk) == invoice_ids
+    assert bulk[invoice_ids[0]] == Invoice.get_invoice_by_id(invoice_ids[0])
+    assert invoice_ids_for_period() == invoice_ids
+    assert invoice_ids_for_period(date_to="2000-01-01") == []
+    formatted = load_receipts(invoice_ids[:1])[invoice_ids[0]]
+    assert formatted["total_items"] == 3 and "thank_you" in formatted
+
+
+def test_export_files_and_merged_inline(invoice_ids, tmp_path):
+    seen = []
+    merged = tmp_path / "all.pdf"
+    result = export_receipts(
+        invoice_ids + [999999],
+        str(tmp_path / "out"),
+        merged_path=str(merged),
+        workers=1,
+        chunk_size=2,
+        progress=lambda done, total: seen.append((done, total)),
+    )
+    assert sorted(result.files) == invoice_ids
+    assert all(path.endswith(f"receipt_{i}.pdf") for i, path in result.files.items())
+    assert (tmp_path / "out" / f"receipt_{invoice_ids[0]}.pdf").read_bytes().startswith(b"%PDF")
+    assert result.errors == {999999: "Invoice not found."}
+    assert result.merged_path == str(merged) and merged.read_bytes().startswith(b"%PDF")
+    assert seen[0] == (0, 10) and seen[-1] == (10, 10)
+    assert not result.cancelled
+
+
+def test_cancel_stops_between_chunks(invoice_ids, tmp_path):
+    cancel = threading.Event()
+
+    def progress(done, total):
+        if done >= 2:
+            cancel.set()
+
+    result = export_receipts(
+        invoice_ids, str(tmp_path), workers=1, chunk_size=2, progress=progress, cancel_event=cancel
+    )
+    assert result.cancelled
+    assert result.exported_count == 2
+
+
+def test_export_in_worker_processes(invoice_ids, tmp_path):
+    result = export_receipts(invoice_ids, str(tmp_path), merged_path=str(tmp_path / "all.pdf"), workers=2, chunk_size=2)
+    assert sorted(result.files) == invoice_ids
+    assert result.merged_path and not result.errors and not result.merged_error
+
+
+def test_failed_worker_chunk_is_reported(invoice_ids, tmp_path, monkeypatch):
+    from utils import receipt_batch
+
+    def load_with_unpicklable(ids):
+        receipts = load_receipts(ids)
+        receipts[invoice_ids[0]]["lock"] = threading.Lock()  # its chunk cannot be sent to a worker
+        return receipts
+
+    monkeypatch.setattr(receipt_batch, "load_receipts", load_with_unpicklable)
+    seen = []
+    result = export_receipts(
+        invoice_ids, str(tmp_path), workers=2, chunk_size=2, progress=lambda done, total: seen.append((done, total))
+    )
+    assert sorted(result.errors) == invoice_ids[:2]
+    assert sorted(result.files) == invoice_ids[2:]
+    assert seen[-1] == (5, 5)
+
+
+def test_export_requires_a_destination(invoice_ids):
+    with pytest.raises(ValueError):
+        export_receipts(invoice_ids)
+
+
+@pytest.mark.usefixtures("qapp")
+def test_batch_export_dialog_runs_off_the_gui_thread(invoice_ids, tmp_path):
+    from PyQt6.QtWidgets import QApplication
+
+    from ui.receipt_batch_dialog import BatchExportDialog
+
+    dlg = BatchExportDialog(workers=1)
+    dlg.folder_input.setText(str(tmp_path))
+    dlg.ids_input.setText(", ".join(str(i) for i in invoice_ids[:3]))
+    dlg.merged_check.setChecked(True)
+    dlg.start_export()
+    assert dlg.is_running()
+    deadline = time.monotonic() + 30
+    while dlg.export_result is None and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.01)
+    assert dlg.export_result is not None and dlg.export_result.exported_count == 3
+    assert not dlg.is_running()
+    assert dlg.progress_bar.value() == dlg.progress_bar.maximum()
@@ -43,3 +43,71 @@ class TestInvoiceReceiptFormatting:
         }
         formatted = Invoice.format_receipt_data(invoice_dict)
         assert formatted["invoice_date"] == "BADDATE"
+
+
+def test_invoice_detail_is_one_query_and_receipts_are_cached():
+    from database.db_handler import get_db_connection
+    from models.customer import Customer
+    from models.invoice import get_receipt_cache
+    from models.product import Product
+    from utils.app_settings import invalidate_settings
+
+    cid = Customer.add_customer("Alice", "0123456789", "Accra")
+    soap = Product.add_product("Soap", 2.5, 100)
+    brush = Product.add_product("Brush", 1.0, 100)
+    items = [
+        {"product_id": soap, "quantity": 2, "unit_price": 2.5},
+        {"product_id": brush, "quantity": 1, "unit_price": 1.0},
+    ]
+    invoice_id = Invoice.create_invoice(cid, items)
+
+    invoice = Invoice.get_invoice_by_id(invoice_id)
+    assert invoice["customer_number"] == "0123456789"
+    assert [(i["product_name"], i["quantity"]) for i in invoice["items"]] == [("Soap", 2), ("Brush", 1)]
+
+    cache = get_receipt_cache()
+    cache.clear()
+    first = Invoice.get_formatted_receipt(invoice_id)
+    assert first["total_items"] == 3 and first["thank_you"]
+    hits = cache.stats["hits"]
+    assert Invoice.get_formatted_receipt(invoice_id) is first
+    assert cache.stats["hits"] == hits + 1
+
+    # A commit anywhere, or a settings change, makes the entry stale
+    conn = get_db_connection()
+    conn.execute("UPDATE invoices SET discount = 1.0 WHERE invoice_id = ?", (invoice_id,))
+    conn.commit()
+    conn.close()
+    second = Invoice.get_formatted_receipt(invoice_id)
+    assert second is not first and second["discount"] == "1.00"
+    invalidate_settings()
+    assert Invoice.get_formatted_receipt(invoice_id) is not second
+    assert Invoice.get_formatted_receipt(999999) is None
+
+
+def test_receipt_template_is_shared_and_renders_in_memory():
+    from models.receipt_template import get_receipt_template
+
+    formatted = Invoice.format_receipt_data(
+        {
+            "invoice_id": 7,
+            "invoice_date": "2025-01-15 14:30:05",
+            "customer_name": "Alice",
+            "items": [{"product_name": "Soap", "quantity": 2, "unit_price": 10.0}],
+            "discount": 0,
+            "tax": 0,
+            "total_amount": 20.0,
+        },
+        wholesale_number="0551234567",
+        wholesale_address="Accra",
+    )
+    template = get_receipt_template(formatted["wholesale_name"], formatted["thank_you"], formatted["notes"])
+    pdf = Invoice.render_receipt_pdf(formatted)
+    assert pdf.startswith(b"%PDF") and b"%%EOF" in pdf[-32:]
+    assert Invoice.render_receipt_pdf(formatted).startswith(b"%PDF")
+    assert get_receipt_template(formatted["wholesale_name"], formatted["thank_you"], formatted["notes"]) is template
+
+    # Changed settings texts build a new template
+    renamed = dict(formatted, wholesale_name="New Name")
+    Invoice.render_receipt_pdf(renamed)
+    assert get_receipt_template("New Name", formatted["thank_you"], formatted["notes"]) is not template
@@ -26,7 +26,7 @@ class TestReceiptView:
 
     @patch("ui.receipt_view.Invoice")
     def test_load_invoices(self, mock_invoice):
-        mock_invoice.get_all_invoices.return_value = [MagicMock(invoice_id=1, customer_name="John", total_amount=100.0)]
+        mock_invoice.iter_invoices.return_value = [MagicMock(invoice_id=1, customer_name="John", total_amount=100.0)]
         self.view.load_invoices()
         assert self.view.invoice_dropdown.count() == 1
 
@@ -42,7 +42,7 @@ class TestReceiptView:
     def test_show_receipt_invoice_not_found(self, mock_invoice, mock_msgbox):
         self.view.invoice_dropdown.currentIndex = MagicMock(return_value=0)
         self.view.invoice_dropdown.currentText = MagicMock(return_value="1 - John - GHS 100.00")
-        mock_invoice.get_invoice_by_id.return_value = None
+        mock_invoice.get_formatted_receipt.return_value = None
         self.view.show_receipt()
         mock_msgbox.warning.assert_called_once()
 
@@ -70,3 +70,32 @@ class TestReceiptView:
         self.view.invoice_dropdown.currentIndex = MagicMock(return_value=-1)
         self.view.print_receipt()
         mock_msgbox.warning.assert_called_once()
+
+
+def test_receipt_picker_pages_and_searches(monkeypatch):
+    from models.customer import Customer
+    from models.invoice import Invoice
+    from models.product import Product
+    from ui import receipt_view
+
+    monkeypatch.setattr(receipt_view, "INVOICE_PAGE_SIZE", 3)
+    alice = Customer.add_customer("Alice", "0123456789", "Accra")
+    bob = Customer.add_customer("Bob", "0987654321", "Tema")
+    pid = Product.add_product("Soap", 2.5, 100)
+    item = [{"product_id": pid, "quantity": 1, "unit_price": 2.5}]
+    ids = [Invoice.create_invoice(bob if i == 1 else alice, item) for i in range(5)]
+
+    view = ReceiptView()
+    dd = view.invoice_dropdown
+    assert [dd.itemData(i) for i in range(dd.count())] == ids[:1:-1]
+    view.load_more_invoices()
+    assert dd.count() == 5 and dd.itemData(4) == ids[0]
+    view.load_more_invoices()  # exhausted: nothing more to fetch
+    assert dd.count() == 5
+
+    view.invoice_search.setText("bo")
+    view.load_invoices()  # what the debounce timer fires
+    assert [dd.itemData(i) for i in range(dd.count())] == [ids[1]]
+    view.invoice_search.setText(str(ids[3]))
+    view.load_invoices()
+    assert dd.itemText(0).startswith(f"{ids[3]} - Alice")
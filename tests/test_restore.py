@@ -0,0 +1,136 @@
+import datetime as dt
+import os
+import shutil
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from database.db_handler import get_db_connection, resolve_db_path
+from utils.activity_log import iter_activity
+from utils.backup import perform_backup, update_backup_directory
+from utils.backup_catalog import load_catalog
+from utils.restore import PRE_RESTORE_SUFFIX, RESTORE_ACTION, backup_at, restore_database
+
+
+def _count(table: str, db_path: str | None = None) -> int:
+    if db_path:
+        conn = sqlite3.connect(db_path)
+    else:
+        conn = get_db_connection()
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _fill_products(count: int):
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO products(name, price, stock_quantity) VALUES(?, ?, ?)",
+        [(f"Product {n:05d}", 2.5, n) for n in range(count)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _change_data():
+    conn = get_db_connection()
+    conn.execute("DELETE FROM products")
+    conn.execute("INSERT INTO customers(name, phone_number, address) VALUES('After Backup', '0200000001', '')")
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.parametrize("mode", ["full", "compact", "incremental"])
+def test_restore_replaces_live_data(tmp_path, mode):
+    update_backup_directory(str(tmp_path / "backups"))
+    _fill_products(300)
+    backup = perform_backup(mode=mode)
+    _change_data()
+
+    result = restore_database(backup, username="admin")
+    assert _count("products") == 300
+    assert _count("customers") == 0
+    # The state just before the restore is kept
+    assert result.previous_path == resolve_db_path() + PRE_RESTORE_SUFFIX
+    assert _count("customers", result.previous_path) == 1
+    assert result.elapsed > 0 and result.swap_seconds > 0
+    assert result.schema_to == result.schema_from
+    assert not os.path.exists(resolve_db_path() + ".restore.tmp")
+    conn = get_db_connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+    # Findable with the activity log's action filter, which upper-cases its input
+    logged = list(iter_activity(filters={"action_type": "db_restore".upper()}))
+    assert [(row[2], row[3]) for row in logged] == [("admin", RESTORE_ACTION)]
+
+
+def test_corrupt_backup_leaves_database_untouched(tmp_path):
+    update_backup_directory(str(tmp_path / "backups"))
+    backup = perform_backup(mode="full")
+    _fill_products(10)
+    with open(backup, "r+b") as fh:
+        fh.seek(200)
+        fh.write(b"garbage")
+    with pytest.raises(ValueError):
+        restore_database(backup)
+    assert _count("products") == 10
+    assert not os.path.exists(resolve_db_path() + PRE_RESTORE_SUFFIX)
+
+
+def test_backup_from_newer_schema_is_refused(tmp_path):
+    update_backup_directory(str(tmp_path / "backups"))
+    foreign = str(tmp_path / "from_newer_app.db")
+    shutil.copyfile(perform_backup(mode="full"), foreign)
+    conn = sqlite3.connect(foreign)
+    conn.execute("UPDATE schema_version SET version = 999")
+    conn.commit()
+    conn.close()
+    _fill_products(5)
+    with pytest.raises(RuntimeError):
+        restore_database(foreign)
+    assert _count("products") == 5
+
+
+def test_backup_at_picks_latest_before(tmp_path):
+    folder = str(tmp_path / "backups")
+    update_backup_directory(folder)
+    first = perform_backup(mode="full")
+    second = perform_backup(mode="full")
+    entries = load_catalog(folder)
+    assert backup_at(dt.datetime.fromtimestamp(entries[0].created - 60)) is None
+    between = (entries[0].created + entries[1].created) / 2
+    assert backup_at(dt.datetime.fromtimestamp(between)).path(folder) == first
+    assert backup_at(dt.datetime.now()).path(folder) == second
+
+
+@pytest.mark.usefixtures("qapp")
+def test_settings_dialog_restores_selected_backup(tmp_path):
+    from PyQt6.QtWidgets import QMessageBox
+
+    from ui.settings_dialog import SettingsDialog
+
+    update_backup_directory(str(tmp_path / "backups"))
+    _fill_products(20)
+    perform_backup(mode="full")
+    _change_data()
+    with patch("ui.settings_dialog.QMessageBox") as msg:
+        msg.StandardButton = QMessageBox.StandardButton
+        msg.question.return_value = QMessageBox.StandardButton.Yes
+        dlg = SettingsDialog()
+        assert dlg.restore_combo.count() == 1
+        with patch("PyQt6.QtWidgets.QApplication.processEvents") as process_events:
+            dlg.restore_selected_backup()
+        # Off the GUI thread: the dialog is locked until the job reports back
+        process_events.assert_not_called()
+        assert dlg.restore_job.is_running()
+        assert not dlg.content_widget.isEnabled() and not dlg.save_btn.isEnabled()
+        dlg.reject()
+        assert dlg.restore_job.is_running()  # closing waits for the restore
+        assert dlg.restore_job.wait(30)
+        msg.critical.assert_not_called()
+        msg.information.assert_called_once()
+        assert dlg.content_widget.isEnabled()
+    assert _count("products") == 20
+    assert _count("customers") == 0
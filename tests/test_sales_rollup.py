@@ -0,0 +1,118 @@
+import pytest
+
+from database.db_handler import get_db_connection, initialize_database
+from database.sales_rollup import main, mismatched_days, rebuild_sales_daily, sales_by_period, sales_totals
+from models.customer import Customer
+from models.invoice import Invoice
+from models.product import Product
+
+
+@pytest.fixture
+def shop():
+    Customer.add_customer("Cust", "0551234567", "Addr")
+    pid = Product.add_product("Item", 10.0, 1000)
+    conn = get_db_connection()
+    cid = conn.execute("SELECT customer_id FROM customers LIMIT 1").fetchone()[0]
+    conn.close()
+    return cid, pid
+
+
+def _rollup() -> dict:
+    conn = get_db_connection()
+    try:
+        rows = conn.execute("SELECT day, invoice_count, gross, discount, tax, total FROM sales_daily").fetchall()
+        return {r[0]: r[1:] for r in rows}
+    finally:
+        conn.close()
+
+
+def _set_date(invoice_id: int, when: str):
+    conn = get_db_connection()
+    conn.execute("UPDATE invoices SET invoice_date = ? WHERE invoice_id = ?", (when, invoice_id))
+    conn.commit()
+    conn.close()
+
+
+def _mismatches() -> list[str]:
+    conn = get_db_connection()
+    try:
+        return mismatched_days(conn.cursor())
+    finally:
+        conn.close()
+
+
+def test_rollup_follows_invoice_changes(shop):
+    cid, pid = shop
+    a = Invoice.create_invoice(cid, [{"product_id": pid, "quantity": 2, "unit_price": 10.0}], discount=1.0, tax=0.5)
+    b = Invoice.create_invoice(cid, [{"product_id": pid, "quantity": 1, "unit_price": 10.0}])
+    _set_date(a, "2025-03-01 09:00:00")
+    _set_date(b, "2025-03-01 17:30:00")
+    assert _rollup() == {"2025-03-01": (2, 30.0, 1.0, 0.5, 29.5)}
+
+    Invoice.update_invoice(b, cid, [{"product_id": pid, "quantity": 3, "unit_price": 10.0}], discount=0.0, tax=2.0)
+    assert _rollup() == {"2025-03-01": (2, 50.0, 1.0, 2.5, 51.5)}
+
+    _set_date(b, "2025-03-02 08:00:00")
+    assert _rollup() == {"2025-03-01": (1, 20.0, 1.0, 0.5, 19.5), "2025-03-02": (1, 30.0, 0.0, 2.0, 32.0)}
+
+    Invoice.delete_invoice(a)
+    assert _rollup() == {"2025-03-02": (1, 30.0, 0.0, 2.0, 32.0)}  # emptied days are dropped
+    assert _mismatches() == []
+
+
+def test_bulk_invoices_are_rolled_up(shop):
+    cid, pid = shop
+    result = Invoice.create_invoices_bulk(
+        [{"customer_id": cid, "items": [{"product_id": pid, "quantity": 1, "unit_price": 4.0}]} for _ in range(25)]
+    )
+    assert result.created_count == 25
+    assert sum(row[0] for row in _rollup().values()) == 25
+    assert _mismatches() == []
+
+
+def test_report_queries(shop):
+    cid, pid = shop
+    dates = ["2024-12-31 09:00:00", "2025-01-15 10:00:00", "2025-01-20 10:00:00", "2025-02-20 11:00:00"]
+    for when in dates:
+        _set_date(Invoice.create_invoice(cid, [{"product_id": pid, "quantity": 1, "unit_price": 10.0}]), when)
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        assert sales_totals(cur, "2025-01-01", "2025-02-01") == (20.0, 2)
+        assert sales_totals(cur, "2026-01-01", "2026-02-01") == (0.0, 0)
+        assert sales_by_period(cur, "month") == [("2024-12", 10.0), ("2025-01", 20.0), ("2025-02", 10.0)]
+        assert sales_by_period(cur, "year") == [("2024", 10.0), ("2025", 30.0)]
+        with pytest.raises(ValueError):
+            sales_by_period(cur, "week")
+    finally:
+        conn.close()
+
+
+def test_rebuild_repairs_and_migration_backfills(shop, capsys):
+    cid, pid = shop
+    for _ in range(3):
+        Invoice.create_invoice(cid, [{"product_id": pid, "quantity": 1, "unit_price": 10.0}])
+    conn = get_db_connection()
+    conn.execute("UPDATE sales_daily SET total = total + 5")
+    conn.commit()
+    conn.close()
+    assert main(["--check"]) == 1
+    assert main([]) == 0
+    assert main(["--check"]) == 0
+    capsys.readouterr()
+
+    # A database from before migration 3 gets the table filled from existing invoices
+    conn = get_db_connection()
+    for trigger in ("sales_daily_ai", "sales_daily_ad", "sales_daily_au"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.execute("DROP TABLE sales_daily")
+    conn.execute("UPDATE schema_version SET version = 2")
+    conn.commit()
+    conn.close()
+    initialize_database()
+    assert sum(row[0] for row in _rollup().values()) == 3
+    conn = get_db_connection()
+    try:
+        assert rebuild_sales_daily(conn.cursor()) == len(_rollup())
+    finally:
+        conn.close()
@@ -0,0 +1,124 @@
+from unittest.mock import patch
+
+import pytest
+
+from database.db_handler import get_db_connection, get_schema_version
+from database.fts import prefix_match_query
+from models.customer import Customer
+from models.product import Product
+
+
+def _names(results):
+    return [r.name for r in results]
+
+
+def test_schema_has_fts_indexes():
+    assert get_schema_version() >= 2
+    conn = get_db_connection()
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    conn.close()
+    assert {"products_fts", "customers_fts"} <= tables
+
+
+def test_prefix_query_is_sanitised():
+    assert prefix_match_query('Soap "bar') == '"soap"* "bar"*'
+    assert prefix_match_query("  -*  ") is None
+
+
+def test_product_search_prefix_and_ranking():
+    for name in ("Soap Bar", "Liquid Soap", "Brush", "Soap"):
+        Product.add_product(name, 1.0, 5)
+    assert set(_names(Product.search("soa"))) == {"Soap Bar", "Liquid Soap", "Soap"}
+    assert _names(Product.search("soap b")) == ["Soap Bar"]
+    assert len(Product.search("soa", limit=2)) == 2
+    # Empty query: first page A-Z
+    assert _names(Product.search("", limit=2)) == ["Brush", "Liquid Soap"]
+
+
+def test_product_index_follows_renames_and_deletes():
+    pid = Product.add_product("Brush", 1.0, 5)
+    Product.update_product(pid, "Comb", 1.0, 5)
+    assert _names(Product.search("bru")) == []
+    assert _names(Product.search("com")) == ["Comb"]
+    Product.delete_product(pid)
+    assert Product.search("com") == []
+
+
+def test_customer_search_matches_name_phone_and_address():
+    Customer.add_customer("Alice Mensah", "0241234567", "Accra")
+    Customer.add_customer("Bob", "0551234567", "Alice Street")
+    # Name match ranks above address match
+    assert _names(Customer.search("ali")) == ["Alice Mensah", "Bob"]
+    assert _names(Customer.search("0551")) == ["Bob"]
+    assert _names(Customer.search("accra")) == ["Alice Mensah"]
+
+
+def test_search_falls_back_without_fts():
+    Product.add_product("Toothbrush", 1.0, 5)
+    Customer.add_customer("Ama", "0241234567", "Tema")
+    conn = get_db_connection()
+    conn.execute("DROP TABLE products_fts")
+    conn.execute("DROP TABLE customers_fts")
+    for trigger in ("products_fts_ai", "products_fts_ad", "products_fts_au"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.commit()
+    conn.close()
+    # LIKE fallback matches substrings
+    assert _names(Product.search("brush")) == ["Toothbrush"]
+    assert _names(Customer.search("tem")) == ["Ama"]
+
+
+@pytest.mark.usefixtures("qapp")
+def test_invoice_dropdowns_query_incrementally():
+    from ui.invoice_view import InvoiceView
+
+    for i in range(30):
+        Product.add_product(f"Item {i:02d}", 1.0, 5)
+    soap_id = Product.add_product("Soap", 2.5, 5)
+    view = InvoiceView()
+    view.product_search.limit = 10
+    view.product_search.populate()
+    assert view.product_dropdown.count() == 10
+
+    view.product_dropdown.lineEdit().setText("soa")
+    view.product_search._on_timeout()
+    assert view.product_dropdown.count() == 1
+    assert view.product_dropdown.itemData(0) == soap_id
+    assert view.product_dropdown.currentText() == "soa"  # typed text is kept
+
+    # Switching back with an unchanged catalog restores the unfiltered list
+    view.load_products()
+    assert view.product_dropdown.count() == 10
+    assert view.product_search.filter_text == ""
+
+
+@pytest.mark.usefixtures("qapp")
+def test_add_item_uses_typed_text_over_stale_pick():
+    from ui.invoice_view import InvoiceView
+
+    soap_id = Product.add_product("Soap", 2.5, 5)
+    rice_id = Product.add_product("Rice", 9.0, 1)
+    view = InvoiceView()
+    view.product_search.populate()
+    view.product_dropdown.setCurrentIndex(view.product_dropdown.findData(soap_id))
+    view.quantity_input.setText("1")
+
+    # Typed over the picked product; the debounced search has not reloaded the list yet
+    view.product_dropdown.lineEdit().setText("ric")
+    assert view.product_dropdown.currentData() == soap_id
+    view.add_item_to_invoice()
+    assert [it["product_id"] for it in view.items] == [rice_id]
+
+    # Rice's stock (1) is checked, not Soap's (5)
+    view.quantity_input.setText("1")
+    with patch("ui.invoice_view.QMessageBox") as msg:
+        view.add_item_to_invoice()
+    msg.warning.assert_called_once()
+    assert "Only 0 additional units" in msg.warning.call_args.args[2]
+    assert view.items[0]["quantity"] == 1
+
+    # A bare id resolves too
+    view.product_dropdown.lineEdit().setText(str(soap_id))
+    view.quantity_input.setText("1")
+    view.add_item_to_invoice()
+    assert [it["product_id"] for it in view.items] == [rice_id, soap_id]
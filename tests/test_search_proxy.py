@@ -0,0 +1,70 @@
+import pytest
+
+from ui.customer_table_model import CustomerTableModel
+from ui.product_table_model import FETCH_CHUNK, ProductTableModel
+from ui.search_proxy import SearchFilterProxyModel
+
+pytestmark = [pytest.mark.usefixtures("qapp")]
+
+
+def _proxy(model):
+    proxy = SearchFilterProxyModel()
+    proxy.setSourceModel(model)
+    return proxy
+
+
+def _names(proxy):
+    return [proxy.index(r, 1).data() for r in range(proxy.rowCount())]
+
+
+def test_filter_matches_within_a_single_column():
+    model = CustomerTableModel()
+    model.set_customers([(1, "Alice", "0241234567", "Accra"), (2, "Bob", "0550000000", "Kumasi")])
+    proxy = _proxy(model)
+    proxy.set_search_text("ACC")
+    assert _names(proxy) == ["Alice"]
+    # Text spanning two columns ("Bob" + "0550...") must not match
+    proxy.set_search_text("bob055")
+    assert _names(proxy) == []
+    proxy.set_search_text("")
+    assert _names(proxy) == ["Alice", "Bob"]
+
+
+def test_narrowing_and_widening_give_same_result_as_fresh_scan():
+    model = ProductTableModel()
+    model.set_products([(i, f"Item {i}", float(i), i % 5) for i in range(1, 301)])
+    proxy = _proxy(model)
+    for text in ("1", "12", "123", "12", "2"):
+        proxy.set_search_text(text)
+        fresh = _proxy(model)
+        fresh.set_search_text(text)
+        assert _names(proxy) == _names(fresh)
+
+
+def test_search_covers_rows_not_yet_fetched():
+    model = ProductTableModel()
+    rows = [(i, f"Item {i}", 1.0, 1) for i in range(1, FETCH_CHUNK * 2 + 1)]
+    rows[-1] = (rows[-1][0], "Needle", 1.0, 1)
+    model.set_products(rows)
+    proxy = _proxy(model)
+    assert proxy.rowCount() == FETCH_CHUNK
+    proxy.set_search_text("needle")
+    assert _names(proxy) == ["Needle"]
+
+
+def test_source_edits_are_reflected_while_filtered():
+    model = ProductTableModel()
+    model.set_products([(1, "Soap", 2.5, 10), (2, "Brush", 1.0, 5), (3, "Soap Bar", 3.0, 7)])
+    proxy = _proxy(model)
+    proxy.set_search_text("soap")
+    assert _names(proxy) == ["Soap", "Soap Bar"]
+    model.update_product(2, "Soap Brush", 1.0, 5)
+    assert _names(proxy) == ["Soap", "Soap Brush", "Soap Bar"]
+    model.update_product(1, "Towel", 2.5, 10)
+    assert _names(proxy) == ["Soap Brush", "Soap Bar"]
+    model.remove_product(2)
+    assert _names(proxy) == ["Soap Bar"]
+    model.add_product(4, "Liquid Soap", 4.0, 1)
+    model.add_product(5, "Sponge", 4.0, 1)
+    assert _names(proxy) == ["Soap Bar", "Liquid Soap"]
+    assert proxy.mapToSource(proxy.index(1, 0)).row() == model.row_for_id(4)
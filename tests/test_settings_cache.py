@@ -0,0 +1,58 @@
+import gc
+
+import utils.app_settings as app_settings
+from models.invoice import Invoice
+from utils.app_settings import get_low_stock_threshold, get_settings, invalidate_settings, subscribe_settings
+from utils.backup import get_configured_backup_dir, update_backup_directory, update_retention_count
+
+
+def test_settings_row_is_loaded_once(monkeypatch):
+    monkeypatch.setattr(app_settings, "_cached", None)
+    calls = []
+    real_load = app_settings._load
+    monkeypatch.setattr(app_settings, "_load", lambda version: calls.append(version) or real_load(version))
+    Invoice.get_wholesale_name()
+    Invoice.get_wholesale_address()
+    Invoice.get_receipt_texts()
+    get_low_stock_threshold()
+    get_configured_backup_dir()
+    assert len(calls) == 1
+
+
+def test_backup_updates_invalidate_and_notify(tmp_path):
+    seen = []
+    unsubscribe = subscribe_settings(seen.append)
+    try:
+        version = get_settings().version
+        update_backup_directory(str(tmp_path))
+        assert get_configured_backup_dir() == str(tmp_path)
+        update_retention_count(3)
+        assert get_settings().retention_count == 3
+        assert [s.retention_count for s in seen][-1] == 3
+        assert get_settings().version > version
+    finally:
+        unsubscribe()
+    update_retention_count(4)
+    assert len(seen) == 2
+
+
+def test_defaults_and_weak_subscribers():
+    settings = get_settings()
+    assert settings.display_number == "N/A" or settings.wholesale_number
+    assert settings.threshold >= 0
+
+    class Listener:
+        def __init__(self):
+            self.count = 0
+
+        def on_change(self, _settings):
+            self.count += 1
+
+    listener = Listener()
+    subscribe_settings(listener.on_change)
+    invalidate_settings()
+    assert listener.count == 1
+    del listener
+    gc.collect()
+    invalidate_settings()  # the dead subscriber is dropped silently
+    assert not any(ref() is None for ref in app_settings._subscribers)
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import pytest
+
+from models.customer import Customer
+from models.invoice import Invoice
+from models.product import Product
+from models.thermal_receipt import paper_columns, render_escpos, render_text, send_to_printer
+
+FORMATTED = {
+    "invoice_number": 1042,
+    "invoice_date": "15/01/2025 10:00:00",
+    "customer_name": "Alice Mensah",
+    "wholesale_name": "Tradia Wholesale",
+    "wholesale_contact": "0550000000",
+    "wholesale_address": "Accra",
+    "items": [["Premium Laundry Soap Bar 500g Family Pack", "2", "10.00", "20.00"]],
+    "total_items": 2,
+    "discount": "0.00",
+    "tax": "0.00",
+    "total": "20.00",
+    "thank_you": "Thank you!",
+    "notes": "",
+}
+
+
+@pytest.mark.parametrize("paper_mm", [58, 80])
+def test_text_receipt_fits_the_paper(paper_mm):
+    text = render_text(FORMATTED, paper_mm)
+    lines = text.splitlines()
+    assert max(len(line) for line in lines) <= paper_columns(paper_mm)
+    assert lines[0].strip() == "Tradia Wholesale"
+    assert lines[-1].strip() == "Thank you!"
+    assert any(line.startswith("TOTAL") and line.endswith("20.00") for line in lines)
+    assert any(line.startswith("  2 x 10.00") and line.endswith("20.00") for line in lines)
+
+
+def test_escpos_stream_and_printer_file(tmp_path):
+    data = render_escpos(FORMATTED, 58)
+    assert data.startswith(b"\x1b@")  # printer reset
+    assert data.endswith(b"\x1dVB\x03")  # feed and cut
+    assert "GH¢".encode("cp437") in data
+    assert b"\x1bE\x01" in data  # bold title/total
+    assert not render_escpos(FORMATTED, 80, cut=False).endswith(b"\x1dVB\x03")
+    with pytest.raises(ValueError):
+        render_escpos(FORMATTED, 76)
+
+    device = tmp_path / "lp0"
+    assert send_to_printer(data, str(device)) == len(data)
+    assert device.read_bytes() == data
+
+
+@pytest.mark.usefixtures("qapp")
+def test_print_receipt_goes_to_configured_thermal_printer(tmp_path, monkeypatch):
+    from ui.receipt_view import ReceiptView
+
+    cid = Customer.add_customer("Alice", "0123456789", "Accra")
+    pid = Product.add_product("Soap", 2.5, 100)
+    Invoice.create_invoice(cid, [{"product_id": pid, "quantity": 2, "unit_price": 2.5}])
+    device = tmp_path / "printer"
+    monkeypatch.setenv("TRADIA_RECEIPT_PRINTER", str(device))
+    monkeypatch.setenv("TRADIA_RECEIPT_PAPER", "58")
+
+    view = ReceiptView()
+    view.invoice_dropdown.setCurrentIndex(0)
+    with patch("ui.receipt_view.webbrowser.open") as mock_open, patch("ui.receipt_view.QMessageBox"):
+        view.print_receipt()
+    mock_open.assert_not_called()
+    data = device.read_bytes()
+    assert data.startswith(b"\x1b@") and b"Alice" in data
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QObject, QThread, pyqtSignal
+
+from utils.app_settings import invalidate_settings
+from utils.backup import BackupCancelled, perform_backup
+from utils.restore import RestoreResult, restore_database
+
+DEFAULT_THROTTLE_S = 0.01  # pause between copy steps for backups started from the UI
+
+
+class _BackupWorker(QObject):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, mode, throttle, cancel_event):
+        super().__init__()
+        self._mode = mode
+        self._throttle = throttle
+        self._cancel_event = cancel_event
+
+    def run(self):
+        try:
+            path = perform_backup(
+                mode=self._mode, throttle=self._throttle, progress=self.progress.emit, cancel_event=self._cancel_event
+            )
+        except BackupCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            self.failed.emit(str(e) or e.__class__.__name__)
+            return
+        self.finished.emit(path)
+
+
+class _RestoreWorker(QObject):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, backup_path, username):
+        super().__init__()
+        self._backup_path = backup_path
+        self._username = username
+
+    def run(self):
+        try:
+            # Settings subscribers are widgets: RestoreJob notifies them on the GUI thread
+            result = restore_database(
+                self._backup_path, progress=self.progress.emit, username=self._username, notify=False
+            )
+        except Exception as e:
+            self.failed.emit(str(e) or e.__class__.__name__)
+            return
+        self.finished.emit(result)
+
+
+class _WorkerJob(QObject):
+    """Owns the QThread a worker runs on; subclasses wire up the worker's signals."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread: QThread | None = None
+        self._worker: _BackupWorker | _RestoreWorker | None = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def _launch(self, worker: _BackupWorker | _RestoreWorker):
+        self._thread = QThread(self)
+        self._worker = worker
+        worker.moveToThread(self._thread)
+        self._thread.started.connect(worker.run)
+        self._thread.start()
+
+    def wait(self, timeout_s: float) -> bool:
+        """Process events until the job ends or timeout_s passes; True if it ended."""
+        deadline = time.monotonic() + timeout_s
+        while self.is_running() and time.monotonic() < deadline:
+            QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 50)
+            time.sleep(0.01)
+        return not self.is_running()
+
+    def _stop_thread(self):
+        if self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
+            self._thread.deleteLater()
+        self._thread = None
+        self._worker = None
+
+
+class BackupJob(_WorkerJob):
+    """Runs perform_backup on a worker thread; results arrive as signals on the GUI thread.
+
+    progress(done, total) follows the copy; exactly one of finished(path),
+    failed(message) or cancelled() is emitted at the end.
+    """
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, parent=None, mode: str | None = None, throttle: float = DEFAULT_THROTTLE_S):
+        super().__init__(parent)
+        self.mode = mode
+        self.throttle = throttle
+        self.result_path: str | None = None
+        self.error: str | None = None
+        self._cancel = threading.Event()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._cancel.clear()
+        self.result_path = None
+        self.error = None
+        worker = _BackupWorker(self.mode, self.throttle, self._cancel)
+        worker.progress.connect(self.progress.emit)
+        worker.finished.connect(self._on_finished)
+        worker.failed.connect(self._on_failed)
+        worker.cancelled.connect(self._on_cancelled)
+        self._launch(worker)
+
+    def cancel(self):
+        """Ask the backup to stop after its current step."""
+        self._cancel.set()
+
+    def _on_finished(self, path: str):
+        self._stop_thread()
+        self.result_path = path
+        self.finished.emit(path)
+
+    def _on_failed(self, message: str):
+        self._stop_thread()
+        self.error = message
+        self.failed.emit(message)
+
+    def _on_cancelled(self):
+        self._stop_thread()
+        self.cancelled.emit()
+
+
+class RestoreJob(_WorkerJob):
+    """Runs restore_database on a worker thread; results arrive as signals on the GUI thread.
+
+    progress(done, total) follows the swap. A restore cannot be cancelled: the
+    swap is one transaction, and stopping earlier would only waste the staging.
+    finished(RestoreResult) is emitted after settings subscribers have been
+    notified of the restored values; failed(message) leaves the data unchanged.
+    """
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.result: RestoreResult | None = None
+        self.error: str | None = None
+
+    def start(self, backup_path: str, username: str | None = None):
+        if self.is_running():
+            return
+        self.result = None
+        self.error = None
+        worker = _RestoreWorker(backup_path, username)
+        worker.progress.connect(self.progress.emit)
+        worker.finished.connect(self._on_finished)
+        worker.failed.connect(self._on_failed)
+        self._launch(worker)
+
+    def _on_finished(self, result: RestoreResult):
+        self._stop_thread()
+        invalidate_settings()
+        self.result = result
+        self.finished.emit(result)
+
+    def _on_failed(self, message: str):
+        self._stop_thread()
+        self.error = message
+        self.failed.emit(message)
@@ -0,0 +1,117 @@
+"""Table model backing the customers view.
+
+Same shape as ProductTableModel: column lists instead of QTableWidgetItems, an
+O(1) id -> row index, single-row updates, and a precomputed search key per row
+for SearchFilterProxyModel.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from ui.search_proxy import make_search_key
+
+CUSTOMER_COLUMNS = ("ID", "Name", "Phone", "Address")
+_ROOT = QModelIndex()
+
+
+class CustomerTableModel(QAbstractTableModel):
+    COL_ID, COL_NAME, COL_PHONE, COL_ADDRESS = range(4)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids = array("q")
+        self._names: list[str] = []
+        self._phones: list[str] = []
+        self._addresses: list[str] = []
+        self._keys: list[str] = []
+        self._row_of: dict[int, int] = {}
+
+    # ----- store ----- #
+    def set_customers(self, rows):
+        """Replace all rows with (customer_id, name, phone_number, address) tuples."""
+        self.beginResetModel()
+        self._ids = array("q", (int(r[0]) for r in rows))
+        self._names = [r[1] or "" for r in rows]
+        self._phones = [r[2] or "" for r in rows]
+        self._addresses = [r[3] or "" for r in rows]
+        self._keys = [
+            make_search_key(cid, name, phone, address)
+            for cid, name, phone, address in zip(self._ids, self._names, self._phones, self._addresses, strict=True)
+        ]
+        self._row_of = {cid: row for row, cid in enumerate(self._ids)}
+        self.endResetModel()
+
+    def search_keys(self) -> list[str]:
+        return self._keys
+
+    def row_for_id(self, customer_id) -> int:
+        return self._row_of.get(int(customer_id), -1)
+
+    def customer_at(self, row: int) -> tuple[int, str, str, str] | None:
+        if 0 <= row < len(self._ids):
+            return self._ids[row], self._names[row], self._phones[row], self._addresses[row]
+        return None
+
+    def add_customer(self, customer_id: int, name: str, phone: str, address: str) -> int:
+        row = len(self._ids)
+        self.beginInsertRows(_ROOT, row, row)
+        self._ids.append(int(customer_id))
+        self._names.append(name)
+        self._phones.append(phone)
+        self._addresses.append(address)
+        self._keys.append(make_search_key(customer_id, name, phone, address))
+        self._row_of[int(customer_id)] = row
+        self.endInsertRows()
+        return row
+
+    def update_customer(self, customer_id: int, name: str, phone: str, address: str) -> int:
+        row = self.row_for_id(customer_id)
+        if row < 0:
+            return -1
+        self._names[row] = name
+        self._phones[row] = phone
+        self._addresses[row] = address
+        self._keys[row] = make_search_key(customer_id, name, phone, address)
+        self.dataChanged.emit(self.index(row, self.COL_NAME), self.index(row, self.COL_ADDRESS))
+        return row
+
+    def remove_customer(self, customer_id: int) -> bool:
+        row = self.row_for_id(customer_id)
+        if row < 0:
+            return False
+        self.beginRemoveRows(_ROOT, row, row)
+        del self._ids[row]
+        del self._names[row]
+        del self._phones[row]
+        del self._addresses[row]
+        del self._keys[row]
+        del self._row_of[int(customer_id)]
+        for r in range(row, len(self._ids)):
+            self._row_of[self._ids[r]] = r
+        self.endRemoveRows()
+        return True
+
+    # ----- Qt model API ----- #
+    def rowCount(self, parent=_ROOT):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=_ROOT):
+        return 0 if parent.isValid() else len(CUSTOMER_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return CUSTOMER_COLUMNS[section] if 0 <= section < len(CUSTOMER_COLUMNS) else None
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        row, col = index.row(), index.column()
+        if row >= len(self._ids):
+            return None
+        if col == self.COL_ID:
+            return str(self._ids[row])
+        return (None, self._names, self._phones, self._addresses)[col][row]
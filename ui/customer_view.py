@@ -6,14 +6,15 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from models.customer import Customer
 from ui.customer_history_dialog import CustomerHistoryDialog
+from ui.customer_table_model import CustomerTableModel
+from ui.search_proxy import SearchFilterProxyModel
 from utils.ui_common import (
     SEARCH_PLACEHOLDER_CUSTOMERS,
     SEARCH_TOOLTIP_CUSTOMERS,
@@ -66,15 +67,18 @@ class CustomerView(QWidget):
         )
         self.layout.addLayout(top_actions)
 
-        # Customer Table
-        self.customer_table = QTableWidget()
-        self.customer_table.setColumnCount(4)
-        self.customer_table.setHorizontalHeaderLabels(["ID", "Name", "Phone", "Address"])
+        # Customer Table (model/view, searched via proxy)
+        self.customer_model = CustomerTableModel(self)
+        self.customer_proxy = SearchFilterProxyModel(self)
+        self.customer_proxy.setSourceModel(self.customer_model)
+        self.customer_table = QTableView()
+        self.customer_table.setModel(self.customer_proxy)
         self.customer_table.setSelectionBehavior(self.customer_table.SelectionBehavior.SelectRows)
+        self.customer_table.setSelectionMode(self.customer_table.SelectionMode.SingleSelection)
         self.customer_table.setEditTriggers(self.customer_table.EditTrigger.NoEditTriggers)
         # Set header resize behavior once to avoid repeated auto-resizes
         self.customer_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.customer_table.itemSelectionChanged.connect(self.populate_fields_from_selection)
+        self.customer_table.selectionModel().selectionChanged.connect(self.populate_fields_from_selection)
         self.layout.addWidget(self.customer_table)
 
         # Set Button Layout
@@ -134,7 +138,7 @@ class CustomerView(QWidget):
         QPushButton:hover {
             background-color: #3498db;
         }
-        QTableWidget {
+        QTableView {
             background-color: white;
             border: 1px solid #999;
             border-radius: 6px;
@@ -154,44 +158,23 @@ class CustomerView(QWidget):
 
     # Load added customers
     def load_customers(self):
-        tbl = self.customer_table
-        prev_sorting = tbl.isSortingEnabled()
-        # Reduce UI work during bulk load
-        tbl.setSortingEnabled(False)
-        tbl.setUpdatesEnabled(False)
-        tbl.blockSignals(True)
-
         customers = Customer.get_all_customers()
-        tbl.setRowCount(len(customers))
-        for row_idx, customer in enumerate(customers):
-            tbl.setItem(row_idx, 0, QTableWidgetItem(str(customer.customer_id)))
-            tbl.setItem(row_idx, 1, QTableWidgetItem(customer.name))
-            tbl.setItem(row_idx, 2, QTableWidgetItem(customer.phone_number))
-            tbl.setItem(row_idx, 3, QTableWidgetItem(customer.address))
-
-        # Restore UI updates and signals
-        tbl.blockSignals(False)
-        tbl.setUpdatesEnabled(True)
-        tbl.setSortingEnabled(prev_sorting)
+        self.customer_model.set_customers([(c.customer_id, c.name, c.phone_number, c.address) for c in customers])
 
         # Re-apply current filter
         self.filter_customers(self.search_input.text())
 
     # Helpers for incremental updates
     def _find_customer_row(self, customer_id: int) -> int:
-        for row in range(self.customer_table.rowCount()):
-            item = self.customer_table.item(row, 0)
-            if item and item.text() == str(customer_id):
-                return row
-        return -1
+        return self.customer_model.row_for_id(customer_id)
 
     def _append_customer_row(self, customer_id: int, name: str, phone: str, address: str):
-        row_idx = self.customer_table.rowCount()
-        self.customer_table.setRowCount(row_idx + 1)
-        self.customer_table.setItem(row_idx, 0, QTableWidgetItem(str(customer_id)))
-        self.customer_table.setItem(row_idx, 1, QTableWidgetItem(name))
-        self.customer_table.setItem(row_idx, 2, QTableWidgetItem(phone))
-        self.customer_table.setItem(row_idx, 3, QTableWidgetItem(address))
+        self.customer_model.add_customer(customer_id, name, phone, address)
+
+    def _selected_customer(self):
+        """Return (customer_id, name, phone, address) for the current row, or None."""
+        row = self.customer_proxy.source_row(self.customer_table.currentIndex().row())
+        return self.customer_model.customer_at(row)
 
     # Act upon a click on Add Customer Button
     def add_customer(self):
@@ -256,10 +239,7 @@ class CustomerView(QWidget):
             return
         QMessageBox.information(self, "Success", "Customer details updated.")
         # Incremental UI update
-        row = self.customer_table.currentRow()
-        self.customer_table.setItem(row, 1, QTableWidgetItem(name))
-        self.customer_table.setItem(row, 2, QTableWidgetItem(phone_number))
-        self.customer_table.setItem(row, 3, QTableWidgetItem(address))
+        self.customer_model.update_customer(customer_id, name, phone_number, address)
         self.filter_customers(self.search_input.text())
         self.clear_inputs()
 
@@ -288,16 +268,12 @@ class CustomerView(QWidget):
                 return
             QMessageBox.information(self, "Deleted", "Customer deleted.")
             # Incremental UI update
-            row = self.customer_table.currentRow()
-            if row != -1:
-                self.customer_table.removeRow(row)
+            self.customer_model.remove_customer(customer_id)
             self.clear_inputs()
 
     def get_selected_customer_id(self):
-        selected = self.customer_table.currentRow()
-        if selected == -1:
-            return None
-        return int(self.customer_table.item(selected, 0).text())
+        customer = self._selected_customer()
+        return customer[0] if customer else None
 
     # Clear Input after usage
     def clear_inputs(self):
@@ -305,14 +281,15 @@ class CustomerView(QWidget):
         self.phone_input.clear()
         self.address_input.clear()
 
-    def populate_fields_from_selection(self):
-        selected = self.customer_table.currentRow()
-        if selected == -1:
+    def populate_fields_from_selection(self, *_args):
+        customer = self._selected_customer()
+        if customer is None:
             self.clear_inputs()
             return
-        self.name_input.setText(self.customer_table.item(selected, 1).text())
-        self.phone_input.setText(self.customer_table.item(selected, 2).text())
-        self.address_input.setText(self.customer_table.item(selected, 3).text())
+        _customer_id, name, phone, address = customer
+        self.name_input.setText(name)
+        self.phone_input.setText(phone)
+        self.address_input.setText(address)
         # previous implementation: no extra details label
 
     def view_history(self):
@@ -322,8 +299,8 @@ class CustomerView(QWidget):
             QMessageBox.information(self, "Purchase History", "Select a customer to view history.")
             return
         # Get name for dialog title
-        selected = self.customer_table.currentRow()
-        customer_name = self.customer_table.item(selected, 1).text() if selected != -1 else str(customer_id)
+        customer = self._selected_customer()
+        customer_name = customer[1] if customer else str(customer_id)
         try:
             dlg = CustomerHistoryDialog(self, customer_id, customer_name)
             dlg.exec()
@@ -332,19 +309,8 @@ class CustomerView(QWidget):
             return
 
     def filter_customers(self, text: str):
-        """Filter customer table rows by text across all columns (case-insensitive)."""
-        text = (text or "").strip().lower()
-        for row in range(self.customer_table.rowCount()):
-            if not text:
-                self.customer_table.setRowHidden(row, False)
-                continue
-            match = False
-            for col in range(self.customer_table.columnCount()):
-                item = self.customer_table.item(row, col)
-                if item and text in item.text().lower():
-                    match = True
-                    break
-            self.customer_table.setRowHidden(row, not match)
+        """Filter customer rows by text across all columns (case-insensitive)."""
+        self.customer_proxy.set_search_text(text)
 
     def on_customer_search_text_changed(self, _text: str):
         # Restart debounce timer
@@ -2,7 +2,6 @@ from PyQt6.QtCore import QEvent, QObject, Qt, pyqtSignal
 from PyQt6.QtGui import QDoubleValidator, QIntValidator
 from PyQt6.QtWidgets import (
     QComboBox,
-    QCompleter,
     QHBoxLayout,
     QHeaderView,
     QLabel,
@@ -18,10 +17,10 @@ from PyQt6.QtWidgets import (
 
 from models.customer import Customer
 from models.invoice import Invoice
-from models.product import Product
+from models.product import Product, get_product_catalog
 from utils.activity_log import log_action
 from utils.session import get_current_username
-from utils.ui_common import format_money, format_money_value
+from utils.ui_common import IncrementalComboSearch, format_money, format_money_value
 
 
 class SelectAllOnFocus(QObject):
@@ -36,30 +35,25 @@ class InvoiceView(QWidget):
 
     def __init__(self):
         super().__init__()
+        self._catalog_version = None  # catalog snapshot the product dropdown was built from
         self.setStyleSheet(self.get_stylesheet())
         self.layout = QVBoxLayout()
 
         focus_filter = SelectAllOnFocus()
 
-        # Customer Dropdown
+        # Customer Dropdown (one page of choices; re-queried from the search index as the user types)
         self.customer_dropdown = QComboBox()
         self.customer_dropdown.setEditable(True)
-        self.customer_completer = QCompleter()
-        self.customer_completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        self.customer_completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        self.customer_completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
-        self.customer_dropdown.setCompleter(self.customer_completer)
+        self.customer_search = IncrementalComboSearch(self.customer_dropdown, self._customer_choices)
+        self.customer_completer = self.customer_search.completer
         self.customer_dropdown.lineEdit().installEventFilter(focus_filter)
         self.customer_dropdown.currentIndexChanged.connect(self._select_all_customer)
 
-        # Product Dropdown
+        # Product Dropdown (same incremental search as customers)
         self.product_dropdown = QComboBox()
         self.product_dropdown.setEditable(True)
-        self.product_completer = QCompleter()
-        self.product_completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        self.product_completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        self.product_completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
-        self.product_dropdown.setCompleter(self.product_completer)
+        self.product_search = IncrementalComboSearch(self.product_dropdown, self._product_choices)
+        self.product_completer = self.product_search.completer
         self.product_dropdown.lineEdit().installEventFilter(focus_filter)
         self.product_dropdown.currentIndexChanged.connect(self._select_all_product)
         # Equal halves: let it expand within its half
@@ -223,37 +217,28 @@ class InvoiceView(QWidget):
         }
         """
 
+    @staticmethod
+    def _customer_choices(text: str, limit: int):
+        return [(f"{c.name} - {c.phone_number}", c.customer_id) for c in Customer.search(text, limit)]
+
+    @staticmethod
+    def _product_choices(text: str, limit: int):
+        return [
+            (f"{p.product_id} - {p.name} ({format_money(p.price)})", p.product_id) for p in Product.search(text, limit)
+        ]
+
     def load_customers(self):
-        # Bulk refresh without extra signals/repains
-        dd = self.customer_dropdown
-        dd.blockSignals(True)
-        dd.setUpdatesEnabled(False)
-        try:
-            dd.clear()
-            customers = Customer.get_all_customers()
-            names = [f"{c.name} - {c.phone_number}" for c in customers]
-            if names:
-                dd.addItems(names)
-            # Keep completer bound to the same model; no need to reset filter/completion modes
-            self.customer_completer.setModel(dd.model())
-        finally:
-            dd.blockSignals(False)
-            dd.setUpdatesEnabled(True)
+        # First page only; typing queries the search index for more
+        self.customer_search.populate()
 
     def load_products(self):
-        dd = self.product_dropdown
-        dd.blockSignals(True)
-        dd.setUpdatesEnabled(False)
-        try:
-            dd.clear()
-            products = Product.get_all_products()
-            names = [f"{p.product_id} - {p.name} ({format_money(p.price)})" for p in products]
-            if names:
-                dd.addItems(names)
-            self.product_completer.setModel(dd.model())
-        finally:
-            dd.blockSignals(False)
-            dd.setUpdatesEnabled(True)
+        version = get_product_catalog().current_version()
+        if version == self._catalog_version:
+            # Same catalog, but the list may still hold the last search's results
+            self.product_search.reset()
+            return
+        self.product_search.populate()
+        self._catalog_version = version
 
     def load_invoice_items_table(self):
         tbl = self.invoice_items_table
@@ -297,7 +282,8 @@ class InvoiceView(QWidget):
         self.invoice_items_table.setItem(row, 3, QTableWidgetItem(format_money_value(quantity * unit_price)))
 
     def add_item_to_invoice(self):
-        if self.product_dropdown.currentIndex() == -1:
+        product_text = self.product_dropdown.currentText()
+        if not product_text.strip():
             QMessageBox.warning(self, "Input Error", "Select a product.")
             return
         try:
@@ -306,9 +292,18 @@ class InvoiceView(QWidget):
             QMessageBox.warning(self, "Input Error", "Enter a valid quantity.")
             return
 
-        product_text = self.product_dropdown.currentText()
-        product_id = int(product_text.split(" - ")[0])
-        product = Product.get_product_by_id(product_id)
+        # As in save_invoice: the current entry only counts while its text is still what is
+        # typed; retyping before the search reloads the list leaves the old pick selected.
+        index = self.product_dropdown.currentIndex()
+        product_id = self.product_dropdown.currentData()
+        if product_id is not None and self.product_dropdown.itemText(index) == product_text:
+            product = Product.get_product_by_id(product_id)
+        else:
+            product = Product.find_by_display_text(product_text)
+        if not product:
+            QMessageBox.warning(self, "Input Error", "Selected product not found.")
+            return
+        product_id = product.product_id
 
         # Consider quantities already added to the current invoice for this product
         existing_qty = sum(it["quantity"] for it in self.items if it["product_id"] == product_id)
@@ -436,34 +431,14 @@ class InvoiceView(QWidget):
             QMessageBox.warning(self, "Input Error", "Select a customer.")
             return
 
-        # The dropdown shows customers as "Name - phone_number". Match against that
-        # composite string first, then fall back to name-only or fuzzy matches to
-        # handle user-typed input.
-        customers = Customer.get_all_customers()
-        customer = None
-        # Exact composite match: "Name - phone"
-        for c in customers:
-            composite = f"{c.name} - {c.phone_number}"
-            if composite == customer_text:
-                customer = c
-                break
-
-        # If no exact composite match, try name-only (user may have selected/typed just the name)
-        if not customer:
-            name_part = customer_text.split(" - ")[0].strip()
-            for c in customers:
-                if c.name == name_part:
-                    customer = c
-                    break
-
-        # As a last resort, try a case-insensitive contains match against the composite
-        if not customer:
-            ct_lower = customer_text.lower()
-            for c in customers:
-                composite = f"{c.name} - {c.phone_number}"
-                if ct_lower in composite.lower():
-                    customer = c
-                    break
+        # A picked entry carries its customer_id; only free-typed text needs resolving
+        # ("Name - phone", then name prefix, then the search index).
+        index = self.customer_dropdown.currentIndex()
+        customer_id = self.customer_dropdown.currentData()
+        if customer_id is not None and self.customer_dropdown.itemText(index) == customer_text:
+            customer = Customer.get_customer_by_id(customer_id)
+        else:
+            customer = Customer.find_by_display_text(customer_text)
 
         if not customer:
             QMessageBox.warning(self, "Input Error", "Selected customer not found.")
@@ -1,6 +1,8 @@
 import logging
+import math
 import os
 import sys
+import threading
 from datetime import datetime
 from typing import Protocol, cast
 
@@ -29,7 +31,9 @@ from PyQt6.QtWidgets import (
     QWidgetAction,
 )
 
+from database.db_handler import run_checkpoint_policy
 from ui.about_dialog import AboutDialog
+from ui.backup_job import BackupJob
 from ui.customer_view import CustomerView
 from ui.help_dialog import HelpDialog
 from ui.invoice_view import InvoiceView
@@ -41,10 +45,23 @@ from ui.settings_dialog import SettingsDialog
 # Ensure UserView is available as an attribute on this module for tests that patch ui.main_window.UserView
 from ui.user_view import UserView  # noqa: F401
 from ui.users_dialog import UsersDialog
-from utils.backup import needs_backup, perform_backup
+from utils.activity_archive import apply_retention
+from utils.activity_log import flush_activity_log
+from utils.backup import launch_detached_backup, needs_backup
 from utils.branding import APP_NAME
 from utils.session import get_current_username, get_welcome_shown, set_welcome_shown
 
+CLOSE_BACKUP_WAIT_S = 5.0  # longer exit backups continue in a detached process
+CLOSE_BACKUP_CANCEL_WAIT_S = 15.0  # a cancel lands within one copy step (or SQLite's 10 s busy timeout)
+ACTIVITY_RETENTION_DELAY_MS = 30_000  # archive old activity rows once the app has settled after startup
+
+
+def _run_activity_retention():
+    try:
+        apply_retention()
+    except Exception as e:
+        logging.getLogger(__name__).warning("Activity log archiving failed: %s", e)
+
 
 # Protocol to describe optional animation attributes we attach dynamically.
 class _HasAnimAttrs(Protocol):  # pragma: no cover - typing aid only
@@ -191,6 +208,18 @@ class MainWindow(QWidget):
         # Show welcome dropdown once per session shortly after window shows
         QTimer.singleShot(200, self.maybe_show_welcome_dropdown)
 
+        # Activity log retention can archive and delete many rows: keep it off the GUI thread
+        self._retention_thread: threading.Thread | None = None
+        QTimer.singleShot(ACTIVITY_RETENTION_DELAY_MS, self._start_activity_retention)
+
+    def _start_activity_retention(self):
+        if self._retention_thread is not None:
+            return
+        self._retention_thread = threading.Thread(
+            target=_run_activity_retention, name="activity-retention", daemon=True
+        )
+        self._retention_thread.start()
+
     def button_style(self, normal=True):
         if normal:
             return """
@@ -466,21 +495,59 @@ class MainWindow(QWidget):
             except Exception:
                 pass
 
+            # An archive pass still running must finish its file and delete before the process exits
+            if self._retention_thread is not None and self._retention_thread.is_alive():
+                self.hide()
+                self._retention_thread.join()
+
+            # Write any queued activity log rows before the backup and checkpoint
+            flush_activity_log()
+
             if needs_backup(hours=24):
-                log = logging.getLogger(__name__)
-                log.info("Auto backup triggered on exit.")
-                try:
-                    path = perform_backup()
-                    log.info("Auto backup created at %s", path)
-                except Exception as e:
-                    log.warning("Auto backup failed: %s", e)
-                    try:
-                        QMessageBox.warning(self, "Backup Failed", f"Automatic backup failed.\n{e}")
-                    except Exception:
-                        pass
+                self._backup_on_exit()
+            try:
+                run_checkpoint_policy()
+            except Exception:
+                pass
         finally:
             super().closeEvent(event)
 
+    def _backup_on_exit(self):
+        """Run the due backup off the GUI thread with the window already hidden.
+
+        Small databases finish within CLOSE_BACKUP_WAIT_S; otherwise the
+        in-process copy is cancelled and a detached backup process takes over,
+        so exiting never waits on a large copy. The handoff only happens once
+        the in-process copy has really stopped: two backups must never write
+        the same directory and catalog, and the thread must end before exit.
+        """
+        log = logging.getLogger(__name__)
+        log.info("Auto backup triggered on exit.")
+        self.hide()
+        job = self._exit_backup_job = BackupJob(self, throttle=0.0)
+        job.start()
+        if not job.wait(CLOSE_BACKUP_WAIT_S):
+            job.cancel()
+            if not job.wait(CLOSE_BACKUP_CANCEL_WAIT_S):
+                log.warning("Auto backup did not stop after cancel; skipping the background handoff.")
+                job.wait(math.inf)
+                return
+            if not job.result_path and not job.error:
+                try:
+                    launch_detached_backup()
+                    log.info("Auto backup handed off to a background process.")
+                except Exception as e:
+                    log.warning("Could not start background backup: %s", e)
+                return
+        if job.result_path:
+            log.info("Auto backup created at %s", job.result_path)
+        elif job.error:
+            log.warning("Auto backup failed: %s", job.error)
+            try:
+                QMessageBox.warning(self, "Backup Failed", f"Automatic backup failed.\n{job.error}")
+            except Exception:
+                pass
+
     def update_products_badge(self, count: int | None):
         """Update Products button with a dark-red badge showing the low-stock count.
         Uses an overlay QLabel for reliable rendering across styles. Tooltip lists exact products and stock.
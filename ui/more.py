@@ -14,13 +14,16 @@ import datetime
 
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from PyQt6.QtCore import QPoint, Qt, QTimer
+from PyQt6.QtCore import QDate, QPoint, Qt, QTimer
 from PyQt6.QtWidgets import (
+    QCheckBox,
     QComboBox,
+    QDateEdit,
     QFormLayout,
     QHBoxLayout,
     QHeaderView,
     QLabel,
+    QLineEdit,
     QPushButton,
     QTableWidget,
     QTableWidgetItem,
@@ -30,11 +33,14 @@ from PyQt6.QtWidgets import (
 )
 
 from database.db_handler import get_db_connection
+from database.sales_rollup import sales_by_period, sales_totals
 from models.product import Product
 from utils import period_bounds
-from utils.activity_log import fetch_recent
+from utils.activity_log import ACTIVITY_PAGE_SIZE, iter_activity
 from utils.ui_common import format_money
 
+ACTIVITY_FILTER_DEBOUNCE_MS = 250
+
 
 # Embedded widget for sales report
 class SalesReportWidget(QWidget):
@@ -101,22 +107,8 @@ class SalesReportWidget(QWidget):
                 return
             start_iso, end_iso = period_bounds(today, kind)
 
-            # SQL uses timestamps; append midnight time component
-            iso_start = f"{start_iso} 00:00:00"
-            iso_end = f"{end_iso} 00:00:00"
-
-            cursor.execute(
-                """
-                SELECT COALESCE(SUM(total_amount), 0.0) AS total_sales,
-                       COUNT(*) AS txns
-                FROM invoices
-                WHERE invoice_date >= ? AND invoice_date < ?
-                """,
-                (iso_start, iso_end),
-            )
-            agg = cursor.fetchone() or (0.0, 0)
-            total_sales = float(agg[0] or 0.0)
-            txns = int(agg[1] or 0)
+            # Served from the daily rollup (end-exclusive ISO dates)
+            total_sales, txns = sales_totals(cursor, start_iso, end_iso)
 
             # Convert to display day/month/year; display end is inclusive (end - 1 day)
             try:
@@ -243,14 +235,7 @@ class GraphWidget(QWidget):
         cursor = conn.cursor()
         if period == "Monthly":
             if product_id is None:
-                cursor.execute(
-                    """
-                    SELECT strftime('%Y-%m', invoice_date) as period, SUM(total_amount) as total
-                    FROM invoices
-                    GROUP BY period
-                    ORDER BY period
-                    """
-                )
+                rows = sales_by_period(cursor, "month")
             else:
                 cursor.execute(
                     """
@@ -264,22 +249,11 @@ class GraphWidget(QWidget):
                     """,
                     (product_id,),
                 )
-            x = []
-            y = []
-            for row in cursor.fetchall():
-                x.append(row[0])
-                y.append(row[1])
+                rows = cursor.fetchall()
             xlabel = "Month"
         else:
             if product_id is None:
-                cursor.execute(
-                    """
-                    SELECT strftime('%Y', invoice_date) as period, SUM(total_amount) as total
-                    FROM invoices
-                    GROUP BY period
-                    ORDER BY period
-                    """
-                )
+                rows = sales_by_period(cursor, "year")
             else:
                 cursor.execute(
                     """
@@ -293,12 +267,10 @@ class GraphWidget(QWidget):
                     """,
                     (product_id,),
                 )
-            x = []
-            y = []
-            for row in cursor.fetchall():
-                x.append(row[0])
-                y.append(row[1])
+                rows = cursor.fetchall()
             xlabel = "Year"
+        x = [row[0] for row in rows]
+        y = [row[1] for row in rows]
         conn.close()
         self.figure.clear()
         ax = self.figure.add_subplot(111)
@@ -383,6 +355,40 @@ class ActivityLogWidget(QWidget):
         super().__init__(parent)
         layout = QVBoxLayout(self)
 
+        # Filters: exact user / action, optional date range; typing reloads after a short pause
+        filters = QHBoxLayout()
+        self.user_filter = QLineEdit()
+        self.user_filter.setPlaceholderText("User")
+        self.user_filter.setClearButtonEnabled(True)
+        self.action_filter = QLineEdit()
+        self.action_filter.setPlaceholderText("Action (e.g. LOGIN_FAIL)")
+        self.action_filter.setClearButtonEnabled(True)
+        self.date_filter = QCheckBox("Dates:")
+        today = QDate.currentDate()
+        self.date_from = QDateEdit(today.addDays(-30))
+        self.date_to = QDateEdit(today)
+        for edit in (self.date_from, self.date_to):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("dd/MM/yyyy")
+            edit.setEnabled(False)
+            edit.dateChanged.connect(self._on_dates_changed)
+        self.date_filter.toggled.connect(self.date_from.setEnabled)
+        self.date_filter.toggled.connect(self.date_to.setEnabled)
+        self.date_filter.toggled.connect(self.load_logs)
+        filters.addWidget(self.user_filter)
+        filters.addWidget(self.action_filter)
+        filters.addWidget(self.date_filter)
+        filters.addWidget(self.date_from)
+        filters.addWidget(QLabel("to"))
+        filters.addWidget(self.date_to)
+        layout.addLayout(filters)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(ACTIVITY_FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self.load_logs)
+        self.user_filter.textChanged.connect(self._filter_timer.start)
+        self.action_filter.textChanged.connect(self._filter_timer.start)
+
         # Simple table without extra controls or heavy styling
         self.table = QTableWidget()
         self.table.setColumnCount(4)
@@ -399,24 +405,60 @@ class ActivityLogWidget(QWidget):
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
         self.table.verticalHeader().setVisible(False)
+        # Rows arrive a page at a time, newest first; scrolling near the end fetches more
+        self._last_id = None
+        self._has_more = False
+        self.table.verticalScrollBar().valueChanged.connect(self._on_scrolled)
 
         layout.addWidget(self.table)
         self.setLayout(layout)
         self.load_logs()
 
+    def _filters(self) -> dict:
+        filters = {
+            "username": self.user_filter.text().strip(),
+            "action_type": self.action_filter.text().strip().upper(),
+        }
+        if self.date_filter.isChecked():
+            filters["date_from"] = self.date_from.date().toString("yyyy-MM-dd")
+            filters["date_to"] = self.date_to.date().toString("yyyy-MM-dd")
+        return filters
+
+    def _on_dates_changed(self, _date):
+        if self.date_filter.isChecked():
+            self._filter_timer.start()
+
     def load_logs(self):
-        rows = fetch_recent(200)
+        self._last_id = None
+        self._has_more = True
+        self.table.setRowCount(0)
+        self.load_more_logs()
+
+    def load_more_logs(self):
+        if not self._has_more:
+            return
+        rows = list(iter_activity(before_id=self._last_id, limit=ACTIVITY_PAGE_SIZE, filters=self._filters()))
+        self._has_more = len(rows) == ACTIVITY_PAGE_SIZE
+        if rows:
+            self._last_id = rows[-1][0]
         tbl = self.table
-        tbl.setSortingEnabled(False)
-        tbl.setRowCount(len(rows))
-        for r_idx, row in enumerate(rows):
-            # row: (timestamp, username, action, details)
-            ts, user, action, details = row
-            for c_idx, val in enumerate((ts, user, action, details)):
-                item = QTableWidgetItem(str(val))
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                tbl.setItem(r_idx, c_idx, item)
-        tbl.setSortingEnabled(True)
+        start = tbl.rowCount()
+        tbl.setUpdatesEnabled(False)
+        try:
+            tbl.setRowCount(start + len(rows))
+            for r_idx, row in enumerate(rows, start):
+                # row: (id, timestamp, username, action, details)
+                for c_idx, val in enumerate(row[1:]):
+                    item = QTableWidgetItem(str(val))
+                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                    tbl.setItem(r_idx, c_idx, item)
+        finally:
+            tbl.setUpdatesEnabled(True)
+
+    def _on_scrolled(self, value):
+        bar = self.table.verticalScrollBar()
+        if self._has_more and value >= bar.maximum() - bar.pageStep() // 2:
+            self.load_more_logs()
 
 
 class MoreDropdown(QWidget):
@@ -0,0 +1,178 @@
+"""Table model backing the products view.
+
+Rows live in a compact columnar store (typed arrays for ids/prices/stock plus a
+list of names) instead of four QTableWidgetItem objects per product. Rows are
+exposed to the view in chunks through canFetchMore/fetchMore, so a large
+catalog only materialises what is scrolled into view, and add/update/delete
+are applied as single-row model changes with an O(1) id -> row index.
+A lowercase search key per row is kept alongside for SearchFilterProxyModel.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from ui.search_proxy import make_search_key
+
+PRODUCT_COLUMNS = ("ID", "Name", "Price (GH¢)", "Stock")
+FETCH_CHUNK = 256  # rows handed to the view per fetchMore()
+_ROOT = QModelIndex()
+
+
+class ProductTableModel(QAbstractTableModel):
+    COL_ID, COL_NAME, COL_PRICE, COL_STOCK = range(4)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids = array("q")
+        self._names: list[str] = []
+        self._prices = array("d")
+        self._stock = array("q")
+        self._keys: list[str] = []  # precomputed search key per row
+        self._row_of: dict[int, int] = {}
+        self._fetched = 0  # rows currently exposed to views
+
+    @staticmethod
+    def _search_key(product_id, name, price, stock) -> str:
+        return make_search_key(product_id, name, f"{price:,.2f}", stock)
+
+    # ----- store ----- #
+    def set_products(self, rows):
+        """Replace all rows with (product_id, name, price, stock_quantity) tuples."""
+        self.beginResetModel()
+        self._ids = array("q")
+        self._names = []
+        self._prices = array("d")
+        self._stock = array("q")
+        for product_id, name, price, stock in rows:
+            self._ids.append(int(product_id))
+            self._names.append(name or "")
+            self._prices.append(float(price or 0))
+            self._stock.append(int(stock or 0))
+        self._keys = [
+            self._search_key(pid, name, price, stock)
+            for pid, name, price, stock in zip(self._ids, self._names, self._prices, self._stock, strict=True)
+        ]
+        self._row_of = {pid: row for row, pid in enumerate(self._ids)}
+        self._fetched = min(FETCH_CHUNK, len(self._ids))
+        self.endResetModel()
+
+    def search_keys(self) -> list[str]:
+        return self._keys
+
+    def total_count(self) -> int:
+        """Number of products held, including rows not yet fetched into the view."""
+        return len(self._ids)
+
+    def row_for_id(self, product_id) -> int:
+        """Row of a product (fetching up to it if needed), or -1."""
+        row = self._row_of.get(int(product_id), -1)
+        if row >= self._fetched:
+            self._expose(row + 1)
+        return row
+
+    def product_at(self, row: int) -> tuple[int, str, float, int] | None:
+        if 0 <= row < len(self._ids):
+            return self._ids[row], self._names[row], self._prices[row], self._stock[row]
+        return None
+
+    def add_product(self, product_id: int, name: str, price: float, stock: int) -> int:
+        row = len(self._ids)
+        if self._fetched < row:
+            # Keep appended rows visible even if the tail hasn't been scrolled to yet
+            self._expose(row)
+        self.beginInsertRows(_ROOT, row, row)
+        self._ids.append(int(product_id))
+        self._names.append(name)
+        self._prices.append(float(price))
+        self._stock.append(int(stock))
+        self._keys.append(self._search_key(product_id, name, float(price), int(stock)))
+        self._row_of[int(product_id)] = row
+        self._fetched = row + 1
+        self.endInsertRows()
+        return row
+
+    def update_product(self, product_id: int, name: str, price: float, stock: int) -> int:
+        row = self._row_of.get(int(product_id), -1)
+        if row < 0:
+            return -1
+        self._names[row] = name
+        self._prices[row] = float(price)
+        self._stock[row] = int(stock)
+        self._keys[row] = self._search_key(product_id, name, float(price), int(stock))
+        if row < self._fetched:
+            self.dataChanged.emit(self.index(row, self.COL_NAME), self.index(row, self.COL_STOCK))
+        return row
+
+    def remove_product(self, product_id: int) -> bool:
+        row = self._row_of.get(int(product_id), -1)
+        if row < 0:
+            return False
+        visible = row < self._fetched
+        if visible:
+            self.beginRemoveRows(_ROOT, row, row)
+        del self._ids[row]
+        del self._names[row]
+        del self._prices[row]
+        del self._stock[row]
+        del self._keys[row]
+        del self._row_of[int(product_id)]
+        for r in range(row, len(self._ids)):
+            self._row_of[self._ids[r]] = r
+        if visible:
+            self._fetched -= 1
+            self.endRemoveRows()
+        return True
+
+    # ----- lazy fetching ----- #
+    def _expose(self, upto: int):
+        upto = min(upto, len(self._ids))
+        if upto <= self._fetched:
+            return
+        self.beginInsertRows(_ROOT, self._fetched, upto - 1)
+        self._fetched = upto
+        self.endInsertRows()
+
+    def fetch_all(self):
+        self._expose(len(self._ids))
+
+    def canFetchMore(self, parent=_ROOT):
+        return not parent.isValid() and self._fetched < len(self._ids)
+
+    def fetchMore(self, parent=_ROOT):
+        if not parent.isValid():
+            self._expose(self._fetched + FETCH_CHUNK)
+
+    # ----- Qt model API ----- #
+    def rowCount(self, parent=_ROOT):
+        return 0 if parent.isValid() else self._fetched
+
+    def columnCount(self, parent=_ROOT):
+        return 0 if parent.isValid() else len(PRODUCT_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return PRODUCT_COLUMNS[section] if 0 <= section < len(PRODUCT_COLUMNS) else None
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if row >= self._fetched:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == self.COL_ID:
+                return str(self._ids[row])
+            if col == self.COL_NAME:
+                return self._names[row]
+            if col == self.COL_PRICE:
+                return f"{self._prices[row]:,.2f}"
+            if col == self.COL_STOCK:
+                return str(self._stock[row])
+        elif role == Qt.ItemDataRole.UserRole:
+            # Raw values (for sorting/filtering without re-parsing display text)
+            return (self._ids, self._names, self._prices, self._stock)[col][row]
+        return None
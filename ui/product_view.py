@@ -5,14 +5,15 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
-from models.product import Product
-from utils.app_settings import get_low_stock_threshold
+from models.product import Product, get_product_catalog
+from ui.product_table_model import ProductTableModel
+from ui.search_proxy import SearchFilterProxyModel
+from utils.app_settings import get_low_stock_threshold, subscribe_settings
 from utils.session import get_low_stock_alert_shown, set_low_stock_alert_shown
 from utils.ui_common import (
     SEARCH_PLACEHOLDER_PRODUCTS,
@@ -26,6 +27,7 @@ class ProductView(QWidget):
     def __init__(self, on_low_stock_status_changed=None):
         super().__init__()
         self._on_low_stock_status_changed = on_low_stock_status_changed
+        self._catalog_version = None  # catalog snapshot the table was last built from
         # Tab style
         self.setStyleSheet(self.get_stylesheet())
 
@@ -76,15 +78,19 @@ class ProductView(QWidget):
         )
         self.layout.addLayout(top_actions)
 
-        # Product Table (replaces product_list)
-        self.product_table = QTableWidget()
-        self.product_table.setColumnCount(4)
-        self.product_table.setHorizontalHeaderLabels(["ID", "Name", "Price (GH¢)", "Stock"])
+        # Product Table: model/view over a columnar store, rows fetched lazily, searched via proxy
+        self.product_model = ProductTableModel(self)
+        self.product_proxy = SearchFilterProxyModel(self)
+        self.product_proxy.setSourceModel(self.product_model)
+        self.product_table = QTableView()
+        self.product_table.setModel(self.product_proxy)
         self.product_table.setSelectionBehavior(self.product_table.SelectionBehavior.SelectRows)
+        self.product_table.setSelectionMode(self.product_table.SelectionMode.SingleSelection)
         self.product_table.setEditTriggers(self.product_table.EditTrigger.NoEditTriggers)
+        self.product_table.verticalHeader().setDefaultSectionSize(28)
         # Set header resize behavior once to avoid repeated auto-resizes
         self.product_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.product_table.itemSelectionChanged.connect(self.populate_fields_from_selection)
+        self.product_table.selectionModel().selectionChanged.connect(self.populate_fields_from_selection)
         self.layout.addWidget(self.product_table)
 
         # Set Button Layout
@@ -106,6 +112,8 @@ class ProductView(QWidget):
         self.load_products()
         # Initialize badge once per session on first load (no popup)
         self.update_low_stock_badge()
+        # A new low-stock threshold in Settings refreshes the badge right away
+        self.destroyed.connect(subscribe_settings(self._on_settings_changed))
 
     # Product View Style
     def get_stylesheet(self):
@@ -141,7 +149,7 @@ class ProductView(QWidget):
         QPushButton:hover {
             background-color: #3498db;
         }
-        QTableWidget {
+        QTableView {
             background-color: white;
             border: 1px solid #999;
             border-radius: 6px;
@@ -161,25 +169,15 @@ class ProductView(QWidget):
 
     # Load Products Method
     def load_products(self):
-        tbl = self.product_table
-        prev_sorting = tbl.isSortingEnabled()
-        # Reduce UI work during bulk load
-        tbl.setSortingEnabled(False)
-        tbl.setUpdatesEnabled(False)
-        tbl.blockSignals(True)
-
-        products = Product.get_all_products()
-        tbl.setRowCount(len(products))
-        for row_idx, product in enumerate(products):
-            tbl.setItem(row_idx, 0, QTableWidgetItem(str(product.product_id)))
-            tbl.setItem(row_idx, 1, QTableWidgetItem(product.name))
-            tbl.setItem(row_idx, 2, QTableWidgetItem(f"{product.price:,.2f}"))
-            tbl.setItem(row_idx, 3, QTableWidgetItem(str(product.stock_quantity)))
-
-        # Restore UI updates and signals
-        tbl.blockSignals(False)
-        tbl.setUpdatesEnabled(True)
-        tbl.setSortingEnabled(prev_sorting)
+        version = get_product_catalog().current_version()
+        if version == self._catalog_version:
+            # Nothing changed since the last load; keep the rows already shown
+            self.filter_products(self.search_input.text())
+            self.update_low_stock_badge()
+            return
+        self._catalog_version = version
+
+        self.product_model.set_products(get_product_catalog().rows())
 
         # Re-apply current filter (if any)
         self.filter_products(self.search_input.text())
@@ -188,19 +186,16 @@ class ProductView(QWidget):
 
     # Helpers for incremental updates
     def _find_product_row(self, product_id: int) -> int:
-        for row in range(self.product_table.rowCount()):
-            item = self.product_table.item(row, 0)
-            if item and item.text() == str(product_id):
-                return row
-        return -1
+        return self.product_model.row_for_id(product_id)
 
     def _append_product_row(self, product_id: int, name: str, price: float, stock: int):
-        row_idx = self.product_table.rowCount()
-        self.product_table.setRowCount(row_idx + 1)
-        self.product_table.setItem(row_idx, 0, QTableWidgetItem(str(product_id)))
-        self.product_table.setItem(row_idx, 1, QTableWidgetItem(name))
-        self.product_table.setItem(row_idx, 2, QTableWidgetItem(f"{price:,.2f}"))
-        self.product_table.setItem(row_idx, 3, QTableWidgetItem(str(stock)))
+        self.product_model.add_product(product_id, name, price, stock)
+
+    def _selected_product(self):
+        """Return (row, (id, name, price, stock)) for the current row, or (-1, None)."""
+        row = self.product_proxy.source_row(self.product_table.currentIndex().row())
+        product = self.product_model.product_at(row)
+        return (row, product) if product is not None else (-1, None)
 
     # Act upon a click on Add Product Button
     def add_product(self):
@@ -235,11 +230,11 @@ class ProductView(QWidget):
 
     # Act upon a click on Update Product
     def update_product(self):
-        selected = self.product_table.currentRow()
+        selected, product = self._selected_product()
         if selected == -1:
             QMessageBox.warning(self, "Select Product", "Please select a product to update.")
             return
-        product_id = int(self.product_table.item(selected, 0).text())
+        product_id = product[0]
         name = self.name_input.text().strip()
         try:
             price = float(self.price_input.text())
@@ -257,9 +252,7 @@ class ProductView(QWidget):
             return
         QMessageBox.information(self, "Success", "Product updated.")
         # Incremental UI update
-        self.product_table.setItem(selected, 1, QTableWidgetItem(name))
-        self.product_table.setItem(selected, 2, QTableWidgetItem(f"{price:,.2f}"))
-        self.product_table.setItem(selected, 3, QTableWidgetItem(str(stock)))
+        self.product_model.update_product(product_id, name, price, stock)
         self.filter_products(self.search_input.text())
         self.clear_inputs()
         # Refresh badge (no popup)
@@ -267,11 +260,11 @@ class ProductView(QWidget):
 
     # Act upon a click on Delete product
     def delete_product(self):
-        selected = self.product_table.currentRow()
+        selected, product = self._selected_product()
         if selected == -1:
             QMessageBox.warning(self, "Select Product", "Please select a product to delete.")
             return
-        product_id = int(self.product_table.item(selected, 0).text())
+        product_id = product[0]
         reply = QMessageBox.question(
             self,
             "Confirm Delete",
@@ -291,7 +284,7 @@ class ProductView(QWidget):
                 return
             QMessageBox.information(self, "Success", "Product deleted.")
             # Incremental UI update
-            self.product_table.removeRow(selected)
+            self.product_model.remove_product(product_id)
             self.clear_inputs()
             self.filter_products(self.search_input.text())
             # Refresh badge (no popup)
@@ -303,20 +296,19 @@ class ProductView(QWidget):
         self.price_input.clear()
         self.stock_input.clear()
 
-    def populate_fields_from_selection(self):
-        selected = self.product_table.currentRow()
+    def populate_fields_from_selection(self, *_args):
+        selected, product = self._selected_product()
         if selected == -1:
             self.clear_inputs()
             return
-        self.name_input.setText(self.product_table.item(selected, 1).text())
-        price_text = self.product_table.item(selected, 2).text()
-        try:
-            # Strip thousands separators only; headers carry currency symbol
-            price_numeric = price_text.replace(",", "").strip()
-        except Exception:
-            price_numeric = price_text
-        self.price_input.setText(price_numeric)
-        self.stock_input.setText(self.product_table.item(selected, 3).text())
+        _product_id, name, price, stock = product
+        self.name_input.setText(name)
+        # Plain number without thousands separators; headers carry currency symbol
+        self.price_input.setText(f"{price:.2f}")
+        self.stock_input.setText(str(stock))
+
+    def _on_settings_changed(self, _settings):
+        self.update_low_stock_badge()
 
     def update_low_stock_badge(self):
         """Compute low-stock count and notify parent via callback. Shows once per session initially."""
@@ -334,17 +326,5 @@ class ProductView(QWidget):
             pass
 
     def filter_products(self, text: str):
-        """Filter table rows by search text across all columns (case-insensitive)."""
-        text = (text or "").strip().lower()
-        for row in range(self.product_table.rowCount()):
-            if not text:
-                self.product_table.setRowHidden(row, False)
-                continue
-            # Check all visible columns
-            match = False
-            for col in range(self.product_table.columnCount()):
-                item = self.product_table.item(row, col)
-                if item and text in item.text().lower():
-                    match = True
-                    break
-            self.product_table.setRowHidden(row, not match)
+        """Filter rows by search text across all columns (case-insensitive)."""
+        self.product_proxy.set_search_text(text)
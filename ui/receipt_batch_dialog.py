@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+import threading
+
+from PyQt6.QtCore import QDate, QObject, QThread, pyqtSignal
+from PyQt6.QtWidgets import (
+    QCheckBox,
+    QDateEdit,
+    QDialog,
+    QFileDialog,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+)
+
+from utils.receipt_batch import BatchExportResult, export_receipts, invoice_ids_for_period
+
+
+class _ExportWorker(QObject):
+    """Runs export_receipts off the GUI thread; progress arrives through queued signals."""
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, invoice_ids, output_dir, merged_path, workers, cancel_event):
+        super().__init__()
+        self._args = (invoice_ids, output_dir, merged_path, workers)
+        self._cancel_event = cancel_event
+
+    def run(self):
+        invoice_ids, output_dir, merged_path, workers = self._args
+        try:
+            result = export_receipts(
+                invoice_ids,
+                output_dir,
+                merged_path=merged_path,
+                workers=workers,
+                progress=self.progress.emit,
+                cancel_event=self._cancel_event,
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(result)
+
+
+class BatchExportDialog(QDialog):
+    """Export every receipt in a date range (or a list of invoice numbers) to PDF."""
+
+    def __init__(self, parent=None, workers: int | None = None):
+        super().__init__(parent)
+        self.setWindowTitle("Batch Export Receipts")
+        self.setMinimumWidth(460)
+        self.workers = workers
+        self.export_result: BatchExportResult | None = None
+        self._thread: QThread | None = None
+        self._worker: _ExportWorker | None = None
+        self._cancel = threading.Event()
+
+        form = QFormLayout()
+        today = QDate.currentDate()
+        self.date_from = QDateEdit(QDate(today.year(), today.month(), 1))
+        self.date_from.setCalendarPopup(True)
+        self.date_from.setDisplayFormat("dd/MM/yyyy")
+        self.date_to = QDateEdit(today)
+        self.date_to.setCalendarPopup(True)
+        self.date_to.setDisplayFormat("dd/MM/yyyy")
+        form.addRow("From:", self.date_from)
+        form.addRow("To:", self.date_to)
+        self.ids_input = QLineEdit()
+        self.ids_input.setPlaceholderText("Optional, e.g. 12, 15, 40 (overrides the dates)")
+        form.addRow("Invoice #s:", self.ids_input)
+
+        folder_row = QHBoxLayout()
+        self.folder_input = QLineEdit()
+        browse = QPushButton("Browse…")
+        browse.clicked.connect(self._choose_folder)
+        folder_row.addWidget(self.folder_input)
+        folder_row.addWidget(browse)
+        form.addRow("Save to:", folder_row)
+        self.merged_check = QCheckBox("Also save all receipts in one PDF")
+        form.addRow("", self.merged_check)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        self.status_label = QLabel("")
+
+        buttons = QHBoxLayout()
+        buttons.addStretch(1)
+        self.start_button = QPushButton("Export")
+        self.start_button.clicked.connect(self.start_export)
+        self.cancel_button = QPushButton("Close")
+        self.cancel_button.clicked.connect(self.cancel_or_close)
+        buttons.addWidget(self.start_button)
+        buttons.addWidget(self.cancel_button)
+
+        layout = QVBoxLayout()
+        layout.addLayout(form)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+    def _choose_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Save Receipts To", self.folder_input.text())
+        if folder:
+            self.folder_input.setText(folder)
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def _selected_invoice_ids(self) -> list[int]:
+        text = self.ids_input.text().replace(" ", "")
+        if text:
+            return [int(part) for part in text.split(",") if part]
+        date_from = self.date_from.date().toString("yyyy-MM-dd")
+        date_to = self.date_to.date().toString("yyyy-MM-dd")
+        return invoice_ids_for_period(date_from, date_to)
+
+    def start_export(self):
+        if self.is_running():
+            return
+        folder = self.folder_input.text().strip()
+        if not folder:
+            QMessageBox.warning(self, "Batch Export", "Choose a folder to save the receipts in.")
+            return
+        try:
+            invoice_ids = self._selected_invoice_ids()
+        except ValueError:
+            QMessageBox.warning(self, "Batch Export", "Invoice numbers must be whole numbers separated by commas.")
+            return
+        if not invoice_ids:
+            QMessageBox.information(self, "Batch Export", "No invoices match the selection.")
+            return
+        merged_path = None
+        if self.merged_check.isChecked():
+            first, last = min(invoice_ids), max(invoice_ids)
+            merged_path = os.path.join(folder, f"receipts_{first}-{last}.pdf")
+
+        self._cancel.clear()
+        self.export_result = None
+        self.progress_bar.setRange(0, len(invoice_ids))
+        self.progress_bar.setValue(0)
+        self.status_label.setText(f"Exporting {len(invoice_ids)} receipt(s)…")
+        self.start_button.setEnabled(False)
+        self.cancel_button.setText("Cancel")
+
+        self._thread = QThread(self)
+        self._worker = _ExportWorker(invoice_ids, folder, merged_path, self.workers, self._cancel)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.progress.connect(self._on_progress)
+        self._worker.finished.connect(self._on_finished)
+        self._worker.failed.connect(self._on_failed)
+        self._thread.start()
+
+    def _on_progress(self, done: int, total: int):
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"{done} of {total}")
+
+    def _stop_thread(self):
+        if self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
+            self._thread.deleteLater()
+        self._thread = None
+        self._worker = None
+        self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setText("Close")
+
+    def _on_finished(self, result: BatchExportResult):
+        self._stop_thread()
+        self.export_result = result
+        summary = f"Exported {result.exported_count} receipt(s) in {result.elapsed:.1f}s."
+        if result.cancelled:
+            summary = "Cancelled. " + summary
+        if result.merged_path:
+            summary += f"\nMerged PDF: {result.merged_path}"
+        if result.merged_error:
+            summary += f"\nMerged PDF failed: {result.merged_error}"
+        if result.errors:
+            summary += f"\n{len(result.errors)} receipt(s) could not be exported."
+        self.status_label.setText(summary)
+
+    def _on_failed(self, message: str):
+        self._stop_thread()
+        self.status_label.setText("")
+        QMessageBox.critical(self, "Batch Export", f"Export failed:\n{message}")
+
+    def cancel_or_close(self):
+        if self.is_running():
+            self._cancel.set()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("Cancelling…")
+            return
+        self.reject()
+
+    def reject(self):
+        if self.is_running():
+            # Closing mid-export: stop handing out work and wait for running chunks
+            self._cancel.set()
+            self._stop_thread()
+        super().reject()
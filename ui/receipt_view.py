@@ -1,13 +1,16 @@
+import glob
+import os
 import tempfile
+import time
 import webbrowser
 
-from PyQt6.QtCore import QEvent, QObject, Qt
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
 from PyQt6.QtWidgets import (
     QComboBox,
-    QCompleter,
     QFileDialog,
     QHeaderView,
     QLabel,
+    QLineEdit,
     QMessageBox,
     QPushButton,
     QTableWidget,
@@ -16,8 +19,8 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from database.db_handler import get_db_connection
 from models.invoice import Invoice
+from models.thermal_receipt import configured_printer, render_escpos, send_to_printer
 from utils.ui_common import format_money_value
 
 try:
@@ -25,6 +28,21 @@ try:
 except ImportError:
     HAS_QPDFVIEW = False
 
+INVOICE_PAGE_SIZE = 100  # invoices added to the picker per page
+SEARCH_DEBOUNCE_MS = 250
+TEMP_RECEIPT_PREFIX = "tradia_receipt_"
+TEMP_RECEIPT_MAX_AGE_S = 3600  # PDFs handed to the viewer are removed on a later print
+
+
+def _prune_temp_receipts():
+    cutoff = time.time() - TEMP_RECEIPT_MAX_AGE_S
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), f"{TEMP_RECEIPT_PREFIX}*.pdf")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass  # still open in a viewer, or already gone
+
 
 class SelectAllOnFocus(QObject):
     def eventFilter(self, obj, event):
@@ -41,16 +59,26 @@ class ReceiptView(QWidget):
 
         focus_filter = SelectAllOnFocus()
 
+        # Search narrows the picker server-side (invoice # or customer name prefix)
+        self.invoice_search = QLineEdit()
+        self.invoice_search.setPlaceholderText("Search by invoice # or customer name")
+        self.invoice_search.setClearButtonEnabled(True)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.load_invoices)
+        self.invoice_search.textChanged.connect(self._search_timer.start)
+        self.layout.addWidget(QLabel("Search Invoices:"))
+        self.layout.addWidget(self.invoice_search)
+
+        # Invoices are loaded a page at a time, newest first; scrolling the popup loads more
+        self._last_invoice_id = None
+        self._has_more_invoices = False
         self.invoice_dropdown = QComboBox()
         self.invoice_dropdown.setEditable(True)
-        self.invoice_completer = QCompleter()
-        self.invoice_completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        # Set once to avoid resetting on every reload
-        self.invoice_completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        self.invoice_completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
-        self.invoice_dropdown.setCompleter(self.invoice_completer)
         self.invoice_dropdown.lineEdit().installEventFilter(focus_filter)
         self.invoice_dropdown.lineEdit().returnPressed.connect(self.show_receipt)
+        self.invoice_dropdown.view().verticalScrollBar().valueChanged.connect(self._on_invoice_list_scrolled)
         self.layout.addWidget(QLabel("Select Invoice:"))
         self.layout.addWidget(self.invoice_dropdown)
 
@@ -73,6 +101,10 @@ class ReceiptView(QWidget):
         self.export_pdf_button.clicked.connect(self.export_to_pdf)
         self.layout.addWidget(self.export_pdf_button)
 
+        self.batch_export_button = QPushButton("Batch Export…")
+        self.batch_export_button.clicked.connect(self.open_batch_export)
+        self.layout.addWidget(self.batch_export_button)
+
         self.setLayout(self.layout)
         self.load_invoices()
 
@@ -123,33 +155,44 @@ class ReceiptView(QWidget):
         }
         """
 
+    def _invoice_filters(self):
+        text = self.invoice_search.text().strip()
+        if not text:
+            return None
+        return {"invoice_id": int(text)} if text.isdigit() else {"customer": text}
+
     def load_invoices(self):
+        self._last_invoice_id = None
+        self._has_more_invoices = True
+        self.invoice_dropdown.clear()
+        self.load_more_invoices()
+
+    def load_more_invoices(self):
+        if not self._has_more_invoices:
+            return
         dd = self.invoice_dropdown
+        invoices = list(
+            Invoice.iter_invoices(
+                after_id=self._last_invoice_id, limit=INVOICE_PAGE_SIZE, filters=self._invoice_filters()
+            )
+        )
+        self._has_more_invoices = len(invoices) == INVOICE_PAGE_SIZE
+        if invoices:
+            self._last_invoice_id = invoices[-1].invoice_id
         dd.blockSignals(True)
         dd.setUpdatesEnabled(False)
         try:
-            dd.clear()
-            invoices = Invoice.get_all_invoices()
-            # Show newly created invoices at the top
-            invoices = sorted(invoices, key=lambda inv: getattr(inv, "invoice_id", 0), reverse=True)
-            invoice_strs = [
-                f"{inv.invoice_id} - {inv.customer_name} - {format_money_value(inv.total_amount)}" for inv in invoices
-            ]
-            if invoice_strs:
-                dd.addItems(invoice_strs)
-            # Keep completer bound to dropdown model
-            self.invoice_completer.setModel(dd.model())
+            for inv in invoices:
+                label = f"{inv.invoice_id} - {inv.customer_name} - {format_money_value(inv.total_amount)}"
+                dd.addItem(label, inv.invoice_id)
         finally:
             dd.blockSignals(False)
             dd.setUpdatesEnabled(True)
 
-    def get_wholesale_number(self):
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT wholesale_number FROM settings WHERE id=1")
-        result = cur.fetchone()
-        conn.close()
-        return result[0] if result and result[0] else "N/A"
+    def _on_invoice_list_scrolled(self, value):
+        bar = self.invoice_dropdown.view().verticalScrollBar()
+        if self._has_more_invoices and value >= bar.maximum() - bar.pageStep() // 2:
+            self.load_more_invoices()
 
     def show_receipt(self):
         self.receipt_table.setRowCount(0)
@@ -159,14 +202,11 @@ class ReceiptView(QWidget):
 
         invoice_text = self.invoice_dropdown.currentText()
         invoice_id = int(invoice_text.split(" - ")[0])
-        invoice = Invoice.get_invoice_by_id(invoice_id)
-        if not invoice:
+        formatted = Invoice.get_formatted_receipt(invoice_id)
+        if not formatted:
             QMessageBox.warning(self, "Load Error", "Invoice not found.")
             return
 
-        wholesale_number = self.get_wholesale_number()
-        formatted = Invoice.format_receipt_data(invoice, wholesale_number)
-
         # Remove previous details if any
         if hasattr(self, "details_label"):
             self.layout.removeWidget(self.details_label)
@@ -217,28 +257,38 @@ class ReceiptView(QWidget):
         file_path, _ = QFileDialog.getSaveFileName(self, "Save Invoice as PDF", default_filename, "PDF Files (*.pdf)")
         if not file_path:
             return
-        invoice = Invoice.get_invoice_by_id(invoice_id)
-        if not invoice:
+        formatted = Invoice.get_formatted_receipt(invoice_id)
+        if not formatted:
             QMessageBox.warning(self, "Export Error", "Invoice not found.")
             return
-        wholesale_number = self.get_wholesale_number()
-        formatted = Invoice.format_receipt_data(invoice, wholesale_number)
         Invoice.export_receipt_to_pdf(formatted, file_path)
         QMessageBox.information(self, "Export Complete", f"Receipt saved to {file_path}")
 
+    def open_batch_export(self):
+        from ui.receipt_batch_dialog import BatchExportDialog
+
+        BatchExportDialog(self).exec()
+
     def print_receipt(self):
         if self.invoice_dropdown.currentIndex() == -1:
             QMessageBox.warning(self, "Print Error", "Please load a receipt first.")
             return
         invoice_text = self.invoice_dropdown.currentText()
         invoice_id = int(invoice_text.split(" - ")[0])
-        invoice = Invoice.get_invoice_by_id(invoice_id)
-        if not invoice:
+        formatted = Invoice.get_formatted_receipt(invoice_id)
+        if not formatted:
             QMessageBox.warning(self, "Print Error", "Invoice not found.")
             return
-        wholesale_number = self.get_wholesale_number()
-        formatted = Invoice.format_receipt_data(invoice, wholesale_number)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        printer, paper_mm = configured_printer()
+        if printer:
+            # Till printer configured: send ESC/POS straight to it
+            try:
+                send_to_printer(render_escpos(formatted, paper_mm), printer)
+            except OSError as e:
+                QMessageBox.warning(self, "Print Error", f"Could not reach the receipt printer ({printer}):\n{e}")
+            return
+        _prune_temp_receipts()
+        with tempfile.NamedTemporaryFile(delete=False, prefix=TEMP_RECEIPT_PREFIX, suffix=".pdf") as tmp:
             tmp_path = tmp.name
         Invoice.export_receipt_to_pdf(formatted, tmp_path)
         webbrowser.open(tmp_path)
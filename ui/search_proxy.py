@@ -0,0 +1,245 @@
+"""Search filter proxy shared by the products and customers tables.
+
+Source models keep one precomputed lowercase search key per row (all columns
+joined with a separator that cannot be typed) and expose it through
+``search_keys()``. Filtering is then a single substring scan over a Python
+list, and the proxy holds the sorted list of matching source rows. While the
+user keeps typing (the new text extends the previous one) only rows that
+already matched are re-checked.
+
+QSortFilterProxyModel was measured first: its per-row filterAcceptsRow
+callback into Python alone costs ~50 ms for 50k rows, which is the whole
+per-keystroke budget, so rows are mapped here instead.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+from PyQt6.QtCore import QAbstractProxyModel, QModelIndex, QObject
+
+SEARCH_KEY_SEPARATOR = "\x1f"
+_ROOT = QModelIndex()
+
+
+def make_search_key(*values) -> str:
+    """Lowercase search key for one row; the separator keeps matches within a single column."""
+    return SEARCH_KEY_SEPARATOR.join("" if v is None else str(v) for v in values).lower()
+
+
+class SearchFilterProxyModel(QAbstractProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._text = ""
+        self._rows: list[int] | None = None  # matching source rows (ascending); None = no filter
+        self._pending_removal = (0, 0)  # proxy rows [lo, hi) being removed
+
+    # ----- filtering ----- #
+    def search_text(self) -> str:
+        return self._text
+
+    def set_search_text(self, text: str):
+        text = (text or "").strip().lower()
+        if text == self._text:
+            return
+        previous, self._text = self._text, text
+        source = self._searchable_source()
+        if source is None:
+            return
+        if text:
+            self._fetch_all(source)
+        keys = source.search_keys()
+        self.beginResetModel()
+        if not text:
+            self._rows = None
+        elif previous and text.startswith(previous) and self._rows is not None:
+            # Narrowing: only rows that matched the shorter text can still match
+            self._rows = [r for r in self._rows if text in keys[r]]
+        else:
+            self._rows = self._scan(source)
+        self.endResetModel()
+
+    @staticmethod
+    def _fetch_all(source):
+        # Search covers rows the source hasn't handed to views yet
+        fetch_all = getattr(source, "fetch_all", None)
+        if callable(fetch_all):
+            fetch_all()
+
+    def _scan(self, source) -> list[int]:
+        text = self._text
+        keys = source.search_keys()
+        n = source.rowCount()
+        if n == len(keys):
+            return [r for r, key in enumerate(keys) if text in key]
+        return [r for r in range(n) if text in keys[r]]
+
+    def _searchable_source(self):
+        """The source model; it must provide search_keys() and may provide fetch_all()."""
+        return self.sourceModel()
+
+    def _matches(self, source_row: int) -> bool:
+        return not self._text or self._text in self._searchable_source().search_keys()[source_row]
+
+    # ----- source wiring ----- #
+    def setSourceModel(self, source):
+        old = self.sourceModel()
+        if old is not None:
+            for signal, slot in self._connections():
+                getattr(old, signal).disconnect(slot)
+        self.beginResetModel()
+        super().setSourceModel(source)
+        self._rows = None
+        self._text = ""
+        if source is not None:
+            for signal, slot in self._connections():
+                getattr(source, signal).connect(slot)
+        self.endResetModel()
+
+    def _connections(self):
+        return (
+            ("modelAboutToBeReset", self.beginResetModel),
+            ("modelReset", self._on_source_reset),
+            ("rowsAboutToBeInserted", self._on_rows_about_to_be_inserted),
+            ("rowsInserted", self._on_rows_inserted),
+            ("rowsAboutToBeRemoved", self._on_rows_about_to_be_removed),
+            ("rowsRemoved", self._on_rows_removed),
+            ("dataChanged", self._on_data_changed),
+        )
+
+    def _on_source_reset(self):
+        source = self._searchable_source()
+        if self._text:
+            self._rows = self._scan(source)
+        self.endResetModel()
+        if self._text:
+            self._fetch_all(source)
+
+    def _on_rows_about_to_be_inserted(self, parent, first, last):
+        if self._rows is None and not parent.isValid():
+            self.beginInsertRows(_ROOT, first, last)
+
+    def _on_rows_inserted(self, parent, first, last):
+        if parent.isValid():
+            return
+        if self._rows is None:
+            self.endInsertRows()
+            return
+        count = last - first + 1
+        pos = bisect_left(self._rows, first)
+        # Shift rows after the insertion point, then add the new rows that match
+        for i in range(pos, len(self._rows)):
+            self._rows[i] += count
+        added = [r for r in range(first, last + 1) if self._matches(r)]
+        if added:
+            self.beginInsertRows(_ROOT, pos, pos + len(added) - 1)
+            self._rows[pos:pos] = added
+            self.endInsertRows()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        if parent.isValid():
+            return
+        if self._rows is None:
+            self.beginRemoveRows(_ROOT, first, last)
+            return
+        lo = bisect_left(self._rows, first)
+        hi = bisect_left(self._rows, last + 1)
+        if hi > lo:
+            self.beginRemoveRows(_ROOT, lo, hi - 1)
+        self._pending_removal = (lo, hi)
+
+    def _on_rows_removed(self, parent, first, last):
+        if parent.isValid():
+            return
+        if self._rows is None:
+            self.endRemoveRows()
+            return
+        lo, hi = self._pending_removal
+        count = last - first + 1
+        del self._rows[lo:hi]
+        for i in range(lo, len(self._rows)):
+            self._rows[i] -= count
+        if hi > lo:
+            self.endRemoveRows()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        if self._rows is None:
+            self.dataChanged.emit(self.mapFromSource(top_left), self.mapFromSource(bottom_right), roles)
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            pos = bisect_left(self._rows, row)
+            present = pos < len(self._rows) and self._rows[pos] == row
+            if present and not self._matches(row):
+                self.beginRemoveRows(_ROOT, pos, pos)
+                del self._rows[pos]
+                self.endRemoveRows()
+            elif not present and self._matches(row):
+                self.beginInsertRows(_ROOT, pos, pos)
+                self._rows.insert(pos, row)
+                self.endInsertRows()
+            elif present:
+                last_col = self.columnCount() - 1
+                self.dataChanged.emit(self.index(pos, 0), self.index(pos, last_col), roles)
+
+    # ----- mapping ----- #
+    def mapToSource(self, proxy_index):
+        source = self.sourceModel()
+        if source is None or not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row()
+        if self._rows is not None:
+            if row >= len(self._rows):
+                return QModelIndex()
+            row = self._rows[row]
+        return source.index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if self.sourceModel() is None or not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._rows is not None:
+            pos = bisect_left(self._rows, row)
+            if pos >= len(self._rows) or self._rows[pos] != row:
+                return QModelIndex()
+            row = pos
+        return self.index(row, source_index.column())
+
+    def source_row(self, proxy_row: int) -> int:
+        """Source row for a proxy row, or -1."""
+        if proxy_row < 0:
+            return -1
+        if self._rows is None:
+            return proxy_row
+        return self._rows[proxy_row] if proxy_row < len(self._rows) else -1
+
+    # ----- Qt model API ----- #
+    def index(self, row, column, parent=_ROOT):
+        if parent.isValid() or row < 0 or column < 0:
+            return QModelIndex()
+        if row >= self.rowCount() or column >= self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return QObject.parent(self)
+        return QModelIndex()
+
+    def rowCount(self, parent=_ROOT):
+        source = self.sourceModel()
+        if source is None or parent.isValid():
+            return 0
+        return source.rowCount() if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=_ROOT):
+        source = self.sourceModel()
+        return 0 if source is None or parent.isValid() else source.columnCount()
+
+    def canFetchMore(self, parent=_ROOT):
+        source = self.sourceModel()
+        return self._rows is None and source is not None and not parent.isValid() and source.canFetchMore(_ROOT)
+
+    def fetchMore(self, parent=_ROOT):
+        source = self.sourceModel()
+        if self._rows is None and source is not None and not parent.isValid():
+            source.fetchMore(_ROOT)
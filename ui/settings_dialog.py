@@ -1,12 +1,16 @@
+from datetime import datetime
+
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (
+    QComboBox,
     QDialog,
     QFileDialog,
     QHBoxLayout,
     QLabel,
     QLineEdit,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QScrollArea,
     QSpinBox,
@@ -16,14 +20,18 @@ from PyQt6.QtWidgets import (
 )
 
 from database.db_handler import get_db_connection
+from ui.backup_job import BackupJob, RestoreJob
+from utils.app_settings import DEFAULT_THANK_YOU, get_settings, invalidate_settings
 from utils.backup import (
     _get_retention_count,
     get_last_backup_time,
-    perform_backup,
     resolve_backup_dir,
     update_backup_directory,
     update_retention_count,
 )
+from utils.backup_catalog import load_catalog
+
+BACKUP_CANCEL_WAIT_S = 10.0
 
 
 class SettingsDialog(QDialog):
@@ -65,6 +73,7 @@ class SettingsDialog(QDialog):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         content_widget = QWidget()
+        self.content_widget = content_widget
         content_layout = QVBoxLayout(content_widget)
         content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.setSpacing(10)
@@ -129,14 +138,40 @@ class SettingsDialog(QDialog):
         content_layout.addWidget(backup_dir_label)
         content_layout.addLayout(backup_hbox)
 
-        backup_now_btn = QPushButton("Backup Now")
-        backup_now_btn.setToolTip("Create a backup now to the configured directory")
-        backup_now_btn.clicked.connect(self.backup_now)
-        content_layout.addWidget(backup_now_btn)
+        self.backup_now_btn = QPushButton("Backup Now")
+        self.backup_now_btn.setToolTip("Create a backup now to the configured directory")
+        self.backup_now_btn.clicked.connect(self.backup_now)
+        content_layout.addWidget(self.backup_now_btn)
+        # Backups run on a worker thread; the dialog stays responsive and can cancel
+        self.backup_job = BackupJob(self)
+        self.backup_job.progress.connect(self._on_backup_progress)
+        self.backup_job.finished.connect(self._on_backup_finished)
+        self.backup_job.failed.connect(self._on_backup_failed)
+        self.backup_job.cancelled.connect(self._on_backup_cancelled)
+        self._backup_progress: QProgressDialog | None = None
 
         self.last_backup_label = QLabel("Last Backup: (checking...)")
         content_layout.addWidget(self.last_backup_label)
 
+        restore_label = QLabel("Restore from backup:")
+        restore_label.setFont(bold_font)
+        self.restore_combo = QComboBox()
+        self.restore_combo.setToolTip("Backups in the backup directory, newest first.")
+        self.restore_btn = QPushButton("Restore…")
+        self.restore_btn.setToolTip("Replace all current data with the selected backup")
+        self.restore_btn.clicked.connect(self.restore_selected_backup)
+        # Restores also run on a worker thread, with the dialog disabled until done
+        self.restore_job = RestoreJob(self)
+        self.restore_job.progress.connect(self._on_restore_progress)
+        self.restore_job.finished.connect(self._on_restore_finished)
+        self.restore_job.failed.connect(self._on_restore_failed)
+        self._restore_progress: QProgressDialog | None = None
+        restore_hbox = QHBoxLayout()
+        restore_hbox.addWidget(self.restore_combo, 1)
+        restore_hbox.addWidget(self.restore_btn)
+        content_layout.addWidget(restore_label)
+        content_layout.addLayout(restore_hbox)
+
         retention_layout = QHBoxLayout()
         retention_label = QLabel("Retention (number of backups to keep):")
         retention_label.setFont(bold_font)
@@ -223,27 +258,15 @@ class SettingsDialog(QDialog):
 
     def load_wholesale_settings(self):
         try:
-            conn = get_db_connection()
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT wholesale_number, wholesale_name, wholesale_address, "
-                "backup_directory, receipt_thank_you, receipt_notes, low_stock_threshold "
-                "FROM settings WHERE id=1"
-            )
-            result = cur.fetchone()
-            conn.close()
-            if result:
-                self.wholesale_edit.setText(result[0] or "")
-                self.wholesale_name_edit.setText(result[1] or "")
-                self.wholesale_address_edit.setText(result[2] or "")
-                self.backup_dir_edit.setText(result[3] or "")
-                # New fields (with sensible defaults)
-                self.thank_you_edit.setText(result[4] or "Thank you for buying from us!")
-                self.receipt_notes_edit.setPlainText(result[5] or "")
-                try:
-                    self.low_stock_spin.setValue(int(result[6]) if result[6] is not None else 10)
-                except Exception:
-                    self.low_stock_spin.setValue(10)
+            settings = get_settings()
+            self.wholesale_edit.setText(settings.wholesale_number or "")
+            self.wholesale_name_edit.setText(settings.wholesale_name or "")
+            self.wholesale_address_edit.setText(settings.wholesale_address or "")
+            self.backup_dir_edit.setText(settings.backup_directory or "")
+            # New fields (with sensible defaults)
+            self.thank_you_edit.setText(settings.thank_you)
+            self.receipt_notes_edit.setPlainText(settings.notes)
+            self.low_stock_spin.setValue(settings.threshold)
             self.refresh_backup_status()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load settings.\n{e}")
@@ -254,6 +277,69 @@ class SettingsDialog(QDialog):
             self.last_backup_label.setText("Last Backup: Never")
         else:
             self.last_backup_label.setText(f"Last Backup: {last.strftime('%Y-%m-%d %H:%M:%S')}")
+        self.load_restore_points()
+
+    def load_restore_points(self):
+        self.restore_combo.clear()
+        try:
+            directory = resolve_backup_dir()
+            entries = load_catalog(directory)
+        except Exception:
+            entries = []
+        for entry in reversed(entries):
+            when = datetime.fromtimestamp(entry.created).strftime("%Y-%m-%d %H:%M:%S")
+            self.restore_combo.addItem(f"{when} – {entry.kind} – {entry.size / 1e6:.1f} MB", entry.path(directory))
+        self.restore_btn.setEnabled(bool(entries))
+
+    def restore_selected_backup(self):
+        path = self.restore_combo.currentData()
+        if not path or self.backup_job.is_running() or self.restore_job.is_running():
+            return
+        answer = QMessageBox.question(
+            self,
+            "Restore Backup",
+            f"Replace ALL current data with the backup from {self.restore_combo.currentText().split(' – ')[0]}?\n\n"
+            "A copy of the current database is kept next to it (.pre-restore).",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        progress = QProgressDialog("Restoring backup…", None, 0, 0, self)
+        progress.setWindowTitle("Restore")
+        # Nothing else may touch the database until the swap is done
+        progress.setWindowModality(Qt.WindowModality.ApplicationModal)
+        progress.setMinimumDuration(0)
+        self._restore_progress = progress
+        self.content_widget.setEnabled(False)
+        self.save_btn.setEnabled(False)
+        self.restore_job.start(path, username=getattr(self.parent(), "logged_in_user", None))
+
+    def _on_restore_progress(self, done: int, total: int):
+        if self._restore_progress is not None:
+            self._restore_progress.setMaximum(max(total, 1))
+            self._restore_progress.setValue(done)
+
+    def _end_restore(self):
+        if self._restore_progress is not None:
+            self._restore_progress.close()
+            self._restore_progress.deleteLater()
+            self._restore_progress = None
+        self.content_widget.setEnabled(True)
+        self.save_btn.setEnabled(True)
+
+    def _on_restore_finished(self, result):
+        self._end_restore()
+        self.load_wholesale_settings()
+        QMessageBox.information(
+            self,
+            "Backup Restored",
+            f"Database restored in {result.elapsed:.1f} s.\nPrevious data saved at:\n{result.previous_path}",
+        )
+
+    def _on_restore_failed(self, message: str):
+        self._end_restore()
+        QMessageBox.critical(self, "Restore Failed", f"The backup was not restored; your data is unchanged.\n{message}")
 
     def choose_backup_directory(self):
         directory = QFileDialog.getExistingDirectory(self, "Select Backup Directory", resolve_backup_dir())
@@ -261,6 +347,8 @@ class SettingsDialog(QDialog):
             self.backup_dir_edit.setText(directory)
 
     def backup_now(self):
+        if self.backup_job.is_running():
+            return
         # Ensure backup directory saved first if user changed it
         if self.backup_dir_edit.text().strip():
             try:
@@ -268,12 +356,51 @@ class SettingsDialog(QDialog):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to update backup directory before backup: {e}")
                 return
-        try:
-            path = perform_backup()
-            self.refresh_backup_status()
-            QMessageBox.information(self, "Backup Created", f"Backup stored at:\n{path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Backup Failed", f"Backup could not be created:\n{e}")
+        progress = QProgressDialog("Creating backup…", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Backup")
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.setMinimumDuration(500)  # only appears if the backup takes a while
+        progress.canceled.connect(self.backup_job.cancel)
+        self._backup_progress = progress
+        self.backup_now_btn.setEnabled(False)
+        self.backup_job.start()
+
+    def _on_backup_progress(self, done: int, total: int):
+        if self._backup_progress is not None:
+            self._backup_progress.setMaximum(max(total, 1))
+            self._backup_progress.setValue(done)
+
+    def _end_backup(self):
+        if self._backup_progress is not None:
+            self._backup_progress.close()
+            self._backup_progress.deleteLater()
+            self._backup_progress = None
+        self.backup_now_btn.setEnabled(True)
+
+    def _on_backup_finished(self, path: str):
+        self._end_backup()
+        self.refresh_backup_status()
+        QMessageBox.information(self, "Backup Created", f"Backup stored at:\n{path}")
+
+    def _on_backup_failed(self, message: str):
+        self._end_backup()
+        QMessageBox.critical(self, "Backup Failed", f"Backup could not be created:\n{message}")
+
+    def _on_backup_cancelled(self):
+        self._end_backup()
+        QMessageBox.information(self, "Backup Cancelled", "The backup was cancelled; no backup was saved.")
+
+    def done(self, result):
+        if self.restore_job.is_running():
+            return  # the swap cannot be interrupted; stay open until the job reports back
+        if self.backup_job.is_running():
+            # Closing mid-backup: stop at the next step rather than leave a thread behind
+            self.backup_job.blockSignals(True)
+            self.backup_job.cancel()
+            self.backup_job.wait(BACKUP_CANCEL_WAIT_S)
+            self._end_backup()
+        super().done(result)
 
     def save_wholesale_number(self):
         new_number = self.wholesale_edit.text().strip()
@@ -308,7 +435,7 @@ class SettingsDialog(QDialog):
                     new_address,
                     backup_dir,
                     retention_val,
-                    thank_you or "Thank you for buying from us!",
+                    thank_you or DEFAULT_THANK_YOU,
                     receipt_notes,
                     low_stock_threshold,
                 ),
@@ -319,6 +446,7 @@ class SettingsDialog(QDialog):
                 update_retention_count(retention_val)
             except Exception:
                 pass
+            invalidate_settings()
             QMessageBox.information(self, "Saved", "Settings updated successfully.")
             self.refresh_backup_status()
         except Exception as e:
@@ -0,0 +1,220 @@
+"""Retention and archiving for the activity log.
+
+Rows older than the age limit, and rows beyond the newest max_rows, are moved
+out of activity_log into gzip-compressed monthly archive files
+(activity_YYYY-MM.jsonl.gz, one JSON object per line) and then deleted. Work
+is done in batches: each batch is appended to its archive files and synced
+before the matching rows are deleted in one transaction. A crash in between
+can repeat rows in the archive on the next run, but never loses any; every
+line carries the row id, which read_archive uses to skip repeats.
+
+Limits come from the environment (0 disables a limit):
+
+- TRADIA_ACTIVITY_RETENTION_DAYS (default 365)
+- TRADIA_ACTIVITY_MAX_ROWS (default 100000)
+- TRADIA_ACTIVITY_ARCHIVE_DIR (default: activity_archive next to the database)
+
+Command line::
+
+    python -m utils.activity_archive [--days N] [--max-rows N] [--dir PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import gzip
+import json
+import logging
+import os
+from collections.abc import Iterator
+
+from database.db_handler import get_db_connection, resolve_db_path
+from utils.activity_log import flush_activity_log
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DAYS_ENV_KEY = "TRADIA_ACTIVITY_RETENTION_DAYS"
+MAX_ROWS_ENV_KEY = "TRADIA_ACTIVITY_MAX_ROWS"
+ARCHIVE_DIR_ENV_KEY = "TRADIA_ACTIVITY_ARCHIVE_DIR"
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_MAX_ROWS = 100_000
+ARCHIVE_BATCH_SIZE = 5000
+ARCHIVE_PREFIX = "activity_"
+ARCHIVE_SUFFIX = ".jsonl.gz"
+_COLUMNS = ("id", "timestamp", "username", "action_type", "details")
+
+
+class ArchiveResult:
+    """Outcome of apply_retention: rows moved and the archive files written to."""
+
+    def __init__(self):
+        self.archived = 0
+        self.files: set[str] = set()
+
+
+def _env_limit(key: str, default: int) -> int:
+    raw = (os.environ.get(key) or "").strip()
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        logger.warning("Ignoring %s=%r (expected a whole number)", key, raw)
+        return default
+
+
+def configured_retention() -> tuple[int, int]:
+    """(max age in days, max rows) from the environment; 0 means no limit."""
+    return _env_limit(RETENTION_DAYS_ENV_KEY, DEFAULT_RETENTION_DAYS), _env_limit(MAX_ROWS_ENV_KEY, DEFAULT_MAX_ROWS)
+
+
+def resolve_archive_dir() -> str:
+    configured = (os.environ.get(ARCHIVE_DIR_ENV_KEY) or "").strip()
+    if configured:
+        return configured
+    db_path = resolve_db_path()
+    base = os.path.dirname(os.path.abspath(db_path)) if db_path != ":memory:" else os.getcwd()
+    return os.path.join(base, "activity_archive")
+
+
+def archive_path(directory: str, month: str) -> str:
+    return os.path.join(directory, f"{ARCHIVE_PREFIX}{month}{ARCHIVE_SUFFIX}")
+
+
+def list_archives(directory: str | None = None) -> list[str]:
+    """Archive files in the directory, oldest month first."""
+    directory = directory or resolve_archive_dir()
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(n for n in os.listdir(directory) if n.startswith(ARCHIVE_PREFIX) and n.endswith(ARCHIVE_SUFFIX))
+    return [os.path.join(directory, n) for n in names]
+
+
+def read_archive(path: str) -> Iterator[dict]:
+    """Yield archived rows as dicts, in the order they were archived."""
+    seen: set[int] = set()
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if row["id"] in seen:
+                continue
+            seen.add(row["id"])
+            yield row
+
+
+def _append(directory: str, rows: list[tuple]) -> set[str]:
+    by_month: dict[str, list[tuple]] = {}
+    for row in rows:
+        by_month.setdefault(str(row[1])[:7], []).append(row)
+    written = set()
+    for month, month_rows in by_month.items():
+        path = archive_path(directory, month)
+        # Appending adds a gzip member; readers see one continuous stream
+        with open(path, "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+                for row in month_rows:
+                    gz.write(
+                        (json.dumps(dict(zip(_COLUMNS, row, strict=True)), ensure_ascii=False) + "\n").encode("utf-8")
+                    )
+            raw.flush()
+            os.fsync(raw.fileno())
+        written.add(path)
+    return written
+
+
+def _archive_bounds(conn, max_age_days: int, max_rows: int, now: _dt.datetime) -> tuple[int, int, str | None]:
+    """(highest id beyond the row limit, highest id to look at, age cutoff timestamp)."""
+    row_limit_id = 0
+    last_id = 0
+    cutoff_ts = None
+    if max_rows:
+        row = conn.execute("SELECT id FROM activity_log ORDER BY id DESC LIMIT 1 OFFSET ?", (max_rows,)).fetchone()
+        if row is not None:
+            row_limit_id = last_id = row[0]
+    if max_age_days:
+        cutoff_ts = (now - _dt.timedelta(days=max_age_days)).strftime("%Y-%m-%d %H:%M:%S")
+        row = conn.execute("SELECT MAX(id) FROM activity_log WHERE timestamp < ?", (cutoff_ts,)).fetchone()
+        last_id = max(last_id, row[0] or 0)
+    return row_limit_id, last_id, cutoff_ts
+
+
+def apply_retention(
+    max_age_days: int | None = None,
+    max_rows: int | None = None,
+    archive_dir: str | None = None,
+    now: _dt.datetime | None = None,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> ArchiveResult:
+    """Archive and delete rows older than max_age_days or beyond the newest max_rows.
+
+    Limits default to configured_retention(); pass 0 to disable one.
+    """
+    env_days, env_rows = configured_retention()
+    max_age_days = env_days if max_age_days is None else max(0, int(max_age_days))
+    max_rows = env_rows if max_rows is None else max(0, int(max_rows))
+    result = ArchiveResult()
+    if not max_age_days and not max_rows:
+        return result
+    flush_activity_log()
+    now = now or _dt.datetime.now()
+    conn = get_db_connection()
+    try:
+        row_limit_id, last_id, cutoff_ts = _archive_bounds(conn, max_age_days, max_rows, now)
+        if not last_id:
+            return result
+        # Rows past the row limit go regardless of age; older rows go by timestamp
+        condition = "id <= ?"
+        condition_args: list = [row_limit_id]
+        if cutoff_ts is not None:
+            condition = "(id <= ? OR +timestamp < ?)"
+            condition_args.append(cutoff_ts)
+        directory = archive_dir or resolve_archive_dir()
+        os.makedirs(directory, exist_ok=True)
+        after_id = 0
+        while True:
+            rows = conn.execute(
+                f"SELECT id, timestamp, username, action_type, details FROM activity_log "
+                f"WHERE id > ? AND id <= ? AND {condition} ORDER BY id LIMIT ?",
+                (after_id, last_id, *condition_args, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            result.files |= _append(directory, rows)
+            conn.execute(
+                f"DELETE FROM activity_log WHERE id BETWEEN ? AND ? AND {condition}",
+                (rows[0][0], rows[-1][0], *condition_args),
+            )
+            conn.commit()
+            result.archived += len(rows)
+            after_id = rows[-1][0]
+    finally:
+        conn.close()
+    if result.archived:
+        logger.info("Archived %d activity log row(s) to %s", result.archived, directory)
+    return result
+
+
+def main(argv=None) -> int:
+    from database.db_handler import initialize_database
+
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.activity_archive", description="Archive old activity log rows."
+    )
+    parser.add_argument(
+        "--days", type=int, default=None, help="archive rows older than this many days (0: no age limit)"
+    )
+    parser.add_argument("--max-rows", type=int, default=None, help="keep at most this many rows (0: no row limit)")
+    parser.add_argument("--dir", default=None, help="archive folder (default: activity_archive next to the database)")
+    args = parser.parse_args(argv)
+
+    initialize_database()
+    result = apply_retention(args.days, args.max_rows, args.dir)
+    print(f"Archived {result.archived} row(s)")
+    for path in sorted(result.files):
+        print(f"  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,29 +2,195 @@
 
 Table: activity_log(id, timestamp, username, action_type, details)
 Added via migration 4.
+
+log_action only timestamps the event and puts it on a bounded queue; a
+background thread writes queued rows with executemany in batches, either
+when BATCH_SIZE rows are waiting or FLUSH_INTERVAL_S after the first one
+arrived. Each event remembers the database it was logged against. Readers
+in this module flush first, and the queue is flushed on application close
+and at interpreter exit. If the queue is full (the database is unavailable
+for a long time) new events are dropped and counted rather than blocking the
+caller.
+
+iter_activity browses the log newest first with keyset paging on id;
+retention and archiving live in utils.activity_archive.
 """
 
 from __future__ import annotations
 
+import atexit
+import logging
+import queue
+import threading
+import time
 from datetime import datetime
+from itertools import groupby
+
+from database.db_handler import get_db_connection, resolve_db_path
+
+logger = logging.getLogger(__name__)
+
+MAX_QUEUE = 10_000
+BATCH_SIZE = 200
+FLUSH_INTERVAL_S = 0.5
+ACTIVITY_PAGE_SIZE = 200
+SYSTEM_USER = "(system)"  # shown for rows logged without a username
+
+_INSERT = "INSERT INTO activity_log(timestamp, username, action_type, details) VALUES(?, ?, ?, ?)"
+_ACTIVITY_FILTER_KEYS = {"username", "action_type", "date_from", "date_to"}
+_FLUSH = object()  # queue marker: write what has been collected now
+_STOP = object()  # queue marker: write, then end the thread
+
+
+class ActivityLogWriter:
+    """Background batch writer for activity_log rows."""
+
+    def __init__(
+        self, max_queue: int = MAX_QUEUE, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL_S
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.stats = {"written": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, db_path: str, row: tuple):
+        if db_path == ":memory:":
+            # Private per-connection database: the writer thread would not see it
+            self._write([(db_path, row)])
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((db_path, row))
+        except queue.Full:
+            with self._lock:
+                self.stats["dropped"] += 1
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Write everything queued so far. Returns False if the timeout expired first."""
+        with self._lock:
+            running = self._thread is not None and self._thread.is_alive()
+        if not running:
+            return self._queue.unfinished_tasks == 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            # A full queue (writer stuck on a locked database) must not block past the timeout
+            self._queue.put((_FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def shutdown(self, timeout: float | None = 5.0):
+        """Flush and stop the writer thread (it restarts on the next event)."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put((_STOP, None), timeout=timeout)
+        except queue.Full:
+            logger.warning("Activity log queue still full; writer left running (%d queued)", self.queue_depth)
+            with self._lock:
+                if self._thread is None:
+                    self._thread = thread
+            return
+        thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        q = self._queue
+        while True:
+            batch: list[tuple[str, tuple]] = []
+            signals: list[threading.Event] = []
+            stop = False
+            item = q.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                kind, payload = item
+                if kind is _FLUSH:
+                    signals.append(payload)
+                    break
+                if kind is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + len(signals) + (1 if stop else 0)):
+                q.task_done()
+            for signal in signals:
+                signal.set()
+            if stop:
+                return
+
+    def _write(self, batch: list[tuple[str, tuple]]):
+        for db_path, group in groupby(batch, key=lambda item: item[0]):
+            rows = [row for _, row in group]
+            try:
+                conn = get_db_connection(db_path)
+                try:
+                    conn.executemany(_INSERT, rows)
+                    conn.commit()
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.warning("Could not write %d activity log row(s): %s", len(rows), e)
+                with self._lock:
+                    self.stats["failed"] += len(rows)
+                continue
+            with self._lock:
+                self.stats["written"] += len(rows)
+                self.stats["batches"] += 1
+
 
-from database.db_handler import get_db_connection
+_WRITER = ActivityLogWriter()
+atexit.register(_WRITER.shutdown)
+
+
+def get_activity_log_writer() -> ActivityLogWriter:
+    return _WRITER
+
+
+def flush_activity_log(timeout: float | None = 5.0) -> bool:
+    return _WRITER.flush(timeout)
+
+
+def activity_log_stats() -> dict:
+    """Writer counters plus the current queue depth."""
+    return {**_WRITER.stats, "queue_depth": _WRITER.queue_depth}
 
 
 def log_action(username: str | None, action_type: str, details: str = ""):
-    """Insert an action record. Username may be None (system events)."""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """INSERT INTO activity_log(timestamp, username, action_type, details)
-            VALUES(?, ?, ?, ?)""",
-        (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), username, action_type, details[:500]),
-    )
-    conn.commit()
-    conn.close()
+    """Queue an action record. Username may be None (system events)."""
+    row = (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), username, action_type, (details or "")[:500])
+    _WRITER.submit(resolve_db_path(), row)
 
 
 def fetch_recent(limit: int = 200) -> list[tuple]:
+    flush_activity_log()
     conn = get_db_connection()
     cur = conn.cursor()
     cur.execute(
@@ -35,3 +201,84 @@ def fetch_recent(limit: int = 200) -> list[tuple]:
     rows = cur.fetchall()
     conn.close()
     return rows
+
+
+def _activity_filter_sql(conn, filters) -> tuple[list[str], list] | None:
+    """WHERE clauses and parameters for iter_activity, or None if nothing can match."""
+    unknown = set(filters) - _ACTIVITY_FILTER_KEYS
+    if unknown:
+        raise ValueError(f"Unsupported activity filter(s): {', '.join(sorted(unknown))}")
+    clauses: list[str] = []
+    params: list = []
+    if filters.get("username") == SYSTEM_USER:
+        clauses.append("username IS NULL")
+    elif filters.get("username"):
+        clauses.append("username = ?")
+        params.append(str(filters["username"]))
+    if filters.get("action_type"):
+        clauses.append("action_type = ?")
+        params.append(str(filters["action_type"]))
+    date_clauses: list[str] = []
+    date_params: list = []
+    if filters.get("date_from"):
+        date_clauses.append("timestamp >= ?")
+        date_params.append(str(filters["date_from"]))
+    if filters.get("date_to"):
+        # Timestamps are "YYYY-MM-DD HH:MM:SS"; include the whole end day
+        date_clauses.append("timestamp < date(?, '+1 day')")
+        date_params.append(str(filters["date_to"]))
+    if date_clauses:
+        # Turn the date range into an id range once, on idx_activity_timestamp, so
+        # every page is a rowid (or idx_activity_user) range scan in id order. The
+        # timestamp test stays on each page (unindexed, hence the unary +).
+        lo, hi = conn.execute(
+            "SELECT MIN(id), MAX(id) FROM activity_log WHERE " + " AND ".join(date_clauses), date_params
+        ).fetchone()
+        if lo is None:
+            return None
+        clauses.append("id BETWEEN ? AND ?")
+        params.extend((lo, hi))
+        clauses.extend("+" + clause for clause in date_clauses)
+        params.extend(date_params)
+    return clauses, params
+
+
+def iter_activity(before_id=None, limit=None, filters=None, page_size=ACTIVITY_PAGE_SIZE):
+    """Yield (id, timestamp, username, action_type, details) with id < before_id, newest first.
+
+    filters may contain username, action_type (exact matches), date_from and
+    date_to ("YYYY-MM-DD", inclusive). Each page is one indexed query on its
+    own connection, so callers can stop early.
+    """
+    flush_activity_log()
+    conn = get_db_connection()
+    try:
+        where = _activity_filter_sql(conn, filters or {})
+    finally:
+        conn.close()
+    if where is None:
+        return
+    clauses, params = where
+    remaining = limit
+    while remaining is None or remaining > 0:
+        page = page_size if remaining is None else min(page_size, remaining)
+        page_clauses = list(clauses)
+        args = list(params)
+        if before_id is not None:
+            page_clauses.append("id < ?")
+            args.append(before_id)
+        sql = "SELECT id, timestamp, COALESCE(username,'(system)'), action_type, details FROM activity_log"
+        if page_clauses:
+            sql += " WHERE " + " AND ".join(page_clauses)
+        sql += " ORDER BY id DESC LIMIT ?"
+        conn = get_db_connection()
+        try:
+            rows = conn.execute(sql, (*args, page)).fetchall()
+        finally:
+            conn.close()
+        yield from rows
+        if len(rows) < page:
+            return
+        before_id = rows[-1][0]
+        if remaining is not None:
+            remaining -= len(rows)
@@ -2,37 +2,178 @@
 
 Provides safe readers for optional settings fields with sensible defaults,
 so UI and features can consume settings without dealing with schema errors.
+
+The single ``settings`` row is loaded once into a typed :class:`Settings`
+object and cached. Code that writes the row must call
+:func:`invalidate_settings`; subscribers registered with
+:func:`subscribe_settings` are then notified so the UI can react.
 """
 
 from __future__ import annotations
 
+import logging
+import os
 import sqlite3
+import threading
+import weakref
+from collections.abc import Callable
+
+from database.db_handler import get_connection_pool, get_db_connection, resolve_db_path
 
-from database.db_handler import get_db_connection
+logger = logging.getLogger(__name__)
 
 DEFAULT_LOW_STOCK_THRESHOLD = 10
+DEFAULT_WHOLESALE_NAME = "Wholesale Name Here"
+DEFAULT_THANK_YOU = "Thank you for buying from us!"
 
+_COLUMNS = (
+    "wholesale_number",
+    "wholesale_name",
+    "wholesale_address",
+    "backup_directory",
+    "retention_count",
+    "receipt_thank_you",
+    "receipt_notes",
+    "low_stock_threshold",
+)
 
-def get_low_stock_threshold() -> int:
-    """Return configured low-stock threshold, defaulting to 10 if unavailable.
 
-    Handles cases where the settings table/column may not exist yet.
-    """
+class Settings:
+    """Snapshot of the settings row. Raw values are kept; properties apply defaults."""
+
+    def __init__(
+        self,
+        wholesale_number: str | None = None,
+        wholesale_name: str | None = None,
+        wholesale_address: str | None = None,
+        backup_directory: str | None = None,
+        retention_count: int | None = None,
+        receipt_thank_you: str | None = None,
+        receipt_notes: str | None = None,
+        low_stock_threshold: int | None = None,
+        version: int = 0,
+    ):
+        self.wholesale_number = wholesale_number
+        self.wholesale_name = wholesale_name
+        self.wholesale_address = wholesale_address
+        self.backup_directory = backup_directory
+        self.retention_count = retention_count
+        self.receipt_thank_you = receipt_thank_you
+        self.receipt_notes = receipt_notes
+        self.low_stock_threshold = low_stock_threshold
+        self.version = version  # changes every time the cache is invalidated
+
+    @property
+    def display_number(self) -> str:
+        return self.wholesale_number or "N/A"
+
+    @property
+    def display_name(self) -> str:
+        return self.wholesale_name or DEFAULT_WHOLESALE_NAME
+
+    @property
+    def display_address(self) -> str:
+        return self.wholesale_address or ""
+
+    @property
+    def thank_you(self) -> str:
+        return self.receipt_thank_you or DEFAULT_THANK_YOU
+
+    @property
+    def notes(self) -> str:
+        return self.receipt_notes or ""
+
+    @property
+    def threshold(self) -> int:
+        try:
+            val = int(self.low_stock_threshold) if self.low_stock_threshold is not None else DEFAULT_LOW_STOCK_THRESHOLD
+        except (TypeError, ValueError):
+            return DEFAULT_LOW_STOCK_THRESHOLD
+        return val if val >= 0 else DEFAULT_LOW_STOCK_THRESHOLD
+
+
+_lock = threading.RLock()
+_cached: Settings | None = None
+_cache_key: tuple[str, int] | None = None
+_version = 0
+_subscribers: list[Callable[[], Callable[[Settings], None] | None]] = []  # weak refs for bound methods
+
+
+def _load(version: int) -> Settings:
+    """Read the settings row; missing table/columns/row yield an all-defaults object."""
     conn = get_db_connection()
     try:
         cur = conn.cursor()
         try:
-            cur.execute("SELECT low_stock_threshold FROM settings WHERE id=1")
-            row = cur.fetchone()
-            if not row:
-                return DEFAULT_LOW_STOCK_THRESHOLD
-            try:
-                val = int(row[0]) if row[0] is not None else DEFAULT_LOW_STOCK_THRESHOLD
-                return val if val >= 0 else DEFAULT_LOW_STOCK_THRESHOLD
-            except Exception:
-                return DEFAULT_LOW_STOCK_THRESHOLD
-        except sqlite3.OperationalError:
-            # Column/table missing; return default
-            return DEFAULT_LOW_STOCK_THRESHOLD
+            cur.execute("PRAGMA table_info(settings)")
+            present = {c[1] for c in cur.fetchall()}
+            cols = [c for c in _COLUMNS if c in present]
+            row = None
+            if cols:
+                cur.execute(f"SELECT {', '.join(cols)} FROM settings WHERE id=1")
+                row = cur.fetchone()
+        except sqlite3.Error as e:
+            logger.debug("Settings unavailable: %s", e)
+            return Settings(version=version)
+        values = dict(zip(cols, row, strict=True)) if row else {}
+        return Settings(version=version, **values)
     finally:
         conn.close()
+
+
+def get_settings() -> Settings:
+    """Return the cached settings, loading them on first use (or after the DB changed)."""
+    global _cached, _cache_key
+    key = (os.path.abspath(resolve_db_path()), get_connection_pool().generation)
+    with _lock:
+        if _cached is None or _cache_key != key:
+            _cached = _load(_version)
+            _cache_key = key
+        return _cached
+
+
+def invalidate_settings():
+    """Drop the cached row after a write and notify subscribers with the fresh values."""
+    global _cached, _version
+    with _lock:
+        _version += 1
+        _cached = None
+        callbacks = [cb for cb in (ref() for ref in _subscribers) if cb is not None]
+        _subscribers[:] = [ref for ref in _subscribers if ref() is not None]
+    if not callbacks:
+        return
+    settings = get_settings()
+    for callback in callbacks:
+        try:
+            callback(settings)
+        except Exception:
+            logger.exception("Settings subscriber failed")
+
+
+def subscribe_settings(callback: Callable[[Settings], None]) -> Callable[[], None]:
+    """Call ``callback(settings)`` after every invalidation. Returns an unsubscribe function.
+
+    Bound methods are held weakly so a subscribing widget does not outlive its window.
+    """
+    ref: Callable[[], Callable[[Settings], None] | None]
+    if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+        ref = weakref.WeakMethod(callback)
+    else:
+        ref = lambda: callback  # noqa: E731
+    with _lock:
+        _subscribers.append(ref)
+
+    def unsubscribe(*_args):
+        with _lock:
+            if ref in _subscribers:
+                _subscribers.remove(ref)
+
+    return unsubscribe
+
+
+def get_low_stock_threshold() -> int:
+    """Return configured low-stock threshold, defaulting to 10 if unavailable.
+
+    Handles cases where the settings table/column may not exist yet.
+    """
+    return get_settings().threshold
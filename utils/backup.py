@@ -5,18 +5,48 @@ Features:
 - Perform consistent SQLite backup via backup API
 - Retention policy using settings.retention_count (fallback 10)
 - Helpers: list_backups, get_last_backup_time, needs_backup
+- Incremental mode (TRADIA_BACKUP_MODE=incremental): page-level chunk store,
+  see utils.incremental_backup
+- Compact mode (TRADIA_BACKUP_MODE=compact): VACUUM INTO, compressed, with a
+  checksum sidecar, see utils.compact_backup
+- restore_backup understands all three formats
+- Listing, "last backup" and retention read the folder's catalog.json instead
+  of scanning it, see utils.backup_catalog
 """
 
 from __future__ import annotations
 
+import argparse
 import datetime as _dt
 import logging
 import os
-import sqlite3
+import subprocess
+import sys
+import threading
 from pathlib import Path
 
-from database.db_handler import get_db_connection
+from database.db_handler import get_db_connection, run_checkpoint_policy
+from utils.activity_log import flush_activity_log
+from utils.app_settings import get_settings, invalidate_settings
+from utils.backup_catalog import add_backup, fill_missing_checksums, latest_backup, load_catalog, remove_backups
 from utils.branding import APP_SLUG
+from utils.compact_backup import (
+    BACKUP_SUFFIXES,
+    create_compact_backup,
+    file_sha256,
+    is_compact_backup,
+    restore_compact_backup,
+    restore_plain_backup,
+    sidecar_path,
+)
+from utils.incremental_backup import (
+    BackupCancelled,  # noqa: F401  (raised by perform_backup; callers import it from here)
+    Progress,
+    collect_garbage,
+    copy_database,
+    create_incremental_backup,
+    restore_incremental_backup,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +54,8 @@ logger = logging.getLogger(__name__)
 DEFAULT_RELATIVE_BACKUP_PATH = os.path.join("Documents", APP_SLUG, "backups")
 BACKUP_FILENAME_PREFIX = "backup_"  # backup_YYYYmmdd_HHMMSS.db
 DEFAULT_RETENTION_FALLBACK = 10
+BACKUP_MODE_ENV_KEY = "TRADIA_BACKUP_MODE"
+BACKUP_MODES = ("full", "incremental", "compact")
 
 # ---------- Settings access ---------- #
 
@@ -44,18 +76,8 @@ def _get_settings():
     table/row isn't available yet. This prevents crashes when the database
     hasn't been initialized (e.g., during tests pointing to a non-existent DB).
     """
-    conn = get_db_connection()
-    try:
-        cur = conn.cursor()
-        try:
-            cur.execute("SELECT backup_directory, retention_count FROM settings WHERE id=1")
-            row = cur.fetchone()
-            return row if row else (None, None)
-        except sqlite3.OperationalError:
-            # settings table is missing; fall back to defaults
-            return (None, None)
-    finally:
-        conn.close()
+    settings = get_settings()
+    return settings.backup_directory, settings.retention_count
 
 
 def get_configured_backup_dir() -> str | None:
@@ -92,6 +114,7 @@ def update_backup_directory(new_dir: str):
     cur.execute("UPDATE settings SET backup_directory=? WHERE id=1", (new_dir.strip(),))
     conn.commit()
     conn.close()
+    invalidate_settings()
 
 
 def update_retention_count(new_count: int):
@@ -102,6 +125,7 @@ def update_retention_count(new_count: int):
     cur.execute("UPDATE settings SET retention_count=? WHERE id=1", (new_count,))
     conn.commit()
     conn.close()
+    invalidate_settings()
 
 
 # ---------- Backup core ---------- #
@@ -139,48 +163,54 @@ def _get_database_path() -> str:
 
 
 def list_backups(directory: str | None = None) -> list[str]:
+    """Full and compact backup files in the folder, oldest first (from the catalog)."""
     directory = directory or resolve_backup_dir()
-    if not os.path.isdir(directory):
-        return []
-    backups: list[str] = []
-    for name in os.listdir(directory):
-        if name.startswith(BACKUP_FILENAME_PREFIX) and name.endswith(".db"):
-            backups.append(os.path.join(directory, name))
-    backups.sort(key=lambda p: os.path.getmtime(p))
-    return backups
+    return [e.path(directory) for e in load_catalog(directory) if e.kind != "incremental"]
 
 
 def get_last_backup_time(directory: str | None = None) -> _dt.datetime | None:
-    backups = list_backups(directory)
-    if not backups:
-        return None
-    latest = backups[-1]
-    try:
-        return _dt.datetime.fromtimestamp(os.path.getmtime(latest))
-    except Exception:
-        return None
+    directory = directory or resolve_backup_dir()
+    latest = latest_backup(directory)
+    return _dt.datetime.fromtimestamp(latest.created) if latest else None
 
 
-def _enforce_retention(directory: str, retention: int):
-    backups = list_backups(directory)
+def _enforce_retention(directory: str, retention: int, incremental: bool = False):
+    """Keep the newest `retention` file backups (or incremental manifests)."""
+    backups = [e for e in load_catalog(directory) if (e.kind == "incremental") == incremental]
     if len(backups) <= retention:
         return
     # Remove oldest extra backups
-    to_remove = backups[: len(backups) - retention]
-    for path in to_remove:
+    removed = []
+    for entry in backups[: len(backups) - retention]:
+        path = entry.path(directory)
         try:
             os.remove(path)
             logger.info("Deleted old backup: %s", path)
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning("Failed deleting backup %s: %s", path, e)
-
-
-def perform_backup(retention: int | None = None) -> str:
-    backup_dir = resolve_backup_dir()
-    db_path = _get_database_path()
-    if not os.path.exists(db_path):
-        raise FileNotFoundError(f"Database file not found: {db_path}")
-
+            continue
+        removed.append(entry)
+        if is_compact_backup(path):
+            try:
+                os.remove(sidecar_path(path))
+            except OSError:
+                pass
+    remove_backups(directory, removed)
+    if incremental and removed:
+        collect_garbage(directory)
+
+
+def get_backup_mode() -> str:
+    mode = (os.environ.get(BACKUP_MODE_ENV_KEY) or "full").strip().lower()
+    if mode not in BACKUP_MODES:
+        logger.warning("Unknown %s=%r; using full backups", BACKUP_MODE_ENV_KEY, mode)
+        return "full"
+    return mode
+
+
+def _new_backup_path(backup_dir: str) -> str:
     # Use microseconds to avoid collisions when creating multiple backups in the same second
     now = _dt.datetime.now()
     timestamp = now.strftime("%Y%m%d_%H%M%S_%f")
@@ -188,23 +218,32 @@ def perform_backup(retention: int | None = None) -> str:
     backup_path = os.path.join(backup_dir, backup_name)
 
     # Fallback uniqueness guard: if path exists, add a numeric suffix
-    if os.path.exists(backup_path):
+    if any(os.path.exists(backup_path + suffix[3:]) for suffix in BACKUP_SUFFIXES):
         idx = 1
         base, ext = os.path.splitext(backup_path)
-        while os.path.exists(f"{base}_{idx}{ext}"):
+        while any(os.path.exists(f"{base}_{idx}{suffix}") for suffix in BACKUP_SUFFIXES):
             idx += 1
         backup_path = f"{base}_{idx}{ext}"
+    return backup_path
 
-    source = sqlite3.connect(db_path, timeout=10)
+
+def _full_backup(
+    backup_dir: str,
+    db_path: str,
+    throttle: float = 0.0,
+    progress: Progress | None = None,
+    cancel_event: threading.Event | None = None,
+) -> str:
+    backup_path = _new_backup_path(backup_dir)
     try:
-        dest = sqlite3.connect(backup_path, timeout=10)
+        copy_database(db_path, backup_path, throttle=throttle, progress=progress, cancel_event=cancel_event)
+    except BaseException:
+        # Never leave a partial copy that list_backups would offer for restore
         try:
-            source.backup(dest)
-            dest.commit()
-        finally:
-            dest.close()
-    finally:
-        source.close()
+            os.remove(backup_path)
+        except OSError:
+            pass
+        raise
 
     if os.path.getsize(backup_path) == 0:
         try:
@@ -212,16 +251,127 @@ def perform_backup(retention: int | None = None) -> str:
         except Exception:
             pass
         raise RuntimeError("Backup created but file size was 0 bytes (removed).")
+    return backup_path
+
+
+def perform_backup(
+    retention: int | None = None,
+    mode: str | None = None,
+    *,
+    throttle: float = 0.0,
+    progress: Progress | None = None,
+    cancel_event: threading.Event | None = None,
+) -> str:
+    """Back up the database; returns the backup file (full) or manifest (incremental) path.
+
+    mode is "full" (a complete copy per backup), "incremental" (only changed
+    pages are stored) or "compact" (VACUUM INTO, compressed and checked); it
+    defaults to TRADIA_BACKUP_MODE, else full. The copy
+    runs in steps: progress(done, total) is called after each, throttle
+    seconds are slept between them, and setting cancel_event stops the backup
+    with BackupCancelled. The database stays writable throughout.
+    """
+    mode = mode or get_backup_mode()
+    if mode not in BACKUP_MODES:
+        raise ValueError(f"Unsupported backup mode '{mode}'")
+    backup_dir = resolve_backup_dir()
+    db_path = _get_database_path()
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database file not found: {db_path}")
+    # Queued activity log rows belong in the snapshot
+    flush_activity_log()
+
+    if mode == "incremental":
+        backup_path = create_incremental_backup(
+            db_path, backup_dir, throttle=throttle, progress=progress, cancel_event=cancel_event
+        ).manifest_path
+        checksum = file_sha256(backup_path)
+    elif mode == "compact":
+        compact = create_compact_backup(
+            db_path,
+            _new_backup_path(backup_dir),
+            throttle=throttle,
+            progress=progress,
+            cancel_event=cancel_event,
+        )
+        backup_path, checksum = compact.path, compact.compressed_sha256
+    else:
+        backup_path = _full_backup(backup_dir, db_path, throttle, progress, cancel_event)
+        checksum = file_sha256(backup_path)
+    add_backup(backup_dir, backup_path, checksum)
 
     logger.info("Backup created: %s", backup_path)
+    # Quiet point: keep the WAL from growing without bound
+    try:
+        run_checkpoint_policy()
+    except Exception as e:
+        logger.debug("Post-backup checkpoint skipped: %s", e)
     if retention is None:
         retention = _get_retention_count()
-    _enforce_retention(backup_dir, retention)
+    _enforce_retention(backup_dir, retention, incremental=mode == "incremental")
+    # Entries found by a catalog rebuild carry no checksum yet; this runs on
+    # the backup worker, never on the GUI thread
+    fill_missing_checksums(backup_dir, cancel_event)
     return backup_path
 
 
+def restore_backup(backup_path: str, target_path: str, overwrite: bool = False) -> str:
+    """Rebuild a database file at target_path from any backup format.
+
+    Accepts a plain .db copy, a compressed compact backup (checked against its
+    sidecar) or an incremental manifest. The target is written to a temporary
+    file and renamed into place only once it has been verified.
+    """
+    if backup_path.endswith(".json") and not is_compact_backup(backup_path[: -len(".json")]):
+        return restore_incremental_backup(backup_path, target_path, overwrite)
+    if is_compact_backup(backup_path):
+        return restore_compact_backup(backup_path, target_path, overwrite)
+    return restore_plain_backup(backup_path, target_path, overwrite)
+
+
 def needs_backup(hours: int = 24) -> bool:
     last = get_last_backup_time()
     if last is None:
         return True
     return (_dt.datetime.now() - last).total_seconds() >= hours * 3600
+
+
+def detached_backup_command() -> list[str]:
+    """Command line that runs one backup in a separate process."""
+    if getattr(sys, "frozen", False):
+        # PyInstaller build: the executable handles --backup itself (see main.py)
+        return [sys.executable, "--backup"]
+    return [sys.executable, "-m", "utils.backup"]
+
+
+def launch_detached_backup() -> subprocess.Popen:
+    """Start a backup process that keeps running after the application exits."""
+    kwargs: dict = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if sys.platform.startswith("win"):
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.Popen(detached_backup_command(), cwd=cwd, **kwargs)
+
+
+def main(argv=None) -> int:
+    from database.db_handler import initialize_database
+
+    parser = argparse.ArgumentParser(prog="python -m utils.backup", description="Back up the Tradia database.")
+    parser.add_argument("--mode", choices=BACKUP_MODES, default=None, help="default: TRADIA_BACKUP_MODE, else full")
+    parser.add_argument("--throttle", type=float, default=0.0, help="seconds to sleep between copy steps")
+    args = parser.parse_args(argv)
+    initialize_database()
+    try:
+        path = perform_backup(mode=args.mode, throttle=args.throttle)
+    except Exception as e:
+        logger.error("Backup failed: %s", e)
+        print(f"Backup failed: {e}", file=sys.stderr)
+        return 1
+    print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,257 @@
+"""Backup catalog: an index of the backups in one backup folder.
+
+Listing backups used to mean a directory scan plus one stat per file, which
+is slow on USB or network drives holding thousands of backups and ran on
+every app close (needs_backup), every settings dialog open and every
+retention pass. Instead, each backup folder keeps ``catalog.json``::
+
+    {"format": 1, "entries": [
+        {"name": "backup_20250101_120000_000000.db.gz", "kind": "compact",
+         "created": 1735732800.0, "size": 5012345, "sha256": "ab12..."},
+        ...]}
+
+Entries are kept oldest first. ``name`` is relative to the backup folder
+(incremental manifests live under ``incremental/manifests/``), so the folder
+can be moved or remounted under another drive letter. ``sha256`` is the
+digest of the stored file: the backup itself for full and compact backups,
+the manifest for incremental ones. It may be null for entries found by a
+rebuild; fill_missing_checksums() hashes those later, off the GUI thread.
+
+perform_backup adds an entry for every backup it writes and retention removes
+entries with their files, so "last backup" is the last entry and retention
+reads one file instead of scanning. Within a process the parsed catalog is
+cached and revalidated with a stat of catalog.json and of the newest backup.
+
+The catalog is rebuilt from a directory scan only when it fails validation:
+it is missing or unreadable, has an unknown format, or its newest entry no
+longer exists with the recorded size (e.g. the folder was emptied or swapped
+for another drive). A rebuild costs one stat per backup (compact backups
+also read their small sidecar for the hash) because it runs on the GUI
+thread via needs_backup and the settings dialog; hashing dozens of
+multi-GB backups on a USB or network drive would freeze the window. Files
+added or deleted by hand otherwise go unnoticed until rebuild_catalog() is
+called; retention tolerates entries whose file is already gone.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+
+from utils.compact_backup import BACKUP_SUFFIXES, file_sha256, is_compact_backup, read_sidecar
+from utils.incremental_backup import list_manifests
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = "catalog.json"
+CATALOG_FORMAT = 1
+BACKUP_KINDS = ("full", "compact", "incremental")
+_BACKUP_PREFIX = "backup_"
+
+_lock = threading.RLock()
+# abspath(directory) -> ((st_mtime_ns, st_size) of catalog.json, entries)
+_cache: dict[str, tuple[tuple[int, int], list[BackupEntry]]] = {}
+
+
+class BackupEntry:
+    """One backup as recorded in the catalog."""
+
+    def __init__(self, name: str, kind: str, created: float, size: int, sha256: str | None = None):
+        self.name = name
+        self.kind = kind
+        self.created = created
+        self.size = size
+        self.sha256 = sha256
+
+    def path(self, directory: str) -> str:
+        return os.path.join(directory, *self.name.split("/"))
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "kind": self.kind, "created": self.created, "size": self.size, "sha256": self.sha256}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BackupEntry:
+        if data["kind"] not in BACKUP_KINDS:
+            raise ValueError(f"Unknown backup kind {data['kind']!r}")
+        return cls(str(data["name"]), data["kind"], float(data["created"]), int(data["size"]), data.get("sha256"))
+
+
+def catalog_path(directory: str) -> str:
+    return os.path.join(directory, CATALOG_FILENAME)
+
+
+def _relative_name(directory: str, path: str) -> str:
+    return os.path.relpath(path, directory).replace(os.sep, "/")
+
+
+def _kind_for_path(path: str) -> str:
+    if path.endswith(".json"):
+        return "incremental"
+    return "compact" if is_compact_backup(path) else "full"
+
+
+def make_entry(directory: str, path: str, sha256: str | None = None, created: float | None = None) -> BackupEntry:
+    """Describe the backup at path with one stat; never hashes the backup.
+
+    Without sha256, compact backups take the hash from their sidecar and the
+    others are left without one for fill_missing_checksums().
+    """
+    kind = _kind_for_path(path)
+    st = os.stat(path)
+    if sha256 is None and kind == "compact":
+        try:
+            sha256 = read_sidecar(path)["compressed_sha256"]
+        except (OSError, ValueError, KeyError):
+            pass
+    return BackupEntry(
+        _relative_name(directory, path),
+        kind,
+        st.st_mtime if created is None else created,
+        st.st_size,
+        sha256,
+    )
+
+
+def _scan(directory: str) -> list[BackupEntry]:
+    paths = []
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.startswith(_BACKUP_PREFIX) and name.endswith(BACKUP_SUFFIXES):
+                paths.append(os.path.join(directory, name))
+    paths.extend(list_manifests(directory))
+    entries = []
+    for path in paths:
+        try:
+            entries.append(make_entry(directory, path))
+        except OSError as e:
+            logger.warning("Skipping unreadable backup %s: %s", path, e)
+    entries.sort(key=lambda e: (e.created, e.name))
+    return entries
+
+
+def _write(directory: str, entries: list[BackupEntry]):
+    path = catalog_path(directory)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"format": CATALOG_FORMAT, "entries": [e.to_dict() for e in entries]}, fh, indent=1)
+    os.replace(tmp, path)
+    st = os.stat(path)
+    _cache[os.path.abspath(directory)] = ((st.st_mtime_ns, st.st_size), entries)
+
+
+def _read_valid(directory: str) -> list[BackupEntry] | None:
+    """Parsed entries, or None if the catalog fails validation."""
+    path = catalog_path(directory)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = os.path.abspath(directory)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == signature:
+        entries = cached[1]
+    else:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("format") != CATALOG_FORMAT:
+                return None
+            entries = [BackupEntry.from_dict(d) for d in data["entries"]]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        _cache[key] = (signature, entries)
+    if entries:
+        newest = entries[-1]
+        try:
+            if os.path.getsize(newest.path(directory)) != newest.size:
+                return None
+        except OSError:
+            return None
+    return entries
+
+
+def rebuild_catalog(directory: str) -> list[BackupEntry]:
+    """Rescan the folder (stat only, see make_entry) and rewrite the catalog."""
+    with _lock:
+        start = time.perf_counter()
+        entries = _scan(directory)
+        if os.path.isdir(directory):
+            try:
+                _write(directory, entries)
+            except OSError as e:  # read-only media: serve the scan, retry next time
+                logger.warning("Could not write backup catalog in %s: %s", directory, e)
+        logger.info(
+            "Rebuilt backup catalog for %s: %d backups in %.2fs", directory, len(entries), time.perf_counter() - start
+        )
+        return entries
+
+
+def load_catalog(directory: str) -> list[BackupEntry]:
+    """Entries oldest first; rebuilds the catalog if it fails validation."""
+    with _lock:
+        entries = _read_valid(directory)
+        if entries is None:
+            if not os.path.isdir(directory):
+                return []
+            entries = rebuild_catalog(directory)
+        return list(entries)
+
+
+def add_backup(directory: str, path: str, sha256: str | None = None) -> BackupEntry:
+    """Record a newly written backup as the newest entry."""
+    with _lock:
+        entries = load_catalog(directory)
+        entry = make_entry(directory, path, sha256, created=time.time())
+        entries = [e for e in entries if e.name != entry.name]
+        entries.append(entry)
+        _write(directory, entries)
+        return entry
+
+
+def remove_backups(directory: str, entries: list[BackupEntry]):
+    """Drop entries from the catalog (their files are the caller's business)."""
+    names = {e.name for e in entries}
+    if not names:
+        return
+    with _lock:
+        _write(directory, [e for e in load_catalog(directory) if e.name not in names])
+
+
+def latest_backup(directory: str) -> BackupEntry | None:
+    entries = load_catalog(directory)
+    return entries[-1] if entries else None
+
+
+def fill_missing_checksums(directory: str, cancel_event: threading.Event | None = None) -> int:
+    """Hash catalogued backups recorded without a sha256; returns how many were filled.
+
+    Slow on large folders, so it belongs on a worker thread (perform_backup
+    calls it after retention). Files are hashed outside the lock; an entry is
+    only updated if it still has the same name and size afterwards.
+    """
+    missing = [e for e in load_catalog(directory) if not e.sha256]
+    hashes: dict[tuple[str, int], str] = {}
+    for entry in missing:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        try:
+            hashes[(entry.name, entry.size)] = file_sha256(entry.path(directory))
+        except OSError as e:
+            logger.debug("Cannot hash backup %s: %s", entry.name, e)
+    if not hashes:
+        return 0
+    with _lock:
+        entries, filled = [], 0
+        for entry in load_catalog(directory):
+            digest = hashes.get((entry.name, entry.size))
+            if digest is not None and not entry.sha256:
+                entry = BackupEntry(entry.name, entry.kind, entry.created, entry.size, digest)
+                filled += 1
+            entries.append(entry)
+        if filled:
+            _write(directory, entries)
+        return filled
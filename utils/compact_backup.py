@@ -0,0 +1,377 @@
+"""Compacted, compressed and verified backups.
+
+A compact backup is made in three passes:
+
+1. ``VACUUM INTO`` writes a defragmented copy of the database (free pages
+   dropped, tables and indexes rebuilt in order). It runs in a read
+   transaction, so the live database stays writable.
+2. ``PRAGMA quick_check`` (or the full ``integrity_check``) is run on the copy.
+3. The copy is stream-compressed with the best stdlib codec available
+   (zstd on Python 3.14+, else gzip; xz on request) while SHA-256 digests of
+   both the raw and the compressed bytes are computed.
+
+The backup file (backup_<timestamp>.db.gz / .xz / .zst) gets a JSON sidecar
+next to it (<backup file>.json) with the codec, sizes, both digests and the
+check result. Restore checks the compressed digest before decompressing and
+the raw digest and quick_check after, and only then moves the file into place.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import lzma
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+
+from utils.incremental_backup import BackupCancelled, Progress, copy_database
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_ENV_KEY = "TRADIA_BACKUP_COMPRESSION"
+SIDECAR_SUFFIX = ".json"
+SIDECAR_FORMAT = 1
+IO_BLOCK = 1024 * 1024
+_REPORT_INTERVAL_S = 0.1  # progress / throttle / cancel cadence during VACUUM INTO
+_HANDLER_OPS = 20_000  # SQLite VM steps between progress-handler calls
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+
+
+def _codec_table() -> dict[str, tuple[str, Callable, Callable]]:
+    """name -> (file suffix, writer(fileobj), reader(path))."""
+    codecs: dict[str, tuple[str, Callable, Callable]] = {}
+    if zstd is not None:
+        codecs["zstd"] = (".zst", lambda f: zstd.ZstdFile(f, "wb"), lambda p: zstd.open(p, "rb"))
+    codecs["gzip"] = (
+        ".gz",
+        lambda f: gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6),
+        lambda p: gzip.open(p, "rb"),
+    )
+    codecs["xz"] = (".xz", lambda f: lzma.LZMAFile(f, "wb", preset=6), lambda p: lzma.open(p, "rb"))
+    return codecs
+
+
+CODECS = _codec_table()
+BACKUP_SUFFIXES = (".db",) + tuple(".db" + suffix for suffix, _, _ in CODECS.values())
+
+
+def default_codec() -> str:
+    configured = (os.environ.get(COMPRESSION_ENV_KEY) or "").strip().lower()
+    if configured in CODECS:
+        return configured
+    if configured:
+        logger.warning("Compression %r is not available here; using the default", configured)
+    return "zstd" if "zstd" in CODECS else "gzip"
+
+
+def _codec_for_path(path: str) -> str | None:
+    for name, (suffix, _, _) in CODECS.items():
+        if path.endswith(".db" + suffix):
+            return name
+    return None
+
+
+def is_compact_backup(path: str) -> bool:
+    return _codec_for_path(path) is not None
+
+
+def sidecar_path(backup_path: str) -> str:
+    return backup_path + SIDECAR_SUFFIX
+
+
+def read_sidecar(backup_path: str) -> dict:
+    with open(sidecar_path(backup_path), encoding="utf-8") as fh:
+        sidecar = json.load(fh)
+    if sidecar.get("format") != SIDECAR_FORMAT:
+        raise ValueError(f"Unsupported backup sidecar format for {backup_path}")
+    return sidecar
+
+
+class CompactBackupResult:
+    """Outcome of create_compact_backup."""
+
+    def __init__(self, path: str, codec: str):
+        self.path = path
+        self.codec = codec
+        self.source_size = 0
+        self.raw_size = 0
+        self.compressed_size = 0
+        self.compressed_sha256 = ""
+        self.vacuum_seconds = 0.0
+        self.check_seconds = 0.0
+        self.compress_seconds = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return self.vacuum_seconds + self.check_seconds + self.compress_seconds
+
+    @property
+    def ratio(self) -> float:
+        """Raw copy size / compressed size."""
+        return self.raw_size / self.compressed_size if self.compressed_size else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Source bytes per second over the whole backup."""
+        return self.source_size / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class _HashingWriter:
+    """File-like sink that hashes and counts what the compressor writes."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+def _vacuum_into(db_path: str, copy_path: str, throttle: float, progress: Progress | None, cancel_event, total: int):
+    conn = sqlite3.connect(db_path, timeout=10, isolation_level=None)
+    state = {"next": time.monotonic() + _REPORT_INTERVAL_S, "cancelled": False}
+
+    def handler():
+        now = time.monotonic()
+        if now < state["next"]:
+            return 0
+        if cancel_event is not None and cancel_event.is_set():
+            state["cancelled"] = True
+            return 1  # interrupts the statement
+        if progress:
+            try:
+                progress(min(os.path.getsize(copy_path), total), total)
+            except OSError:
+                pass
+        if throttle:
+            time.sleep(throttle)
+        state["next"] = time.monotonic() + _REPORT_INTERVAL_S
+        return 0
+
+    conn.set_progress_handler(handler, _HANDLER_OPS)
+    try:
+        conn.execute("VACUUM INTO ?", (copy_path,))
+    except sqlite3.OperationalError:
+        if state["cancelled"]:
+            raise BackupCancelled() from None
+        raise
+    finally:
+        conn.close()
+
+
+def _check(path: str, full: bool) -> str:
+    conn = sqlite3.connect(path)
+    try:
+        pragma = "integrity_check" if full else "quick_check"
+        rows = conn.execute(f"PRAGMA {pragma}").fetchall()
+        return "; ".join(str(r[0]) for r in rows)
+    finally:
+        conn.close()
+
+
+def _page_info(path: str) -> tuple[int, int]:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA page_size").fetchone()[0], conn.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def create_compact_backup(
+    db_path: str,
+    base_path: str,
+    *,
+    codec: str | None = None,
+    full_check: bool = False,
+    throttle: float = 0.0,
+    progress: Progress | None = None,
+    cancel_event: threading.Event | None = None,
+) -> CompactBackupResult:
+    """Write base_path + codec suffix (e.g. backup_x.db.gz) and its sidecar.
+
+    progress(done, total) runs twice over: bytes written by VACUUM INTO, then
+    bytes compressed.
+    """
+    codec = codec or default_codec()
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported backup compression '{codec}' (available: {', '.join(CODECS)})")
+    suffix, make_writer, _ = CODECS[codec]
+    result = CompactBackupResult(base_path + suffix, codec)
+    result.source_size = os.path.getsize(db_path)
+    copy_path = base_path + ".vacuum.tmp"
+    partial = result.path + ".tmp"
+    try:
+        start = time.perf_counter()
+        _vacuum_into(db_path, copy_path, throttle, progress, cancel_event, result.source_size)
+        result.vacuum_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        check = _check(copy_path, full_check)
+        result.check_seconds = time.perf_counter() - start
+        if check != "ok":
+            raise RuntimeError(f"Backup copy failed {'integrity_check' if full_check else 'quick_check'}: {check}")
+        page_size, page_count = _page_info(copy_path)
+
+        start = time.perf_counter()
+        result.raw_size = os.path.getsize(copy_path)
+        raw_digest = hashlib.sha256()
+        done = 0
+        with open(copy_path, "rb") as src, open(partial, "wb") as out:
+            sink = _HashingWriter(out)
+            with make_writer(sink) as compressor:
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise BackupCancelled()
+                    block = src.read(IO_BLOCK)
+                    if not block:
+                        break
+                    raw_digest.update(block)
+                    compressor.write(block)
+                    done += len(block)
+                    if progress:
+                        progress(done, result.raw_size)
+                    if throttle:
+                        time.sleep(throttle)
+            out.flush()
+            os.fsync(out.fileno())
+        result.compressed_size = sink.size
+        result.compressed_sha256 = sink.digest.hexdigest()
+        result.compress_seconds = time.perf_counter() - start
+
+        sidecar = {
+            "format": SIDECAR_FORMAT,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "source": os.path.abspath(db_path),
+            "codec": codec,
+            "page_size": page_size,
+            "page_count": page_count,
+            "source_size": result.source_size,
+            "size": result.raw_size,
+            "sha256": raw_digest.hexdigest(),
+            "compressed_size": result.compressed_size,
+            "compressed_sha256": result.compressed_sha256,
+            "check": "integrity_check" if full_check else "quick_check",
+            "check_result": check,
+            "ratio": round(result.ratio, 3),
+            "seconds": round(result.elapsed, 3),
+        }
+        # Sidecar first: a backup file that list_backups can see always has one
+        tmp_sidecar = sidecar_path(result.path) + ".tmp"
+        with open(tmp_sidecar, "w", encoding="utf-8") as fh:
+            json.dump(sidecar, fh, indent=2)
+        os.replace(tmp_sidecar, sidecar_path(result.path))
+        os.replace(partial, result.path)
+    except BaseException:
+        for path in (partial, result.path, sidecar_path(result.path)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+    finally:
+        try:
+            os.remove(copy_path)
+        except OSError:
+            pass
+    logger.info(
+        "Compact backup %s: %d -> %d bytes (%.1fx, %s) in %.2fs, %.1f MB/s",
+        result.path,
+        result.raw_size,
+        result.compressed_size,
+        result.ratio,
+        codec,
+        result.elapsed,
+        result.throughput / 1e6,
+    )
+    return result
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in IO_BLOCK chunks (also used by the backup catalog)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(IO_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def verify_compact_backup(path: str) -> dict:
+    """Check the compressed file against its sidecar; returns the sidecar."""
+    sidecar = read_sidecar(path)
+    if os.path.getsize(path) != sidecar["compressed_size"] or file_sha256(path) != sidecar["compressed_sha256"]:
+        raise ValueError(f"Backup {path} does not match its checksum")
+    return sidecar
+
+
+def restore_compact_backup(path: str, target_path: str, overwrite: bool = False) -> str:
+    """Decompress a compact backup to target_path after verifying it."""
+    if os.path.exists(target_path) and not overwrite:
+        raise FileExistsError(f"Restore target already exists: {target_path}")
+    codec = _codec_for_path(path)
+    if codec is None:
+        raise ValueError(f"Not a compressed backup: {path}")
+    sidecar = verify_compact_backup(path)
+    _, _, open_reader = CODECS[codec]
+    folder = os.path.dirname(os.path.abspath(target_path))
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".restore_", dir=folder)
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as out, open_reader(path) as src:
+            for block in iter(lambda: src.read(IO_BLOCK), b""):
+                digest.update(block)
+                out.write(block)
+            out.flush()
+            os.fsync(out.fileno())
+        if digest.hexdigest() != sidecar["sha256"]:
+            raise ValueError(f"Decompressed backup {path} does not match its checksum")
+        check = _check(tmp, full=False)
+        if check != "ok":
+            raise RuntimeError(f"Restored database failed quick_check: {check}")
+        os.replace(tmp, target_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return target_path
+
+
+def restore_plain_backup(path: str, target_path: str, overwrite: bool = False) -> str:
+    """Copy a plain .db backup to target_path (SQLite backup API) after a quick_check."""
+    if os.path.exists(target_path) and not overwrite:
+        raise FileExistsError(f"Restore target already exists: {target_path}")
+    check = _check(path, full=False)
+    if check != "ok":
+        raise RuntimeError(f"Backup {path} failed quick_check: {check}")
+    folder = os.path.dirname(os.path.abspath(target_path))
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".restore_", dir=folder)
+    os.close(fd)
+    try:
+        copy_database(path, tmp, pages=-1)
+        os.replace(tmp, target_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return target_path
@@ -0,0 +1,365 @@
+"""Incremental page-level backups.
+
+The database file is split into fixed-size chunks of whole pages (64 KiB by
+default). Each chunk is stored once in a content-addressed chunk store,
+named by its SHA-256 and zlib-compressed. A backup is a JSON manifest that
+lists the chunk hashes in file order, so a new backup only writes the chunks
+whose pages changed since an earlier one. Restore rebuilds the full file from
+the chunks, checking each one against its hash. Retention drops old manifests
+and then garbage-collects chunks that no remaining manifest references.
+
+Layout under the backup folder::
+
+    incremental/
+        chunks/ab/ab12...ef     zlib-compressed chunk, named by SHA-256 of its raw bytes
+        manifests/backup_<timestamp>.json
+
+Consistency: in WAL mode the file is read inside a read transaction started
+right after a TRUNCATE checkpoint, while the WAL is empty. Other connections
+keep reading and writing; their commits go to the WAL, and checkpoints cannot
+copy them into the file while that snapshot is held. In rollback-journal mode,
+or if the WAL cannot be emptied, the snapshot is first copied with the SQLite
+backup API (copy_database) into a temporary file.
+
+Long backups take progress(done, total), cancel_event and throttle (seconds
+to sleep between steps) arguments; a cancelled backup raises BackupCancelled
+and leaves no manifest behind.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from database.pragmas import wal_size
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_DIRNAME = "incremental"
+MANIFEST_PREFIX = "backup_"
+MANIFEST_SUFFIX = ".json"
+MANIFEST_FORMAT = 1
+CHUNK_SIZE = 64 * 1024
+COMPRESS_LEVEL = 1  # pages compress well even at the fastest level
+PENDING_BYTE = 0x40000000  # SQLite's lock-byte page starts here and never holds data
+BACKUP_PAGES_PER_STEP = 1024  # pages copied per backup API step
+CHUNKS_PER_STEP = 64  # chunks hashed between progress reports / throttle sleeps
+_SNAPSHOT_ATTEMPTS = 3
+
+Progress = Callable[[int, int], None]
+
+
+class BackupCancelled(Exception):
+    """A backup was stopped through its cancel event."""
+
+
+class ChunkStore:
+    """Content-addressed, compressed chunk files under root/chunks."""
+
+    def __init__(self, root: str):
+        self.root = os.path.join(root, "chunks")
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.path_for(digest))
+
+    def put(self, digest: str, data: bytes) -> int:
+        """Store a chunk unless present; returns the bytes written (0 if it already existed)."""
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            return 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = zlib.compress(data, COMPRESS_LEVEL)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(payload)
+        os.replace(tmp, path)
+        return len(payload)
+
+    def get(self, digest: str) -> bytes:
+        with open(self.path_for(digest), "rb") as fh:
+            data = zlib.decompress(fh.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt")
+        return data
+
+    def digests(self) -> Iterator[str]:
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.listdir(self.root):
+            folder = os.path.join(self.root, prefix)
+            if os.path.isdir(folder):
+                for name in os.listdir(folder):
+                    if not name.endswith(".tmp"):
+                        yield name
+
+    def remove(self, digest: str):
+        os.remove(self.path_for(digest))
+
+
+class IncrementalBackupResult:
+    """Outcome of create_incremental_backup."""
+
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        self.chunks_total = 0
+        self.chunks_new = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.elapsed = 0.0
+
+
+def incremental_root(backup_dir: str) -> str:
+    return os.path.join(backup_dir, INCREMENTAL_DIRNAME)
+
+
+def _manifest_dir(backup_dir: str) -> str:
+    return os.path.join(incremental_root(backup_dir), "manifests")
+
+
+def list_manifests(backup_dir: str) -> list[str]:
+    """Manifest paths, oldest first (names sort by timestamp)."""
+    folder = _manifest_dir(backup_dir)
+    if not os.path.isdir(folder):
+        return []
+    names = sorted(n for n in os.listdir(folder) if n.startswith(MANIFEST_PREFIX) and n.endswith(MANIFEST_SUFFIX))
+    return [os.path.join(folder, n) for n in names]
+
+
+def load_manifest(path: str) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    if manifest.get("format") != MANIFEST_FORMAT:
+        raise ValueError(f"Unsupported backup manifest format in {path}")
+    return manifest
+
+
+def copy_database(
+    source_path: str,
+    dest_path: str,
+    *,
+    pages: int = BACKUP_PAGES_PER_STEP,
+    throttle: float = 0.0,
+    progress: Progress | None = None,
+    cancel_event: threading.Event | None = None,
+):
+    """Copy a database with the SQLite backup API, `pages` pages per step.
+
+    The source is only locked during each step, so it stays writable; SQLite
+    restarts the copy if another connection changes it in between.
+    """
+
+    def step(_status, remaining, total):
+        if cancel_event is not None and cancel_event.is_set():
+            raise BackupCancelled()
+        if progress:
+            progress(total - remaining, total)
+
+    source = sqlite3.connect(source_path, timeout=10)
+    try:
+        dest = sqlite3.connect(dest_path, timeout=10)
+        try:
+            source.backup(dest, pages=pages, progress=step, sleep=throttle)
+        finally:
+            dest.close()
+    finally:
+        source.close()
+
+
+@contextmanager
+def _database_snapshot(db_path: str, throttle: float, progress: Progress | None, cancel_event):
+    """Yield (open file, page_size, page_count) for a snapshot that cannot change meanwhile."""
+    for _ in range(_SNAPSHOT_ATTEMPTS):
+        conn = sqlite3.connect(db_path, timeout=10, isolation_level=None)
+        try:
+            if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() != "wal":
+                break
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("BEGIN")
+            try:
+                # The first read fixes the snapshot; an empty WAL means it is all in the file
+                conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+                if wal_size(db_path) == 0:
+                    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+                    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+                    with open(db_path, "rb") as fh:
+                        yield fh, page_size, page_count
+                    return
+            finally:
+                conn.execute("ROLLBACK")
+        finally:
+            conn.close()
+        time.sleep(0.05)
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, "snapshot.db")
+        copy_database(db_path, copy, throttle=throttle, progress=progress, cancel_event=cancel_event)
+        conn = sqlite3.connect(copy)
+        try:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            conn.close()
+        with open(copy, "rb") as fh:
+            yield fh, page_size, page_count
+
+
+def _chunk_bytes(page_size: int) -> int:
+    return max(page_size, CHUNK_SIZE // page_size * page_size)
+
+
+def _read_chunks(fh, page_size: int, page_count: int) -> Iterator[bytes]:
+    size = page_size * page_count
+    step = _chunk_bytes(page_size)
+    lock_page = PENDING_BYTE // page_size * page_size
+    offset = 0
+    while offset < size:
+        length = min(step, size - offset)
+        if offset <= lock_page < offset + length:
+            # Never read the lock-byte page: Windows refuses reads of locked ranges
+            fh.seek(offset)
+            head = fh.read(lock_page - offset)
+            fh.seek(lock_page + page_size)
+            tail = fh.read(offset + length - lock_page - page_size)
+            data = head + bytes(page_size) + tail
+        else:
+            fh.seek(offset)
+            data = fh.read(length)
+        if len(data) != length:
+            raise OSError("Database file is shorter than its page count")
+        yield data
+        offset += length
+
+
+def _new_manifest_path(backup_dir: str) -> str:
+    folder = _manifest_dir(backup_dir)
+    os.makedirs(folder, exist_ok=True)
+    stamp = _dt.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    path = os.path.join(folder, f"{MANIFEST_PREFIX}{stamp}{MANIFEST_SUFFIX}")
+    idx = 1
+    while os.path.exists(path):
+        path = os.path.join(folder, f"{MANIFEST_PREFIX}{stamp}_{idx}{MANIFEST_SUFFIX}")
+        idx += 1
+    return path
+
+
+def create_incremental_backup(
+    db_path: str,
+    backup_dir: str,
+    *,
+    throttle: float = 0.0,
+    progress: Progress | None = None,
+    cancel_event: threading.Event | None = None,
+) -> IncrementalBackupResult:
+    """Store the chunks of db_path that are not in the store yet and write a manifest.
+
+    progress(done, total) counts chunks (after backup API pages, when a
+    temporary copy is needed).
+    """
+    start = time.perf_counter()
+    store = ChunkStore(incremental_root(backup_dir))
+    chunks: list[str] = []
+    result = IncrementalBackupResult(_new_manifest_path(backup_dir))
+    with _database_snapshot(db_path, throttle, progress, cancel_event) as (fh, page_size, page_count):
+        step = _chunk_bytes(page_size)
+        total = -(-page_size * page_count // step)
+        for data in _read_chunks(fh, page_size, page_count):
+            if len(chunks) % CHUNKS_PER_STEP == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise BackupCancelled()
+                if progress:
+                    progress(len(chunks), total)
+                if throttle and chunks:
+                    time.sleep(throttle)
+            digest = hashlib.sha256(data).hexdigest()
+            written = store.put(digest, data)
+            if written:
+                result.chunks_new += 1
+                result.bytes_written += written
+            chunks.append(digest)
+            result.bytes_read += len(data)
+    if progress:
+        progress(len(chunks), len(chunks))
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "created": _dt.datetime.now().isoformat(timespec="seconds"),
+        "source": os.path.abspath(db_path),
+        "page_size": page_size,
+        "page_count": page_count,
+        "chunk_size": _chunk_bytes(page_size),
+        "size": result.bytes_read,
+        "chunks": chunks,
+    }
+    tmp = result.manifest_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        json.dump(manifest, out)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp, result.manifest_path)
+    result.chunks_total = len(chunks)
+    result.elapsed = time.perf_counter() - start
+    logger.info(
+        "Incremental backup %s: %d of %d chunk(s) new, %d bytes written",
+        result.manifest_path,
+        result.chunks_new,
+        result.chunks_total,
+        result.bytes_written,
+    )
+    return result
+
+
+def restore_incremental_backup(manifest_path: str, target_path: str, overwrite: bool = False) -> str:
+    """Rebuild the database file described by a manifest at target_path."""
+    if os.path.exists(target_path) and not overwrite:
+        raise FileExistsError(f"Restore target already exists: {target_path}")
+    manifest = load_manifest(manifest_path)
+    backup_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(manifest_path))))
+    store = ChunkStore(incremental_root(backup_dir))
+    folder = os.path.dirname(os.path.abspath(target_path))
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".restore_", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for digest in manifest["chunks"]:
+                # get() checks each chunk against its hash
+                out.write(store.get(digest))
+            out.flush()
+            os.fsync(out.fileno())
+        if os.path.getsize(tmp) != manifest["size"]:
+            raise ValueError(f"Restored file does not match {manifest_path}")
+        os.replace(tmp, target_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return target_path
+
+
+def collect_garbage(backup_dir: str) -> int:
+    """Delete chunks no manifest references; returns the number removed."""
+    referenced: set[str] = set()
+    for path in list_manifests(backup_dir):
+        referenced.update(load_manifest(path)["chunks"])
+    store = ChunkStore(incremental_root(backup_dir))
+    removed = 0
+    for digest in list(store.digests()):
+        if digest not in referenced:
+            try:
+                store.remove(digest)
+                removed += 1
+            except OSError as e:
+                logger.warning("Failed deleting backup chunk %s: %s", digest, e)
+    return removed
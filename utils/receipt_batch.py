@@ -0,0 +1,261 @@
+"""Batch export of receipts to PDF.
+
+Invoice data for the whole batch is loaded up front with bulk queries and
+formatted in this process; the formatted dicts carry everything the PDF
+needs (settings texts included), so rendering runs in worker processes that
+never touch the database. Receipts are handed to workers in small chunks so
+progress is reported steadily and a cancel takes effect between chunks.
+
+The optional merged PDF is one ReportLab document, built as a single extra
+job alongside the per-receipt files (no PDF merging library is required).
+
+Command line::
+
+    python -m utils.receipt_batch --from 2025-01-01 --to 2025-01-31 --out receipts/ [--merged all.pdf]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from models.invoice import Invoice
+from utils.app_settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 8  # receipts per worker task
+_POLL_SECONDS = 0.1
+
+
+class BatchExportResult:
+    """Outcome of export_receipts.
+
+    files maps invoice_id -> written PDF path; errors maps invoice_id -> reason.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.files: dict[int, str] = {}
+        self.errors: dict[int, str] = {}
+        self.merged_path: str | None = None
+        self.merged_error: str | None = None
+        self.cancelled = False
+        self.elapsed = 0.0
+
+    @property
+    def exported_count(self) -> int:
+        return len(self.files)
+
+    @property
+    def receipts_per_second(self) -> float:
+        return self.exported_count / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def invoice_ids_for_period(date_from: str | None = None, date_to: str | None = None) -> list[int]:
+    """Invoice ids dated within [date_from, date_to] ("YYYY-MM-DD", inclusive), oldest first."""
+    filters = {"date_from": date_from, "date_to": date_to}
+    ids = [rec.invoice_id for rec in Invoice.iter_invoices(filters=filters, page_size=1000)]
+    ids.reverse()
+    return ids
+
+
+def load_receipts(invoice_ids: Iterable[int]) -> dict[int, dict]:
+    """Formatted receipt dicts for the given invoices, loaded with bulk queries."""
+    settings = get_settings()
+    invoices = Invoice.get_invoices_by_ids(invoice_ids)
+    return {
+        invoice_id: Invoice.format_receipt_data(invoice, settings.display_number, settings.display_address)
+        for invoice_id, invoice in invoices.items()
+    }
+
+
+def _render_files(jobs: list[tuple[int, dict, str]]) -> list[tuple[int, str, str | None]]:
+    # Runs in a worker process: one PDF per receipt, errors reported per receipt
+    done: list[tuple[int, str, str | None]] = []
+    for invoice_id, formatted, path in jobs:
+        try:
+            Invoice.export_receipt_to_pdf(formatted, path)
+            done.append((invoice_id, path, None))
+        except Exception as e:
+            done.append((invoice_id, path, str(e) or e.__class__.__name__))
+    return done
+
+
+def _render_merged(receipts: list[dict], path: str) -> str:
+    Invoice.export_receipts_to_pdf(receipts, path)
+    return path
+
+
+def export_receipts(
+    invoice_ids: Iterable[int],
+    output_dir: str | None = None,
+    *,
+    merged_path: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Callable[[int, int], None] | None = None,
+    cancel_event: threading.Event | None = None,
+) -> BatchExportResult:
+    """Export receipts as receipt_<id>.pdf files in output_dir and/or one merged PDF.
+
+    workers defaults to the CPU count; 0 or 1 renders in the calling thread.
+    progress(done, total) is called from the calling thread as receipts finish
+    (the merged document counts as one more unit of work per receipt).
+    """
+    if not output_dir and not merged_path:
+        raise ValueError("Choose an output folder or a merged PDF file.")
+    start = time.perf_counter()
+    ids = list(dict.fromkeys(int(i) for i in invoice_ids))
+    result = BatchExportResult(len(ids))
+    receipts = load_receipts(ids)
+    for invoice_id in ids:
+        if invoice_id not in receipts:
+            result.errors[invoice_id] = "Invoice not found."
+    ordered = [(invoice_id, receipts[invoice_id]) for invoice_id in ids if invoice_id in receipts]
+
+    file_jobs: list[list[tuple[int, dict, str]]] = []
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        chunk_size = max(1, int(chunk_size))
+        for pos in range(0, len(ordered), chunk_size):
+            file_jobs.append(
+                [
+                    (invoice_id, formatted, os.path.join(output_dir, f"receipt_{invoice_id}.pdf"))
+                    for invoice_id, formatted in ordered[pos : pos + chunk_size]
+                ]
+            )
+    merged = [formatted for _, formatted in ordered] if merged_path and ordered else None
+
+    total = sum(len(job) for job in file_jobs) + (len(merged) if merged else 0)
+    done = 0
+
+    def collect_files(rendered):
+        nonlocal done
+        for invoice_id, path, error in rendered:
+            if error is None:
+                result.files[invoice_id] = path
+            else:
+                result.errors[invoice_id] = error
+        done += len(rendered)
+        if progress:
+            progress(done, total)
+
+    def collect_merged(path):
+        nonlocal done
+        result.merged_path = path
+        done += len(merged or ())
+        if progress:
+            progress(done, total)
+
+    if progress:
+        progress(0, total)
+    cancelled = cancel_event.is_set if cancel_event is not None else (lambda: False)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    n_tasks = len(file_jobs) + (1 if merged else 0)
+    if workers <= 1 or n_tasks <= 1:
+        for job in file_jobs:
+            if cancelled():
+                result.cancelled = True
+                break
+            collect_files(_render_files(job))
+        if merged and not result.cancelled:
+            if cancelled():
+                result.cancelled = True
+            else:
+                try:
+                    collect_merged(_render_merged(merged, merged_path))
+                except Exception as e:
+                    result.merged_error = str(e) or e.__class__.__name__
+    else:
+        _run_in_pool(
+            min(workers, n_tasks), file_jobs, merged, merged_path, collect_files, collect_merged, cancelled, result
+        )
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _run_in_pool(workers, file_jobs, merged, merged_path, collect_files, collect_merged, cancelled, result):
+    # spawn: matches Windows everywhere and avoids forking a process that runs Qt
+    context = multiprocessing.get_context("spawn")
+    collectors = {"files": collect_files, "merged": collect_merged}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending: dict[Future, tuple[str, list]] = {}
+        if merged:
+            # Submitted first: it is the longest task
+            pending[pool.submit(_render_merged, merged, merged_path)] = ("merged", merged)
+        for job in file_jobs:
+            pending[pool.submit(_render_files, job)] = ("files", job)
+
+        def collect(future):
+            kind, job = pending.pop(future)
+            try:
+                value = future.result()
+            except Exception as e:
+                logger.error("Receipt export task failed: %s", e)
+                message = str(e) or e.__class__.__name__
+                if kind == "merged":
+                    result.merged_error = message
+                else:
+                    # The whole chunk is lost (e.g. BrokenProcessPool): report each receipt in it
+                    collect_files([(invoice_id, path, message) for invoice_id, _, path in job])
+                return
+            collectors[kind](value)
+
+        while pending:
+            finished, _ = wait(pending, timeout=_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in finished:
+                collect(future)
+            if pending and cancelled():
+                result.cancelled = True
+                # Tasks already running finish and their output is kept; queued ones are dropped
+                pool.shutdown(wait=True, cancel_futures=True)
+                for future in [f for f in pending if not f.cancelled()]:
+                    collect(future)
+                break
+
+
+def main(argv=None) -> int:
+    from database.db_handler import initialize_database
+
+    parser = argparse.ArgumentParser(prog="python -m utils.receipt_batch", description="Export receipts to PDF.")
+    parser.add_argument("--from", dest="date_from", help="first invoice date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="last invoice date (YYYY-MM-DD)")
+    parser.add_argument("--ids", help="comma-separated invoice ids (instead of a date range)")
+    parser.add_argument("--out", help="folder for one receipt_<id>.pdf per invoice")
+    parser.add_argument("--merged", help="also write all receipts into this single PDF")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    if not args.out and not args.merged:
+        parser.error("give --out and/or --merged")
+
+    initialize_database()
+    if args.ids:
+        ids = [int(part) for part in args.ids.split(",") if part.strip()]
+    else:
+        ids = invoice_ids_for_period(args.date_from, args.date_to)
+
+    def show(done, total):
+        print(f"\r{done}/{total}", end="", flush=True)
+
+    result = export_receipts(ids, args.out, merged_path=args.merged, workers=args.workers, progress=show)
+    print()
+    print(f"Exported {result.exported_count} receipt(s) in {result.elapsed:.1f}s")
+    if result.merged_path:
+        print(f"Merged PDF: {result.merged_path}")
+    if result.merged_error:
+        print(f"Merged PDF failed: {result.merged_error}")
+    for invoice_id, error in result.errors.items():
+        print(f"  invoice {invoice_id}: {error}")
+    return 1 if result.errors or result.merged_error else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,248 @@
+"""Restore the live database from a backup.
+
+restore_database() works in four steps and never leaves the live database
+half-restored:
+
+1. Stage: the backup (plain, compact or incremental, see utils.backup) is
+   rebuilt into ``<db>.restore.tmp`` next to the database; plain copies go
+   through the SQLite backup API. Checksums recorded in the backup catalog or
+   sidecar are checked on the way.
+2. Validate: ``PRAGMA quick_check`` (or ``integrity_check``) must pass and the
+   copy must be a Tradia database (it has a settings table).
+3. Migrate: migrations.run_migrations brings the staged copy up to the current
+   schema, so an older backup comes back ready to use; a backup from a newer
+   app version is refused here.
+4. Swap: the staged copy is written into the live database with the backup
+   API. That is a single write transaction: other connections (in this
+   process or another) keep working, see either the old or the restored data,
+   and a crash or cancel leaves the old data in place. Unlike renaming files
+   it is safe in WAL mode and on Windows, where open handles block a rename.
+
+Before the swap the current database is copied to ``<db>.pre-restore`` so a
+restore can itself be undone. Afterwards the connection pool is reset (which
+also invalidates row caches watching it) and the settings cache is dropped.
+
+Point-in-time recovery picks the newest catalogued backup taken at or before
+the requested time (backup_at); the WAL is not archived between backups, so
+those are the recovery points.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import logging
+import os
+import sqlite3
+import time
+
+from database import migrations
+from database.db_handler import initialize_database, reset_connection_pool, resolve_db_path
+from database.pragmas import checkpoint
+from utils.activity_log import flush_activity_log, log_action
+from utils.app_settings import invalidate_settings
+from utils.backup import resolve_backup_dir, restore_backup
+from utils.backup_catalog import BackupEntry, catalog_path, load_catalog
+from utils.compact_backup import file_sha256, is_compact_backup
+from utils.incremental_backup import Progress, copy_database
+
+logger = logging.getLogger(__name__)
+
+STAGING_SUFFIX = ".restore.tmp"
+PRE_RESTORE_SUFFIX = ".pre-restore"
+RESTORE_ACTION = "DB_RESTORE"  # activity_log action_type
+
+
+class RestoreResult:
+    """Outcome of restore_database, with the time spent in each step."""
+
+    def __init__(self, backup_path: str, db_path: str):
+        self.backup_path = backup_path
+        self.db_path = db_path
+        self.previous_path: str | None = None
+        self.schema_from = 0  # schema version found in the backup
+        self.schema_to = 0
+        self.size = 0
+        self.stage_seconds = 0.0
+        self.check_seconds = 0.0
+        self.migrate_seconds = 0.0
+        self.previous_seconds = 0.0
+        self.swap_seconds = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        steps = (self.stage_seconds, self.check_seconds, self.migrate_seconds, self.previous_seconds, self.swap_seconds)
+        return sum(steps)
+
+
+def backup_at(when: _dt.datetime, directory: str | None = None) -> BackupEntry | None:
+    """Newest catalogued backup taken at or before `when`."""
+    directory = directory or resolve_backup_dir()
+    cutoff = when.timestamp()
+    candidates = [e for e in load_catalog(directory) if e.created <= cutoff]
+    return candidates[-1] if candidates else None
+
+
+def _catalog_entry(backup_path: str) -> BackupEntry | None:
+    folder = os.path.dirname(os.path.abspath(backup_path))
+    if backup_path.endswith(".json"):
+        folder = os.path.dirname(os.path.dirname(folder))  # <backups>/incremental/manifests/
+    if not os.path.exists(catalog_path(folder)):
+        return None
+    for entry in load_catalog(folder):
+        if os.path.abspath(entry.path(folder)) == os.path.abspath(backup_path):
+            return entry
+    return None
+
+
+def _verify_catalog_checksum(backup_path: str):
+    # Compact backups are checked against their sidecar and incremental ones
+    # chunk by chunk while staging; plain copies only have the catalog.
+    if backup_path.endswith(".json") or is_compact_backup(backup_path):
+        return
+    entry = _catalog_entry(backup_path)
+    if entry is not None and entry.sha256 and file_sha256(backup_path) != entry.sha256:
+        raise ValueError(f"Backup {backup_path} does not match the checksum in the backup catalog")
+
+
+def _validate(staged: str, full_check: bool):
+    conn = sqlite3.connect(staged)
+    try:
+        pragma = "integrity_check" if full_check else "quick_check"
+        rows = conn.execute(f"PRAGMA {pragma}").fetchall()
+        result = "; ".join(str(r[0]) for r in rows)
+        if result != "ok":
+            raise RuntimeError(f"Backup failed {pragma}: {result}")
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='settings'").fetchone() is None:
+            raise ValueError("Backup is not a Tradia database")
+    finally:
+        conn.close()
+
+
+def _page_size(path: str) -> int | None:
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path, timeout=10)
+    try:
+        return conn.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _migrate(staged: str, page_size: int | None) -> tuple[int, int]:
+    conn = sqlite3.connect(staged, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=DELETE")
+        if page_size and conn.execute("PRAGMA page_size").fetchone()[0] != page_size:
+            # A WAL-mode destination cannot change page size during the swap
+            conn.execute(f"PRAGMA page_size={int(page_size)}")
+            conn.execute("VACUUM")
+        cur = conn.cursor()
+        before = migrations.get_current_schema_version(cur)
+        conn.execute("BEGIN")
+        try:
+            migrations.run_migrations(cur)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return before, migrations.get_current_schema_version(cur)
+    finally:
+        conn.close()
+
+
+def _remove(path: str):
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except OSError:
+            pass
+
+
+def restore_database(
+    backup_path: str,
+    db_path: str | None = None,
+    *,
+    full_check: bool = False,
+    keep_previous: bool = True,
+    progress: Progress | None = None,
+    username: str | None = None,
+    notify: bool = True,
+) -> RestoreResult:
+    """Replace the contents of the database (default: the app's) with a backup.
+
+    progress(done, total) follows the swap, in pages. Raises without touching
+    the database if the backup is corrupt, not a Tradia database or from a
+    newer schema. Settings subscribers are widgets, so a restore run on a
+    worker thread passes notify=False and calls invalidate_settings() itself
+    on the GUI thread (ui.backup_job.RestoreJob); the settings cache is
+    dropped either way by the pool reset.
+    """
+    live = resolve_db_path(db_path)
+    is_app_database = os.path.abspath(live) == os.path.abspath(resolve_db_path())
+    result = RestoreResult(backup_path, live)
+    staged = live + STAGING_SUFFIX
+    _remove(staged)
+    try:
+        start = time.perf_counter()
+        _verify_catalog_checksum(backup_path)
+        if backup_path.endswith(".json") or is_compact_backup(backup_path):
+            restore_backup(backup_path, staged, overwrite=True)
+        else:
+            copy_database(backup_path, staged, pages=-1)  # checked once below, not twice
+        result.stage_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _validate(staged, full_check)
+        result.check_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result.schema_from, result.schema_to = _migrate(staged, _page_size(live))
+        result.migrate_seconds = time.perf_counter() - start
+        result.size = os.path.getsize(staged)
+
+        if is_app_database:
+            flush_activity_log()
+        if keep_previous and os.path.exists(live):
+            start = time.perf_counter()
+            result.previous_path = live + PRE_RESTORE_SUFFIX
+            _remove(result.previous_path)
+            copy_database(live, result.previous_path, pages=-1)
+            result.previous_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        copy_database(staged, live, progress=progress)
+        result.swap_seconds = time.perf_counter() - start
+    finally:
+        _remove(staged)
+
+    if is_app_database:
+        reset_connection_pool()
+        initialize_database()
+        if notify:
+            invalidate_settings()
+    conn = sqlite3.connect(live, timeout=10)
+    try:
+        # The swap went through the WAL; fold it back into the file
+        checkpoint(conn, "TRUNCATE")
+    except sqlite3.Error as e:
+        logger.debug("Post-restore checkpoint skipped: %s", e)
+    finally:
+        conn.close()
+    logger.info(
+        "Restored %s from %s (schema %s -> %s, %.1f MB) in %.2fs: stage %.2fs, check %.2fs, migrate %.2fs, "
+        "previous copy %.2fs, swap %.2fs",
+        live,
+        backup_path,
+        result.schema_from,
+        result.schema_to,
+        result.size / 1e6,
+        result.elapsed,
+        result.stage_seconds,
+        result.check_seconds,
+        result.migrate_seconds,
+        result.previous_seconds,
+        result.swap_seconds,
+    )
+    if is_app_database:
+        log_action(username, RESTORE_ACTION, f"Restored database from {os.path.basename(backup_path)}")
+    return result
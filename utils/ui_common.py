@@ -1,10 +1,11 @@
-from PyQt6.QtCore import QTimer
-from PyQt6.QtWidgets import QHBoxLayout, QLineEdit, QPushButton
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QComboBox, QCompleter, QHBoxLayout, QLineEdit, QPushButton
 
 # Shared UI constants
 DEFAULT_BUTTON_MIN_WIDTH = 300
 DEFAULT_SEARCH_WIDTH = 300
 DEFAULT_DEBOUNCE_MS = 250
+DEFAULT_DROPDOWN_LIMIT = 50  # choices shown by an incrementally searched dropdown
 
 SEARCH_PLACEHOLDER_PRODUCTS = "Search products by ID, name, price, or stock…"
 SEARCH_TOOLTIP_PRODUCTS = "Type to filter products by any field (ID, name, price, stock)"
@@ -101,3 +102,74 @@ def create_top_actions_row(
     layout.addStretch(1)
     layout.addWidget(search_input)
     return layout, search_input, timer, add_button
+
+
+class IncrementalComboSearch(QObject):
+    """Keep an editable combo box filled with search results instead of every row.
+
+    ``fetch(text, limit)`` returns ``[(label, data), ...]`` (e.g. from an FTS
+    search). It runs once up front with empty text and again, debounced, as the
+    user types; the item data (an id) travels with each choice.
+    """
+
+    def __init__(self, combo: QComboBox, fetch, *, limit: int = DEFAULT_DROPDOWN_LIMIT, debounce_ms=None):
+        super().__init__(combo)
+        self.combo = combo
+        self.fetch = fetch
+        self.limit = limit
+        completer = QCompleter(combo)
+        # Results are already filtered by the search; show them as-is
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        completer.setModel(combo.model())
+        combo.setCompleter(completer)
+        self.completer = completer
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEFAULT_DEBOUNCE_MS if debounce_ms is None else debounce_ms)
+        self.timer.timeout.connect(self._on_timeout)
+        self.filter_text = ""  # text the current choices were fetched for
+        combo.lineEdit().textEdited.connect(self._on_text_edited)
+
+    def _on_text_edited(self, _text: str):
+        if self.timer.isActive():
+            self.timer.stop()
+        self.timer.start()
+
+    def _on_timeout(self):
+        line_edit = self.combo.lineEdit()
+        text = line_edit.text()
+        cursor = line_edit.cursorPosition()
+        count = self.populate(text)
+        # Keep what the user typed; they still have to pick a choice
+        self.combo.blockSignals(True)
+        self.combo.setCurrentIndex(-1)
+        self.combo.blockSignals(False)
+        line_edit.setText(text)
+        line_edit.setCursorPosition(cursor)
+        if count and line_edit.hasFocus():
+            self.completer.complete()
+
+    def populate(self, text: str = "") -> int:
+        """Replace the choices with results for ``text``; returns how many were found."""
+        text = text.strip()
+        choices = self.fetch(text, self.limit)
+        self.filter_text = text
+        combo = self.combo
+        combo.blockSignals(True)
+        combo.setUpdatesEnabled(False)
+        try:
+            combo.clear()
+            for label, data in choices:
+                combo.addItem(label, data)
+        finally:
+            combo.blockSignals(False)
+            combo.setUpdatesEnabled(True)
+        return len(choices)
+
+    def reset(self) -> bool:
+        """Drop a pending search and bring back the unfiltered first page; True if it had to refetch."""
+        self.timer.stop()
+        if not self.filter_text:
+            return False
+        self.populate()
+        return True